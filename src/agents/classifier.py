@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-from typing import Literal, TypedDict
+import asyncio
+from typing import Callable, Literal, TypedDict
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from src.utils.classification_rules import RuleClassifier
+from src.utils.incident_memory import IncidentMatch, IncidentMemory
 from src.utils.llm_provider import get_llm
+from src.utils.log_store import LogStore
 
 
 # 분류 카테고리 타입
@@ -22,6 +26,14 @@ class ClassificationResult(TypedDict):
     key_indicators: list[str]
 
 
+class ClassificationOutcome(TypedDict):
+    """분류 결과와 분류 과정 (호출마다 따로 반환되므로 공유 인스턴스에서도 정확함)"""
+    classification: ClassificationResult
+    method: Literal["rules", "memory", "llm"]  # 분류 방법
+    match: IncidentMatch | None  # 찾은 가장 비슷한 과거 인시던트
+    categories: list[CategoryType]  # 관련 카테고리 순위 (첫 항목이 classification의 카테고리)
+
+
 class ClassificationAgent:
     """로그 분석 후 적절한 카테고리로 분류하는 에이전트
 
@@ -31,8 +43,22 @@ class ClassificationAgent:
     - performance: 응답 시간, N+1 쿼리, 메모리 누수
     - application: 비즈니스 로직 오류
     - user: 잘못된 입력, 비정상적인 행동 패턴
+
+    classify_detailed(ranked=True)는 복합 장애(예: 공격 중 DB 장애)를 위해 주 카테고리 외에
+    함께 나타난 카테고리도 관련성 순위로 반환한다.
+    classify_detailed(on_guess=...)는 LLM을 호출하기 직전에 로컬 추측(섞인 규칙 신호, 덜 비슷한
+    과거 인시던트)을 넘겨주므로, 호출자가 LLM 응답을 기다리는 동안 분석을 미리 시작할 수 있다.
     """
 
+    CATEGORIES: tuple[CategoryType, ...] = ("infrastructure", "security", "performance", "application", "user")
+
+    # 순위 모드에서 프롬프트 끝에 붙이는 지시
+    RANKED_PROMPT = (
+        "\n\n[복합 장애 확인] 주 카테고리 외에 다른 카테고리의 이슈도 뚜렷한 근거와 함께 나타나면 "
+        "JSON에 \"related_categories\" 필드로 관련성이 높은 순서대로 추가하세요 (없으면 빈 배열). "
+        "예: \"related_categories\": [\"security\"]"
+    )
+
     SYSTEM_PROMPT = """당신은 로그 분석 전문가입니다.
 주어진 로그를 분석하여 이슈의 카테고리를 정확하게 분류해야 합니다.
 
@@ -112,25 +138,171 @@ class ClassificationAgent:
 - Key indicators: 동일 IP 반복 로그인 실패, 401 에러 다수, 짧은 시간 내 대량 요청
 """
 
-    def __init__(self):
-        self.llm = get_llm(temperature=0.0)  # 일관된 분류를 위해 temperature=0
-
-    def classify(self, log_data: str) -> ClassificationResult:
+    def __init__(self, incident_memory: IncidentMemory | None = None,
+                 rules: RuleClassifier | None = None, llm=None):
+        """
+        Args:
+            incident_memory: 과거 인시던트 메모리 (지정하면 비슷한 로그의 분류 결과를 재사용)
+            rules: 규칙 기반 사전 분류기 (지정하면 명확한 로그는 LLM 없이 분류)
+            llm: 사용할 채팅 모델 (None이면 get_llm()의 기본 모델)
+        """
+        # 일관된 분류를 위해 temperature=0
+        self.llm = llm if llm is not None else get_llm(temperature=0.0)
+        self.incident_memory = incident_memory
+        self.rules = rules
+        # 마지막 classify() 호출에서 찾은 가장 비슷한 과거 인시던트 (없으면 None)
+        # 여러 스레드/코루틴이 인스턴스를 공유하면 다른 호출의 값일 수 있으므로 classify_detailed()를 사용
+        self.last_match: IncidentMatch | None = None
+        # 마지막 classify() 호출의 분류 방법 (rules, memory, llm)
+        self.last_method: Literal["rules", "memory", "llm"] | None = None
+
+    def classify(self, log_data: str, fingerprint: dict[str, int] | None = None,
+                 source: str | None = None, logs: LogStore | None = None) -> ClassificationResult:
         """로그 데이터를 분석하여 카테고리 분류
 
+        rules와 logs가 있으면 먼저 규칙 엔진으로 분류하고, 규칙이 결정적이면 그 결과를 바로 반환한다.
+        incident_memory와 fingerprint가 있으면 다음으로 비슷한 과거 인시던트를 찾는다.
+        - 유사도 reuse_threshold 이상: LLM 호출 없이 과거 분류 결과를 재사용
+        - 유사도 seed_threshold 이상: 과거 분류 결과를 참고 정보로 프롬프트에 추가
+        LLM으로 분류한 결과는 다음 조회를 위해 메모리에 저장한다.
+
         Args:
             log_data: 로그 데이터 (보통 LogParser.format_for_llm() 결과)
+            fingerprint: 로그 지문 (incident_memory.build_fingerprint() 결과)
+            source: 인시던트 출처 (보통 로그 파일 이름, 메모리에 함께 저장)
+            logs: 파싱된 로그 (규칙 엔진 입력)
 
         Returns:
             분류 결과 (카테고리, 신뢰도, 이유, 심각도, 주요 지표)
         """
-        messages = [
-            SystemMessage(content=self.SYSTEM_PROMPT),
-            HumanMessage(content=f"다음 로그를 분석하여 카테고리를 분류해주세요:\n\n{log_data}")
-        ]
+        outcome = self.classify_detailed(log_data, fingerprint, source, logs)
+        self.last_match, self.last_method = outcome['match'], outcome['method']
+        return outcome['classification']
+
+    async def aclassify(self, log_data: str, fingerprint: dict[str, int] | None = None,
+                        source: str | None = None, logs: LogStore | None = None) -> ClassificationResult:
+        """classify()의 비동기 버전
+
+        LLM은 ainvoke로 호출하고, 규칙 평가와 인시던트 메모리 조회/저장(CPU, SQLite 작업)은
+        스레드에서 실행하므로 분류하는 동안 이벤트 루프를 막지 않는다.
+        """
+        outcome = await self.aclassify_detailed(log_data, fingerprint, source, logs)
+        self.last_match, self.last_method = outcome['match'], outcome['method']
+        return outcome['classification']
+
+    def classify_detailed(self, log_data: str, fingerprint: dict[str, int] | None = None,
+                          source: str | None = None, logs: LogStore | None = None, ranked: bool = False,
+                          on_guess: Callable[[ClassificationResult], None] | None = None) -> ClassificationOutcome:
+        """classify()와 같지만 분류 방법과 유사 인시던트를 결과와 함께 반환
+
+        인스턴스 속성(last_method 등)을 거치지 않으므로 여러 스레드가 하나의 에이전트를 공유해도 된다.
+
+        Args:
+            ranked: True면 함께 나타난 카테고리도 categories에 순위대로 포함
+                (규칙은 여러 카테고리가 섞여도 결정하고, LLM에는 related_categories를 요청)
+            on_guess: LLM 호출이 필요할 때 호출 직전에 로컬 추측을 받는 함수 (추측이 없으면 호출하지 않음)
+        """
+        decided, messages, match, guess = self._prepare(log_data, fingerprint, logs, ranked)
+        if decided is not None:
+            return decided
+        if guess is not None and on_guess is not None:
+            on_guess(guess)
 
         response = self.llm.invoke(messages)
-        result_text = response.content
+        classification, categories = self._finish(response.content, fingerprint, source)
+        return ClassificationOutcome(classification=classification, method="llm", match=match,
+                                     categories=categories if ranked else categories[:1])
+
+    async def aclassify_detailed(self, log_data: str, fingerprint: dict[str, int] | None = None,
+                                 source: str | None = None, logs: LogStore | None = None, ranked: bool = False,
+                                 on_guess: Callable[[ClassificationResult], None] | None = None
+                                 ) -> ClassificationOutcome:
+        """classify_detailed()의 비동기 버전 (여러 코루틴이 하나의 에이전트를 공유해도 됨)
+
+        on_guess는 이벤트 루프 스레드에서 호출하므로 그 안에서 태스크를 만들어도 된다.
+        """
+        decided, messages, match, guess = await asyncio.to_thread(
+            self._prepare, log_data, fingerprint, logs, ranked)
+        if decided is not None:
+            return decided
+        if guess is not None and on_guess is not None:
+            on_guess(guess)
+
+        response = await self.llm.ainvoke(messages)
+        classification, categories = await asyncio.to_thread(self._finish, response.content, fingerprint, source)
+        return ClassificationOutcome(classification=classification, method="llm", match=match,
+                                     categories=categories if ranked else categories[:1])
+
+    def _prepare(self, log_data: str, fingerprint: dict[str, int] | None, logs: LogStore | None,
+                 ranked: bool = False) -> tuple[ClassificationOutcome | None, list | None, IncidentMatch | None,
+                                                ClassificationResult | None]:
+        """규칙과 인시던트 메모리로 분류를 시도하고, 결정되지 않으면 LLM에 보낼 메시지 구성
+
+        Returns:
+            (규칙/메모리로 결정된 결과, None, 유사 인시던트, None) 또는
+            (None, LLM 메시지, 유사 인시던트, 로컬 추측 - 섞인 규칙 신호 또는 seed_threshold 이상의 과거 인시던트)
+        """
+        guess = None
+        if self.rules is not None and logs is not None:
+            if ranked:
+                decided = self.rules.classify_ranked(logs)
+                if decided is not None:
+                    return ClassificationOutcome(classification=ClassificationResult(**decided[0]), method="rules",
+                                                 match=None, categories=decided[1]), None, None, None
+            else:
+                decided, guess = self.rules.classify_or_guess(logs)
+                if decided is not None:
+                    return ClassificationOutcome(classification=ClassificationResult(**decided), method="rules",
+                                                 match=None, categories=[decided['category']]), None, None, None
+
+        memory = self.incident_memory if fingerprint else None
+        match = memory.find_similar(fingerprint) if memory is not None else None
+
+        if match is not None and match['similarity'] >= memory.reuse_threshold:
+            previous = match['classification']
+            classification = ClassificationResult(
+                category=previous['category'],
+                confidence=previous['confidence'],
+                reason=f"[유사 인시던트 재사용 - 유사도 {match['similarity']:.2f}] {previous['reason']}",
+                severity=previous['severity'],
+                key_indicators=list(previous['key_indicators'])
+            )
+            return ClassificationOutcome(classification=classification, method="memory", match=match,
+                                         categories=[classification['category']]), None, match, None
+
+        prompt = f"다음 로그를 분석하여 카테고리를 분류해주세요:\n\n{log_data}"
+        if match is not None and match['similarity'] >= memory.seed_threshold:
+            previous = match['classification']
+            prompt += (
+                f"\n\n[참고: 비슷한 과거 인시던트의 분류 - 유사도 {match['similarity']:.2f}]\n"
+                f"카테고리: {previous['category']}, 심각도: {previous['severity']}, "
+                f"주요 지표: {', '.join(previous['key_indicators'])}\n"
+                "현재 로그와 다른 점이 있으면 현재 로그를 기준으로 분류하세요."
+            )
+            if guess is None:
+                guess = ClassificationResult(
+                    category=previous['category'],
+                    confidence=previous['confidence'],
+                    reason=f"[유사 인시던트 추측 - 유사도 {match['similarity']:.2f}] {previous['reason']}",
+                    severity=previous['severity'],
+                    key_indicators=list(previous['key_indicators'])
+                )
+        if ranked:
+            prompt += self.RANKED_PROMPT
+
+        return None, [
+            SystemMessage(content=self.SYSTEM_PROMPT),
+            HumanMessage(content=prompt)
+        ], match, guess
+
+    def _finish(self, result_text: str, fingerprint: dict[str, int] | None,
+                source: str | None) -> tuple[ClassificationResult, list[CategoryType]]:
+        """LLM 응답을 분류 결과로 변환하고 인시던트 메모리에 저장
+
+        Returns:
+            (분류 결과, 카테고리 순위 - 주 카테고리 다음에 응답의 related_categories 중 알려진 카테고리)
+        """
+        memory = self.incident_memory if fingerprint else None
 
         # JSON 파싱
         import json
@@ -149,13 +321,21 @@ class ClassificationAgent:
         try:
             result = json.loads(result_text)
 
-            return ClassificationResult(
+            classification = ClassificationResult(
                 category=result.get('category', 'application'),
                 confidence=result.get('confidence', 'medium'),
                 reason=result.get('reason', ''),
                 severity=result.get('severity', 'medium'),
                 key_indicators=result.get('key_indicators', [])
             )
+            if memory is not None:
+                memory.remember(fingerprint, classification, source)
+
+            categories = [classification['category']]
+            for category in result.get('related_categories') or []:
+                if category in self.CATEGORIES and category not in categories:
+                    categories.append(category)
+            return classification, categories
         except json.JSONDecodeError as e:
             # JSON 파싱 실패 시 기본값 반환
             print(f"[WARN] JSON 파싱 실패: {e}")
@@ -167,7 +347,7 @@ class ClassificationAgent:
                 reason='LLM 응답 파싱 실패',
                 severity='medium',
                 key_indicators=['파싱 오류']
-            )
+            ), ['application']
 
     def get_routing_decision(self, classification: ClassificationResult) -> str:
         """분류 결과를 바탕으로 어떤 Analyst Agent로 라우팅할지 결정
@@ -2,10 +2,29 @@
 
 from __future__ import annotations
 
-import re
+import heapq
+import io
+import itertools
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import TypedDict
+from typing import Iterable, Iterator, Literal, TypedDict
+
+from src.utils.error_patterns import ErrorPatternEngine
+from src.utils.log_compactor import LogCompactor, estimate_tokens
+from src.utils.log_formats import LogFormat, LogFormatRegistry
+from src.utils.log_index import KeywordIndex, TimeIndex, combine_indices
+from src.utils.log_sources import detect_compression, open_log_text, resolve_log_paths
+from src.utils.log_store import LogStore
+from src.utils.parse_cache import ParseCache
+from src.utils.request_fields import EndpointMetrics, RequestFieldExtractor, RequestFields
+from src.utils.template_miner import LogTemplate, TemplateMiner
+
+
+# format_for_llm()의 기본 토큰 예산 (넘으면 로그를 압축)
+DEFAULT_TOKEN_BUDGET = int(os.getenv("LOG_TOKEN_BUDGET", "12000"))
 
 
 class LogEntry(TypedDict):
@@ -17,6 +36,17 @@ class LogEntry(TypedDict):
     line_number: int
 
 
+class TemplatedLogEntry(LogEntry):
+    """템플릿 마이닝을 켰을 때의 로그 엔트리"""
+    template_id: int
+    parameters: list[str]  # 템플릿의 <*> 위치 값 (마이닝 시점의 템플릿 기준)
+
+
+class RequestLogEntry(LogEntry):
+    """필드 추출을 켰을 때의 로그 엔트리"""
+    fields: RequestFields | None  # HTTP 메서드/경로/상태/응답 시간 등 (없으면 None)
+
+
 class LogStatistics(TypedDict):
     """로그 통계 정보"""
     total_lines: int
@@ -26,57 +56,524 @@ class LogStatistics(TypedDict):
     debug_count: int
     time_range: dict[str, str | None]
     error_patterns: dict[str, int]
+    unparsed_lines: int  # 로그 포맷에 맞지 않는 라인 수 (스택 트레이스 등)
+    dropped_lines: int  # 그중 앞 엔트리에 붙이지 못하고 버린 라인 수
+
+
+class FollowState(TypedDict):
+    """follow() 모드의 파일 추적 상태"""
+    path: str
+    inode: tuple[int, int]  # (st_dev, st_ino)
+    offset: int  # 다음에 읽을 바이트 위치
+    next_line: int  # 다음 라인의 라인 번호
+    head: bytes  # 파일 앞부분 지문 (copytruncate 감지용)
 
 
 class LogParserAgent:
     """PM2 로그 파서 에이전트
 
-    로그 포맷: [Timestamp] [Level] Message
+    기본 로그 포맷: [Timestamp] [Level] Message
     예시: [2026-01-05 03:14:55] INFO Server is running on port 3333
-    """
 
-    # PM2 로그 포맷 정규식
-    LOG_PATTERN = re.compile(
-        r'^\[(?P<timestamp>[\d\-\s:]+)\]\s+'
-        r'(?P<level>INFO|ERROR|WARN|DEBUG)\s+'
-        r'(?P<message>.+)$'
-    )
+    LogFormatRegistry에 등록된 다른 포맷(PM2 --time, JSON lines, nginx access)도 읽을 수 있으며,
+    log_format을 지정하지 않으면 파일 앞부분 라인을 샘플링해 포맷을 자동 감지한다.
 
-    def __init__(self):
-        self.logs: list[LogEntry] = []
-        self.statistics: LogStatistics | None = None
+    포맷에 맞지 않는 라인(스택 트레이스, 여러 줄 메시지)은 바로 앞 엔트리의
+    message/raw에 줄바꿈으로 이어 붙인다. 엔트리마다 최대 MAX_CONTINUATION_LINES줄까지만
+    붙이고, 앞 엔트리가 없거나 한도를 넘은 라인은 버린 라인으로 통계에 집계한다.
+
+    cache(ParseCache)를 지정하면 parse_file()/parse_file_parallel()의 결과를 디스크에 저장하고,
+    같은 파일을 같은 설정으로 다시 파싱할 때는 저장된 결과를 mmap으로 바로 연다.
+    템플릿 마이닝 상태는 캐시할 수 없으므로 mine_templates=True면 캐시를 쓰지 않는다.
+    """
 
-    def parse_file(self, file_path: str | Path) -> list[LogEntry]:
+    # 엔트리 하나에 이어 붙일 수 있는 최대 연속 라인 수 (버퍼 크기 제한)
+    MAX_CONTINUATION_LINES = 500
+
+    def __init__(self, error_patterns: ErrorPatternEngine | None = None,
+                 keyword_index: Literal['off', 'lazy', 'eager'] = 'off',
+                 mine_templates: bool = False, extract_fields: bool = False,
+                 log_format: str | LogFormat | None = None,
+                 formats: LogFormatRegistry | None = None,
+                 cache: ParseCache | None = None):
+        # 에러 패턴 분류 엔진 (None이면 기본 규칙 사용)
+        self.error_patterns = error_patterns or ErrorPatternEngine()
+        # 로그 포맷 (None이면 파일마다 자동 감지, 감지 실패 시 레지스트리의 첫 포맷)
+        self.formats = formats or LogFormatRegistry()
+        self.log_format: LogFormat | None = (
+            self.formats.get(log_format) if isinstance(log_format, str) else log_format
+        )
+        self.current_format: LogFormat = self.log_format or self.formats.formats[0]
+        # 키워드 역색인 사용 방식
+        # - off: 조회마다 전체 스캔
+        # - lazy: 첫 조회 시 색인 생성 후 재사용
+        # - eager: 파싱이 끝날 때 바로 색인 생성
+        self.keyword_index_mode = keyword_index
+        # True면 파싱하면서 Drain 템플릿 마이너로 엔트리마다 템플릿 ID 부여
+        self.mine_templates = mine_templates
+        self.template_miner: TemplateMiner | None = TemplateMiner() if mine_templates else None
+        # True면 파싱하면서 HTTP 요청 필드(메서드, 경로, 상태, 응답 시간, 사용자, IP, 쿼리)를 추출
+        self.extract_fields = extract_fields
+        self.field_extractor: RequestFieldExtractor | None = RequestFieldExtractor() if extract_fields else None
+        # 파싱 결과 디스크 캐시 (None이면 사용하지 않음)
+        self.cache = cache
+        self.logs: LogStore = LogStore()
+        self.statistics: LogStatistics | None = None
+        self.follow_state: FollowState | None = None
+        self._keyword_index: KeywordIndex | None = None
+        self._time_index: TimeIndex | None = None
+        # 지금 들어오는 연속 라인을 마지막 엔트리에 붙일 수 있는지
+        # (알 수 없는 포맷의 엔트리 시작 라인 뒤라면 False, 아직 판단할 라인이 없으면 None)
+        self._continuation_open: bool | None = False
+
+    def parse_file(self, file_path: str | Path | Iterable[str | Path]) -> LogStore:
         """로그 파일을 읽어서 파싱
 
+        iter_entries()의 얇은 래퍼로, 스트리밍 결과를 컬럼형 LogStore에 모아서 보관한다.
+
         Args:
-            file_path: 로그 파일 경로
+            file_path: 로그 파일 경로, glob 패턴 또는 경로 목록 (gzip/bz2/xz/zstd 압축 파일 가능)
 
         Returns:
-            파싱된 로그 엔트리 리스트
+            파싱된 로그 엔트리 시퀀스 (LogStore)
         """
-        file_path = Path(file_path)
+        paths = resolve_log_paths(file_path)
+        cache_key = self._cache_key(paths)
+        if cache_key is not None and self._load_cached(cache_key):
+            return self.logs
 
-        if not file_path.exists():
-            raise FileNotFoundError(f"로그 파일을 찾을 수 없습니다: {file_path}")
+        store = LogStore()
+        store.extend(self.iter_entries(paths))
+        self.logs = store
+        self._save_cached(cache_key)
+        self._on_parsed()
+
+        return self.logs
+
+    def iter_entries(self, file_path: str | Path | Iterable[str | Path]) -> Iterator[LogEntry]:
+        """로그 파일을 스트리밍 방식으로 파싱
+
+        엔트리를 하나씩 yield 하면서 self.statistics를 점진적으로 갱신한다.
+        엔트리를 보관하지 않으므로 파일 크기와 무관하게 메모리 사용량이 일정하다.
+
+        압축 파일은 디스크에 풀지 않고 스트리밍으로 해제하며, 여러 파일(glob 패턴, 경로 목록)은
+        타임스탬프 순서로 병합한다. 이때 라인 번호는 파일별 번호이다.
+
+        Args:
+            file_path: 로그 파일 경로, glob 패턴(예: logs/app-out.log*) 또는 경로 목록
+
+        Returns:
+            파싱된 로그 엔트리 이터레이터
+        """
+        # 제너레이터 실행 전에 바로 에러를 낼 수 있도록 먼저 확인
+        paths = resolve_log_paths(file_path)
+
+        self._reset()
+
+        if len(paths) == 1:
+            return self._iter_file(paths[0], self.statistics)
+        return self._iter_merged(paths, self.statistics)
+
+    def _reset(self) -> None:
+        """새 파싱을 위해 누적 상태 초기화"""
+        self.logs = LogStore()
+        self.statistics = self._empty_statistics()
+        self.follow_state = None
+        self._continuation_open = False
+        if self.mine_templates:
+            self.template_miner = TemplateMiner()
+
+    def _iter_file(self, file_path: Path, stats: LogStatistics,
+                   detect_format: bool = True) -> Iterator[LogEntry]:
+        """파일을 한 줄씩 읽으며 엔트리를 yield 하고 통계를 갱신"""
+        with open_log_text(file_path) as f:
+            if detect_format:
+                # 포맷 감지에 쓴 앞부분 라인을 그대로 이어서 파싱하므로 파일을 두 번 읽지 않음
+                head = list(itertools.islice(f, LogFormatRegistry.SNIFF_LINES))
+                self._select_format(head)
+                lines = itertools.chain(head, f)
+            else:
+                lines = f
+            yield from self._iter_lines(lines, stats)
+
+    def _iter_merged(self, paths: list[Path], stats: LogStatistics) -> Iterator[LogEntry]:
+        """여러 파일(회전된 로그 등)을 타임스탬프 순서로 병합하며 엔트리를 yield
+
+        파일마다 스트리밍 파서를 열고 heapq.merge로 한 엔트리씩 고르므로 메모리는 파일 수에만
+        비례한다. 포맷은 첫 파일로 감지하고, 타임스탬프를 읽을 수 없는 엔트리는 같은 파일의
+        앞 엔트리 시각을 따른다. 통계는 파일별로 모았다가 병합이 끝날 때 stats에 합친다.
+        """
+        with open_log_text(paths[0]) as f:
+            self._select_format(itertools.islice(f, LogFormatRegistry.SNIFF_LINES))
+
+        epochs = LogStore()  # 타임스탬프 → epoch 변환용 (날짜 캐시 공유)
+        file_stats = [self._empty_statistics() for _ in paths]
+
+        def keyed(order: int, entries: Iterator[LogEntry]):
+            epoch = LogStore.NO_TIMESTAMP
+            for sequence, entry in enumerate(entries):
+                parsed = epochs.parse_epoch(entry['timestamp'])
+                if parsed != LogStore.NO_TIMESTAMP:
+                    epoch = parsed
+                # (시각, 파일 순서, 파일 내 순서)가 항상 달라 엔트리 dict끼리는 비교하지 않음
+                yield epoch, order, sequence, entry
+
+        streams = [keyed(order, self._iter_file(path, file_stat, detect_format=False))
+                   for order, (path, file_stat) in enumerate(zip(paths, file_stats))]
+
+        first = last = None
+        for _, _, _, entry in heapq.merge(*streams):
+            if first is None:
+                first = entry['timestamp']
+            last = entry['timestamp']
+            yield entry
+
+        for file_stat in file_stats:
+            self._merge_statistics(stats, file_stat)
+        stats['time_range'] = {'start': first, 'end': last}
+
+    def _select_format(self, sample: Iterable[str]) -> LogFormat:
+        """지정된 포맷이 없으면 샘플 라인으로 포맷을 감지하여 current_format에 설정"""
+        if self.log_format is not None:
+            self.current_format = self.log_format
+        else:
+            self.current_format = self.formats.sniff(sample) or self.formats.formats[0]
+        return self.current_format
 
-        self.logs = []
+    def _iter_lines(self, lines: Iterable[str], stats: LogStatistics, start_line: int = 1,
+                    leading: list[str] | None = None) -> Iterator[LogEntry]:
+        """라인 이터러블을 파싱하며 엔트리를 yield 하고 통계를 갱신
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_num, line in enumerate(f, start=1):
-                line = line.strip()
-                if not line:
-                    continue
+        연속 라인을 붙이기 위해 엔트리 하나만 보류해 두었다가, 다음 엔트리가 시작되거나
+        입력이 끝나면 yield 한다. 따라서 한 번의 순회로 끝나고 버퍼는 엔트리 하나 크기로 제한된다.
 
-                log_entry = self._parse_line(line, line_num)
-                if log_entry:
-                    self.logs.append(log_entry)
+        Args:
+            lines: 로그 라인 이터러블 (파일 객체 등)
+            stats: 갱신할 통계 정보
+            start_line: 첫 라인의 라인 번호
+            leading: 첫 엔트리보다 앞선 연속 라인을 모을 리스트 (청크/follow 경계에서
+                이전 엔트리에 붙이기 위함, None이면 버린 라인으로 집계)
+        """
+        pending: LogEntry | None = None
+        continuation: list[str] = []
+        target = leading  # 연속 라인을 모을 리스트 (None이면 버림)
+
+        for line_num, line in enumerate(lines, start=start_line):
+            stripped = line.strip()
+            if not stripped:
+                continue
+
+            log_entry = self._parse_line(stripped, line_num)
+            if log_entry is None:
+                stats['unparsed_lines'] += 1
+                if self.current_format.is_entry_start(stripped):
+                    # 알 수 없는 레벨 등 다른 엔트리의 시작: 앞 엔트리를 닫고 뒤따르는 연속 라인은 버림
+                    if pending is not None:
+                        yield self._finish_entry(pending, continuation, stats)
+                        pending = None
+                    target = None
+                    self._continuation_open = False
+                    stats['dropped_lines'] += 1
+                elif target is not None and len(target) < self.MAX_CONTINUATION_LINES:
+                    # 연속 라인은 들여쓰기를 보존
+                    target.append(line.rstrip())
+                else:
+                    stats['dropped_lines'] += 1
+                continue
+
+            if pending is not None:
+                yield self._finish_entry(pending, continuation, stats)
+            pending = log_entry
+            continuation = []
+            target = continuation
+            self._continuation_open = True
+
+        if pending is not None:
+            yield self._finish_entry(pending, continuation, stats)
+
+    def _finish_entry(self, log_entry: LogEntry, continuation: list[str],
+                      stats: LogStatistics) -> LogEntry:
+        """보류 중인 엔트리에 연속 라인을 붙이고 템플릿/필드/통계를 반영"""
+        # 템플릿과 요청 필드는 첫 줄 기준
+        if self.template_miner is not None:
+            match = self.template_miner.add(log_entry['message'])
+            log_entry['template_id'] = match['template_id']
+            log_entry['parameters'] = match['parameters']
+
+        if self.field_extractor is not None:
+            log_entry['fields'] = self.field_extractor.extract(log_entry['message'])
+
+        if continuation:
+            text = '\n' + '\n'.join(continuation)
+            log_entry['message'] += text
+            log_entry['raw'] += text
+
+        self._update_statistics(stats, log_entry)
+        return log_entry
+
+    def _attach_continuation(self, stats: LogStatistics, lines: list[str], attachable: bool) -> None:
+        """이전 청크/follow 호출의 마지막 엔트리에 이어지는 연속 라인을 붙임
+
+        마지막 엔트리가 ERROR면 붙인 뒤의 메시지로 에러 패턴을 다시 분류한다.
+
+        Args:
+            stats: 갱신할 통계 정보
+            lines: 붙일 연속 라인
+            attachable: False면 (앞에 알 수 없는 포맷의 엔트리가 있었으면) 붙이지 않고 버림
+        """
+        if not lines:
+            return
+
+        store = self.logs
+        if not store or not attachable:
+            stats['dropped_lines'] += len(lines)
+            return
+
+        last = len(store) - 1
+        message = store.message_of(last)
+        room = max(0, self.MAX_CONTINUATION_LINES - message.count('\n'))
+        attached = lines[:room]
+        stats['dropped_lines'] += len(lines) - len(attached)
+        if not attached:
+            return
+
+        store.extend_last_message('\n' + '\n'.join(attached))
+
+        if store.level_of(last) == 'ERROR':
+            error_patterns = stats['error_patterns']
+            old = self.error_patterns.classify(message)
+            new = self.error_patterns.classify(store.message_of(last))
+            if old != new:
+                error_patterns[old] -= 1
+                if not error_patterns[old]:
+                    del error_patterns[old]
+                error_patterns[new] = error_patterns.get(new, 0) + 1
+
+        # 이미 색인된 엔트리의 메시지가 늘었으므로 다시 색인
+        if self._keyword_index is not None and self._keyword_index.store is store:
+            self._keyword_index.invalidate_from(last)
+
+    def parse_file_parallel(self, file_path: str | Path | Iterable[str | Path], workers: int | None = None,
+                            chunk_size: int = 16 * 1024 * 1024) -> LogStore:
+        """대용량 로그 파일을 청크 단위로 나눠 여러 프로세스에서 병렬 파싱
+
+        파일을 mmap 한 뒤 줄바꿈 경계에서 청크를 나누고, 각 청크를 프로세스 풀에서
+        파싱한다. 먼저 청크별 라인 수를 병렬로 세어 각 청크의 시작 라인 번호를 정한 뒤,
+        워커가 만든 LogStore와 부분 통계를 파일 순서대로 병합하므로 결과는 parse_file()과 동일하다.
+
+        압축 파일이나 여러 파일은 바이트 위치로 나눌 수 없으므로 parse_file()로 순차 파싱한다.
+
+        Args:
+            file_path: 로그 파일 경로 (glob 패턴, 경로 목록 가능)
+            workers: 워커 프로세스 수 (None이면 CPU 코어 수)
+            chunk_size: 청크 크기 (바이트)
 
-        # 통계 생성
-        self.statistics = self._generate_statistics()
+        Returns:
+            파싱된 로그 엔트리 시퀀스 (LogStore)
+        """
+        paths = resolve_log_paths(file_path)
+        if len(paths) > 1 or detect_compression(paths[0]) is not None:
+            return self.parse_file(paths)
+
+        file_path = paths[0]
+        chunks = self._split_chunks(file_path, chunk_size)
+
+        # 청크가 하나뿐이면 프로세스 풀 비용이 더 크므로 순차 파싱
+        if len(chunks) <= 1:
+            return self.parse_file(file_path)
+
+        cache_key = self._cache_key(paths)
+        if cache_key is not None and self._load_cached(cache_key):
+            return self.logs
+
+        self._reset()
+
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            self._select_format(itertools.islice(f, LogFormatRegistry.SNIFF_LINES))
+
+        # 워커는 같은 설정의 파서를 새로 만들어 청크를 파싱
+        parser_options = {
+            'error_patterns': self.error_patterns,
+            'extract_fields': self.extract_fields,
+            'log_format': self.current_format,
+        }
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # 1단계: 청크별 라인 수로 각 청크의 시작 라인 번호 계산
+            line_counts = executor.map(
+                _count_chunk_lines,
+                [str(file_path)] * len(chunks),
+                [start for start, _ in chunks],
+                [end for _, end in chunks],
+            )
+
+            start_lines = []
+            next_line = 1
+            for line_count in line_counts:
+                start_lines.append(next_line)
+                next_line += line_count
+
+            # 2단계: 청크 파싱
+            futures = [
+                executor.submit(_parse_chunk, type(self), parser_options,
+                                str(file_path), start, end, start_line)
+                for (start, end), start_line in zip(chunks, start_lines)
+            ]
+
+            # 시간 범위가 어긋나지 않도록 파일 순서대로 병합
+            attachable = False
+            for future in futures:
+                store, stats, leading, tail_open = future.result()
+                # 청크 경계에서 잘린 여러 줄 엔트리는 앞 청크의 마지막 엔트리에 이어 붙임
+                self._attach_continuation(self.statistics, leading, attachable)
+                if tail_open is not None:
+                    attachable = tail_open
+                self.logs.extend_store(store)
+                self._merge_statistics(self.statistics, stats)
+
+        # 템플릿 트리는 청크끼리 병합할 수 없으므로 템플릿 마이닝은 병합 후 한 번에 수행
+        if self.template_miner is not None:
+            miner = self.template_miner
+            matches = (miner.add(self.logs.message_of(index)) for index in range(len(self.logs)))
+            self.logs.assign_templates((match['template_id'], match['parameters']) for match in matches)
+
+        self._save_cached(cache_key)
+        self._on_parsed()
 
         return self.logs
 
+    # follow() 모드에서 회전/truncate 감지에 쓰는 파일 앞부분 지문 크기
+    FOLLOW_HEAD_SIZE = 64
+
+    def follow(self, file_path: str | Path) -> list[LogEntry]:
+        """계속 커지는 로그 파일에서 새로 추가된 부분만 파싱 (tail -f 방식)
+
+        마지막으로 읽은 바이트 위치와 inode를 기억해 두고, 호출할 때마다 그 이후에
+        추가된 완전한 라인만 파싱하여 self.logs와 self.statistics에 누적한다.
+        비용은 파일 전체가 아니라 새로 추가된 라인 수에 비례한다.
+
+        - inode가 바뀌면 (PM2 로그 회전) 새 파일을 처음부터 읽는다.
+        - 파일이 작아지거나 앞부분이 바뀌면 (truncate/copytruncate) 처음부터 다시 읽는다.
+        - 줄바꿈으로 끝나지 않은 마지막 라인은 완성될 때까지 다음 호출로 미룬다.
+        - 새로 추가된 부분이 연속 라인으로 시작하면 이전 호출의 마지막 엔트리에 붙인다.
+
+        Args:
+            file_path: 로그 파일 경로
+
+        Returns:
+            이번 호출에서 새로 파싱된 로그 엔트리 리스트
+        """
+        file_path = Path(file_path)
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"로그 파일을 찾을 수 없습니다: {file_path}")
+
+        state = self.follow_state
+
+        # 다른 파일을 추적 중이었다면 처음부터 새로 시작
+        if state is None or state['path'] != str(file_path):
+            self._reset()
+            state = None
+
+        with open(file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            inode = (stat.st_dev, stat.st_ino)
+            head = f.read(self.FOLLOW_HEAD_SIZE)
+
+            if (state is None
+                    or state['inode'] != inode
+                    or stat.st_size < state['offset']
+                    or not head.startswith(state['head'])):
+                # 새 파일, 회전, truncate: 누적 결과는 유지하고 파일 처음부터 다시 읽기
+                state = FollowState(path=str(file_path), inode=inode, offset=0, next_line=1, head=b'')
+
+            f.seek(state['offset'])
+            data = f.read()
+
+        # 완전한 라인까지만 소비
+        end = data.rfind(b'\n') + 1
+        data = data[:end]
+
+        text = data.decode('utf-8')
+        lines = io.StringIO(text, newline=None).readlines()
+        # 파일을 처음부터 읽는 경우에는 포맷을 다시 감지하고 앞 파일의 엔트리에 붙이지 않음
+        if state['offset']:
+            leading = []
+            attachable = self._continuation_open
+        else:
+            self._select_format(lines[:LogFormatRegistry.SNIFF_LINES])
+            leading = None
+            attachable = self._continuation_open = False
+        new_entries = list(self._iter_lines(lines, self.statistics, state['next_line'], leading))
+        if leading:
+            self._attach_continuation(self.statistics, leading, attachable)
+        self.logs.extend(new_entries)
+
+        state['offset'] += end
+        state['next_line'] += len(lines)
+        if len(state['head']) < self.FOLLOW_HEAD_SIZE:
+            state['head'] = head[:state['offset']]
+        self.follow_state = state
+        self._on_parsed()
+
+        return new_entries
+
+    def _cache_key(self, paths: list[Path]) -> str | None:
+        """파싱 결과에 영향을 주는 설정까지 포함한 캐시 키 (캐시를 쓰지 않으면 None)"""
+        if self.cache is None or self.mine_templates:
+            return None
+
+        options = {
+            'parser': f"{type(self).__module__}.{type(self).__qualname__}",
+            'log_format': self.log_format.name if self.log_format is not None else None,
+            'formats': self.formats.names(),
+            'error_patterns': self.error_patterns.rules,
+            'default_bucket': self.error_patterns.default_bucket,
+            'extract_fields': self.extract_fields,
+            'max_continuation_lines': self.MAX_CONTINUATION_LINES,
+        }
+        return self.cache.key(paths, options)
+
+    def _load_cached(self, cache_key: str) -> bool:
+        """캐시에 결과가 있으면 self.logs/self.statistics로 복원하고 True 반환"""
+        cached = self.cache.load(cache_key)
+        if cached is None:
+            return False
+
+        self._reset()
+        self.logs = cached['logs']
+        self.statistics = cached['statistics']
+        self.current_format = self.log_format or self.formats.get(cached['log_format'])
+        self._on_parsed()
+        return True
+
+    def _save_cached(self, cache_key: str | None) -> None:
+        if cache_key is not None:
+            self.cache.save(cache_key, self.logs, self.statistics, self.current_format.name)
+
+    def _on_parsed(self) -> None:
+        """파싱이 끝난 뒤 eager 모드 인덱스 갱신"""
+        if self.keyword_index_mode == 'eager':
+            self.get_keyword_index().update()
+
+    @staticmethod
+    def _split_chunks(file_path: Path, chunk_size: int) -> list[tuple[int, int]]:
+        """파일을 줄바꿈 경계에 맞춰 (start, end) 바이트 구간으로 분할"""
+        size = file_path.stat().st_size
+        if size == 0:
+            return []
+
+        chunks = []
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                newline = mm.find(b'\n', min(start + chunk_size, size) - 1)
+                end = size if newline == -1 else newline + 1
+                chunks.append((start, end))
+                start = end
+
+        return chunks
+
     def _parse_line(self, line: str, line_number: int) -> LogEntry | None:
         """단일 로그 라인 파싱
 
@@ -87,13 +584,14 @@ class LogParserAgent:
         Returns:
             파싱된 로그 엔트리 또는 None
         """
-        match = self.LOG_PATTERN.match(line)
+        parsed = self.current_format.parse(line)
 
-        if match:
+        if parsed:
+            timestamp, level, message = parsed
             return LogEntry(
-                timestamp=match.group('timestamp').strip(),
-                level=match.group('level').strip(),
-                message=match.group('message').strip(),
+                timestamp=timestamp,
+                level=level,
+                message=message,
                 raw=line,
                 line_number=line_number
             )
@@ -107,63 +605,79 @@ class LogParserAgent:
         Returns:
             로그 통계 정보
         """
-        error_count = 0
-        warn_count = 0
-        info_count = 0
-        debug_count = 0
-        error_patterns: dict[str, int] = {}
-
-        first_timestamp = None
-        last_timestamp = None
+        stats = self._empty_statistics()
 
         for log in self.logs:
-            level = log['level']
-
-            if level == 'ERROR':
-                error_count += 1
-                # 에러 패턴 추출
-                message = log['message']
-                # 주요 에러 키워드 추출
-                if 'Database' in message or 'database' in message:
-                    error_patterns['Database Error'] = error_patterns.get('Database Error', 0) + 1
-                elif 'connect' in message.lower() or 'connection' in message.lower():
-                    error_patterns['Connection Error'] = error_patterns.get('Connection Error', 0) + 1
-                elif '500' in message:
-                    error_patterns['HTTP 500'] = error_patterns.get('HTTP 500', 0) + 1
-                elif '401' in message:
-                    error_patterns['HTTP 401 Unauthorized'] = error_patterns.get('HTTP 401 Unauthorized', 0) + 1
-                elif '403' in message:
-                    error_patterns['HTTP 403 Forbidden'] = error_patterns.get('HTTP 403 Forbidden', 0) + 1
-                elif '400' in message:
-                    error_patterns['HTTP 400 Bad Request'] = error_patterns.get('HTTP 400 Bad Request', 0) + 1
-                else:
-                    error_patterns['Other Error'] = error_patterns.get('Other Error', 0) + 1
+            self._update_statistics(stats, log)
 
-            elif level == 'WARN':
-                warn_count += 1
-            elif level == 'INFO':
-                info_count += 1
-            elif level == 'DEBUG':
-                debug_count += 1
-
-            # 타임스탬프 범위 계산
-            if first_timestamp is None:
-                first_timestamp = log['timestamp']
-            last_timestamp = log['timestamp']
+        return stats
 
+    @staticmethod
+    def _empty_statistics() -> LogStatistics:
+        """비어 있는 통계 정보 생성"""
         return LogStatistics(
-            total_lines=len(self.logs),
-            error_count=error_count,
-            warn_count=warn_count,
-            info_count=info_count,
-            debug_count=debug_count,
+            total_lines=0,
+            error_count=0,
+            warn_count=0,
+            info_count=0,
+            debug_count=0,
             time_range={
-                'start': first_timestamp,
-                'end': last_timestamp
+                'start': None,
+                'end': None
             },
-            error_patterns=error_patterns
+            error_patterns={},
+            unparsed_lines=0,
+            dropped_lines=0
         )
 
+    def _update_statistics(self, stats: LogStatistics, log: LogEntry) -> None:
+        """엔트리 하나를 통계에 반영 (점진적 갱신)
+
+        Args:
+            stats: 갱신할 통계 정보
+            log: 새로 파싱된 로그 엔트리
+        """
+        stats['total_lines'] += 1
+        level = log['level']
+
+        if level == 'ERROR':
+            stats['error_count'] += 1
+            pattern = self.error_patterns.classify(log['message'])
+            error_patterns = stats['error_patterns']
+            error_patterns[pattern] = error_patterns.get(pattern, 0) + 1
+        elif level == 'WARN':
+            stats['warn_count'] += 1
+        elif level == 'INFO':
+            stats['info_count'] += 1
+        elif level == 'DEBUG':
+            stats['debug_count'] += 1
+
+        # 타임스탬프 범위 계산
+        time_range = stats['time_range']
+        if time_range['start'] is None:
+            time_range['start'] = log['timestamp']
+        time_range['end'] = log['timestamp']
+
+    @staticmethod
+    def _merge_statistics(stats: LogStatistics, other: LogStatistics) -> None:
+        """뒤따르는 구간의 부분 통계를 stats에 병합
+
+        Args:
+            stats: 병합 대상 통계 (앞 구간)
+            other: 병합할 통계 (뒤 구간)
+        """
+        for key in ('total_lines', 'error_count', 'warn_count', 'info_count', 'debug_count',
+                    'unparsed_lines', 'dropped_lines'):
+            stats[key] += other[key]
+
+        for pattern, count in other['error_patterns'].items():
+            stats['error_patterns'][pattern] = stats['error_patterns'].get(pattern, 0) + count
+
+        if stats['time_range']['start'] is None:
+            stats['time_range']['start'] = other['time_range']['start']
+        if other['time_range']['end'] is not None:
+            stats['time_range']['end'] = other['time_range']['end']
+
     def get_logs_by_level(self, level: str) -> list[LogEntry]:
         """특정 레벨의 로그만 필터링
 
@@ -173,7 +687,7 @@ class LogParserAgent:
         Returns:
             필터링된 로그 리스트
         """
-        return [log for log in self.logs if log['level'] == level.upper()]
+        return self.logs.entries(self.logs.indices_by_level(level.upper()))
 
     def get_error_logs(self) -> list[LogEntry]:
         """에러 로그만 반환"""
@@ -189,19 +703,126 @@ class LogParserAgent:
         Returns:
             필터링된 로그 리스트
         """
-        if case_sensitive:
-            return [log for log in self.logs if keyword in log['message']]
+        return self.logs.entries(self._find_keyword(keyword, case_sensitive))
+
+    def search_logs(self, keywords: str | list[str], match_all: bool = True,
+                    level: str | None = None, case_sensitive: bool = False) -> list[LogEntry]:
+        """여러 키워드(AND/OR)와 레벨을 조합한 로그 검색
+
+        Args:
+            keywords: 검색 키워드 또는 키워드 리스트
+            match_all: True면 모든 키워드를 포함 (AND), False면 하나 이상 포함 (OR)
+            level: 로그 레벨 필터 (None이면 전체)
+            case_sensitive: 대소문자 구분 여부
+
+        Returns:
+            필터링된 로그 리스트
+        """
+        if isinstance(keywords, str):
+            keywords = [keywords]
+
+        if keywords:
+            indices = combine_indices(
+                (self._find_keyword(keyword, case_sensitive) for keyword in keywords),
+                match_all
+            )
         else:
-            keyword_lower = keyword.lower()
-            return [log for log in self.logs if keyword_lower in log['message'].lower()]
+            indices = range(len(self.logs))
+
+        if level is not None:
+            indices = self.logs.filter_by_level(indices, level.upper())
+
+        return self.logs.entries(indices)
+
+    def get_keyword_index(self) -> KeywordIndex:
+        """현재 로그에 대한 키워드 역색인 (없으면 생성, 새 엔트리는 조회 시 추가 색인)"""
+        if self._keyword_index is None or self._keyword_index.store is not self.logs:
+            self._keyword_index = KeywordIndex(self.logs)
+        return self._keyword_index
+
+    def get_logs_between(self, start: str | int, end: str | int) -> list[LogEntry]:
+        """시간 구간에 속한 로그를 시간순으로 반환 (양 끝 포함)
+
+        첫 조회 때 epoch 기준 정렬 인덱스를 만들고 이후에는 이진 탐색으로 구간을 자른다.
+        순서가 조금 어긋난 라인도 시각 기준으로 올바르게 포함된다.
+
+        Args:
+            start: 시작 시각 ('YYYY-MM-DD HH:MM:SS' 또는 epoch 초)
+            end: 종료 시각 ('YYYY-MM-DD HH:MM:SS' 또는 epoch 초)
+
+        Returns:
+            구간 내 로그 리스트
+        """
+        start_epoch = self._to_epoch(start)
+        end_epoch = self._to_epoch(end)
+
+        return self.logs.entries(self.get_time_index().between(start_epoch, end_epoch))
+
+    def get_logs_around(self, timestamp: str | int, seconds: int = 150) -> list[LogEntry]:
+        """특정 시각 전후 seconds초 안의 로그 반환 (예: 첫 ERROR 전후 5분)
+
+        Args:
+            timestamp: 기준 시각 ('YYYY-MM-DD HH:MM:SS' 또는 epoch 초)
+            seconds: 전후 범위 (초)
+
+        Returns:
+            구간 내 로그 리스트
+        """
+        center = self._to_epoch(timestamp)
+
+        return self.logs.entries(self.get_time_index().between(center - seconds, center + seconds))
+
+    def get_time_index(self) -> TimeIndex:
+        """현재 로그에 대한 시간 인덱스 (없으면 생성, 새 엔트리는 조회 시 반영)"""
+        if self._time_index is None or self._time_index.store is not self.logs:
+            self._time_index = TimeIndex(self.logs)
+        return self._time_index
+
+    def get_templates(self) -> list[LogTemplate]:
+        """템플릿 마이닝 결과 (건수 내림차순, mine_templates=True일 때만)"""
+        if self.template_miner is None:
+            return []
+        return self.template_miner.templates()
+
+    def get_request_metrics(self) -> list[EndpointMetrics]:
+        """엔드포인트별 p50/p95/p99 응답 시간과 상태 코드 분포 (extract_fields=True일 때만)
+
+        LLM이 로그를 다시 읽어 추정하는 대신 파싱 시점에 추출한 값으로 정확히 계산한다.
+        """
+        if self.logs.request_fields is None:
+            return []
+        return self.logs.request_fields.endpoint_metrics()
+
+    def _to_epoch(self, timestamp: str | int) -> int:
+        """조회용 시각 인자를 epoch 초로 변환"""
+        if isinstance(timestamp, int):
+            return timestamp
+
+        epoch = self.logs.parse_epoch(timestamp.strip())
+        if epoch == LogStore.NO_TIMESTAMP:
+            raise ValueError(f"타임스탬프 형식이 올바르지 않습니다 (YYYY-MM-DD HH:MM:SS): {timestamp}")
+        return epoch
+
+    def _find_keyword(self, keyword: str, case_sensitive: bool) -> list[int]:
+        """키워드를 포함한 엔트리 인덱스 목록"""
+        # 대소문자 구분 검색은 공유 메시지 버퍼를 바로 찾는 편이 더 빠름
+        if case_sensitive or self.keyword_index_mode == 'off':
+            return self.logs.indices_with_keyword(keyword, case_sensitive)
+        return self.get_keyword_index().lookup(keyword)
 
     def get_statistics(self) -> LogStatistics | None:
         """통계 정보 반환"""
         return self.statistics
 
-    def format_for_llm(self) -> str:
+    def format_for_llm(self, token_budget: int | None = DEFAULT_TOKEN_BUDGET) -> str:
         """LLM에 전달할 수 있는 형태로 포맷팅
 
+        전체 로그가 토큰 예산 안에 들어가면 모든 라인을 그대로 보여주고,
+        넘치면 LogCompactor로 반복 템플릿을 묶고 ERROR/WARN 문맥 위주로 압축한다.
+
+        Args:
+            token_budget: 최대 토큰 수 (추정치, None이면 제한 없이 전체 로그)
+
         Returns:
             포맷팅된 로그 문자열
         """
@@ -217,6 +838,8 @@ class LogParserAgent:
             output.append(f"총 로그 라인 수: {stats['total_lines']}")
             output.append(f"ERROR: {stats['error_count']}, WARN: {stats['warn_count']}, INFO: {stats['info_count']}, DEBUG: {stats['debug_count']}")
             output.append(f"시간 범위: {stats['time_range']['start']} ~ {stats['time_range']['end']}")
+            if stats['unparsed_lines']:
+                output.append(f"포맷 외 라인: {stats['unparsed_lines']} (스택 트레이스 등, 버림: {stats['dropped_lines']})")
 
             if stats['error_patterns']:
                 output.append("\n에러 패턴 분석:")
@@ -225,14 +848,66 @@ class LogParserAgent:
 
             output.append("\n")
 
+        header = "\n".join(output)
+        remaining = None if token_budget is None else token_budget - estimate_tokens(header)
+
         # 전체 로그 (라인 번호 포함)
         output.append("=== 전체 로그 ===")
         for log in self.logs:
-            output.append(f"[Line {log['line_number']:3d}] {log['raw']}")
+            line = f"[Line {log['line_number']:3d}] {log['raw']}"
+            output.append(line)
+
+            # 예산을 넘는 순간 전체 로그 출력을 포기하고 압축 모드로 전환
+            if remaining is not None:
+                remaining -= estimate_tokens(line)
+                if remaining < 0:
+                    # 템플릿 마이닝을 켰다면 Drain 템플릿으로 반복 라인을 묶음
+                    template_of = self.template_miner.template_of if self.template_miner else None
+                    compactor = LogCompactor(template_of=template_of)
+                    compacted = compactor.compact(self.logs, token_budget - estimate_tokens(header))
+                    return header + "\n" + compacted
 
         return "\n".join(output)
 
 
+def _count_chunk_lines(file_path: str, start: int, end: int) -> int:
+    """워커 프로세스에서 청크의 라인 수를 계산
+
+    파일 객체와 같은 universal newline 규칙(\\n, \\r, \\r\\n)으로 센다.
+    """
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = mm[start:end]
+
+    count = data.count(b'\n') + data.count(b'\r') - data.count(b'\r\n')
+    if data and data[-1:] not in (b'\n', b'\r'):
+        count += 1
+
+    return count
+
+
+def _parse_chunk(parser_cls: type[LogParserAgent], parser_options: dict,
+                 file_path: str, start: int, end: int, start_line: int) -> tuple[LogStore, LogStatistics, list[str], bool | None]:
+    """워커 프로세스에서 파일의 한 청크를 파싱
+
+    Returns:
+        (청크의 LogStore, 부분 통계, 첫 엔트리 앞의 연속 라인,
+         청크 끝에서 다음 연속 라인을 붙일 수 있는지 - 엔트리 시작 라인이 없었으면 None)
+    """
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode('utf-8')
+
+    parser = parser_cls(**parser_options)
+    stats = parser._empty_statistics()
+    store = LogStore()
+    # 파일 객체와 동일한 universal newline 규칙으로 라인 분리
+    lines = io.StringIO(text, newline=None)
+    leading: list[str] = []
+    parser._continuation_open = None
+    store.extend(parser._iter_lines(lines, stats, start_line, leading))
+
+    return store, stats, leading, parser._continuation_open
+
+
 # 사용 예시
 if __name__ == "__main__":
     # 테스트
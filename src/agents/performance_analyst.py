@@ -7,6 +7,7 @@ from typing import TypedDict
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from src.utils.llm_provider import get_llm
+from src.utils.request_fields import EndpointMetrics, format_endpoint_metrics
 
 
 class PerformanceAnalysisResult(TypedDict):
@@ -175,19 +176,37 @@ class PerformanceAnalystAgent:
 - 사용자 관점의 영향을 설명하세요
 """
 
-    def __init__(self):
-        self.llm = get_llm(temperature=0.0)
+    def __init__(self, llm=None):
+        """
+        Args:
+            llm: 사용할 채팅 모델 (None이면 get_llm()의 기본 모델)
+        """
+        self.llm = llm if llm is not None else get_llm(temperature=0.0)
 
-    def analyze(self, log_data: str, classification_result: dict | None = None) -> PerformanceAnalysisResult:
+    def analyze(self, log_data: str, classification_result: dict | None = None,
+                request_metrics: list[EndpointMetrics] | None = None) -> PerformanceAnalysisResult:
         """성능 이슈 심층 분석
 
         Args:
             log_data: 로그 데이터
             classification_result: Classification Agent의 분류 결과
+            request_metrics: 파서가 계산한 엔드포인트별 응답 시간/상태 코드 메트릭
 
         Returns:
             성능 분석 결과
         """
+        response = self.llm.invoke(self._build_messages(log_data, classification_result, request_metrics))
+        return self._parse_response(response.content)
+
+    async def aanalyze(self, log_data: str, classification_result: dict | None = None,
+                       request_metrics: list[EndpointMetrics] | None = None) -> PerformanceAnalysisResult:
+        """analyze()의 비동기 버전 (ainvoke로 호출하므로 응답을 기다리는 동안 이벤트 루프를 막지 않음)"""
+        response = await self.llm.ainvoke(self._build_messages(log_data, classification_result, request_metrics))
+        return self._parse_response(response.content)
+
+    def _build_messages(self, log_data: str, classification_result: dict | None = None,
+                        request_metrics: list[EndpointMetrics] | None = None) -> list:
+        """LLM에 보낼 메시지 구성"""
         prompt_parts = ["다음 성능 로그를 심층 분석해주세요:\n"]
 
         if classification_result:
@@ -197,16 +216,21 @@ class PerformanceAnalystAgent:
             prompt_parts.append(f"주요 지표: {', '.join(classification_result.get('key_indicators', []))}")
             prompt_parts.append("")
 
+        if request_metrics:
+            # 로그에서 직접 계산한 값이므로 LLM이 추정하지 않고 그대로 쓰도록 안내
+            prompt_parts.append("\n[측정된 요청 메트릭 - 로그에서 정확히 계산한 값이므로 metrics 항목에 그대로 사용하세요]")
+            prompt_parts.append(format_endpoint_metrics(request_metrics))
+            prompt_parts.append("")
+
         prompt_parts.append(f"\n[로그 데이터]\n{log_data}")
 
-        messages = [
+        return [
             SystemMessage(content=self.SYSTEM_PROMPT),
             HumanMessage(content="\n".join(prompt_parts))
         ]
 
-        response = self.llm.invoke(messages)
-        result_text = response.content
-
+    def _parse_response(self, result_text: str) -> PerformanceAnalysisResult:
+        """LLM 응답에서 JSON을 추출해 분석 결과로 변환"""
         # JSON 파싱
         import json
         import re
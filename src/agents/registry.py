@@ -0,0 +1,107 @@
+"""Agent Registry - 워크플로우와 UI가 공유하는 에이전트 인스턴스"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from src.agents.classifier import ClassificationAgent
+from src.agents.infrastructure_analyst import InfrastructureAnalystAgent
+from src.agents.performance_analyst import PerformanceAnalystAgent
+from src.agents.security_analyst import SecurityAnalystAgent
+from src.utils.classification_rules import get_rule_classifier
+from src.utils.incident_memory import get_incident_memory
+
+
+# 분류 카테고리 → 담당 분석 에이전트 이름 (application/user 이슈는 현재 인프라 분석 에이전트가 처리)
+ANALYST_FOR_CATEGORY = {
+    'infrastructure': 'infrastructure',
+    'security': 'security',
+    'performance': 'performance',
+    'application': 'infrastructure',
+    'user': 'infrastructure',
+}
+
+
+class AgentRegistry:
+    """에이전트를 처음 요청할 때 한 번만 만들어 두고 재사용하는 컨테이너
+
+    - classifier: 규칙 엔진과 인시던트 메모리를 붙인 분류 에이전트
+    - infrastructure / security / performance: 분석 에이전트
+
+    에이전트는 LLM 클라이언트와 프롬프트만 갖고 호출 간 상태가 없으므로 여러 스레드/코루틴이
+    동시에 써도 된다 (분류 결과와 분류 방법은 classify_detailed()/aclassify_detailed()로 받음).
+    생성 함수를 넘기면 기본 구성 대신 사용하므로 테스트에서 가짜 LLM을 붙인 에이전트를 주입할 수 있다.
+
+    예시:
+        registry = get_agent_registry()
+        outcome = await registry.classifier.aclassify_detailed(log_data, logs=parser.logs)
+        analyst = registry.analyst_for(outcome['classification']['category'])
+    """
+
+    def __init__(self, factories: dict[str, Callable[[], object]] | None = None):
+        """
+        Args:
+            factories: 에이전트 이름 → 생성 함수 (지정하지 않은 에이전트는 기본 구성으로 생성)
+        """
+        self._factories: dict[str, Callable[[], object]] = {
+            'classifier': lambda: ClassificationAgent(incident_memory=get_incident_memory(),
+                                                      rules=get_rule_classifier()),
+            'infrastructure': InfrastructureAnalystAgent,
+            'security': SecurityAnalystAgent,
+            'performance': PerformanceAnalystAgent,
+        }
+        self._factories.update(factories or {})
+        self._agents: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str):
+        """이름으로 에이전트 조회 (처음 요청할 때 생성)"""
+        agent = self._agents.get(name)
+        if agent is None:
+            with self._lock:
+                # 락을 기다리는 동안 다른 스레드가 만들었을 수 있으므로 다시 확인
+                agent = self._agents.get(name)
+                if agent is None:
+                    if name not in self._factories:
+                        raise KeyError(f"등록되지 않은 에이전트입니다: {name}")
+                    agent = self._agents[name] = self._factories[name]()
+        return agent
+
+    @property
+    def classifier(self) -> ClassificationAgent:
+        return self.get('classifier')
+
+    @property
+    def infrastructure(self) -> InfrastructureAnalystAgent:
+        return self.get('infrastructure')
+
+    @property
+    def security(self) -> SecurityAnalystAgent:
+        return self.get('security')
+
+    @property
+    def performance(self) -> PerformanceAnalystAgent:
+        return self.get('performance')
+
+    def analyst_for(self, category: str):
+        """분류 카테고리를 담당하는 분석 에이전트 (모르는 카테고리는 인프라 분석 에이전트)"""
+        return self.get(ANALYST_FOR_CATEGORY.get(category, 'infrastructure'))
+
+    def clear(self) -> None:
+        """만들어 둔 에이전트 폐기 (LLM 설정을 바꾼 뒤 새로 만들 때)"""
+        with self._lock:
+            self._agents.clear()
+
+
+_shared_registry: AgentRegistry | None = None
+_shared_registry_lock = threading.Lock()
+
+
+def get_agent_registry() -> AgentRegistry:
+    """프로세스 전체가 공유하는 기본 에이전트 레지스트리"""
+    global _shared_registry
+    with _shared_registry_lock:
+        if _shared_registry is None:
+            _shared_registry = AgentRegistry()
+        return _shared_registry
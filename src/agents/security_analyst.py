@@ -170,8 +170,12 @@ class SecurityAnalystAgent:
 - 즉각 대응과 장기 보안 강화를 구분하여 제시하세요
 """
 
-    def __init__(self):
-        self.llm = get_llm(temperature=0.0)
+    def __init__(self, llm=None):
+        """
+        Args:
+            llm: 사용할 채팅 모델 (None이면 get_llm()의 기본 모델)
+        """
+        self.llm = llm if llm is not None else get_llm(temperature=0.0)
 
     def analyze(self, log_data: str, classification_result: dict | None = None) -> SecurityAnalysisResult:
         """보안 이슈 심층 분석
@@ -183,6 +187,16 @@ class SecurityAnalystAgent:
         Returns:
             보안 분석 결과
         """
+        response = self.llm.invoke(self._build_messages(log_data, classification_result))
+        return self._parse_response(response.content)
+
+    async def aanalyze(self, log_data: str, classification_result: dict | None = None) -> SecurityAnalysisResult:
+        """analyze()의 비동기 버전 (ainvoke로 호출하므로 응답을 기다리는 동안 이벤트 루프를 막지 않음)"""
+        response = await self.llm.ainvoke(self._build_messages(log_data, classification_result))
+        return self._parse_response(response.content)
+
+    def _build_messages(self, log_data: str, classification_result: dict | None = None) -> list:
+        """LLM에 보낼 메시지 구성"""
         prompt_parts = ["다음 보안 로그를 심층 분석해주세요:\n"]
 
         if classification_result:
@@ -194,14 +208,13 @@ class SecurityAnalystAgent:
 
         prompt_parts.append(f"\n[로그 데이터]\n{log_data}")
 
-        messages = [
+        return [
             SystemMessage(content=self.SYSTEM_PROMPT),
             HumanMessage(content="\n".join(prompt_parts))
         ]
 
-        response = self.llm.invoke(messages)
-        result_text = response.content
-
+    def _parse_response(self, result_text: str) -> SecurityAnalysisResult:
+        """LLM 응답에서 JSON을 추출해 분석 결과로 변환"""
         # JSON 파싱
         import json
         import re
@@ -2,15 +2,30 @@
 
 from __future__ import annotations
 
-from typing import TypedDict, Literal
-
-from langgraph.graph import StateGraph, END
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, AsyncIterator, Awaitable, Callable, Iterable, TypedDict, Literal
 
 from src.agents.log_parser import LogParserAgent
-from src.agents.classifier import ClassificationAgent
-from src.agents.infrastructure_analyst import InfrastructureAnalystAgent
-from src.agents.security_analyst import SecurityAnalystAgent
-from src.agents.performance_analyst import PerformanceAnalystAgent
+from src.agents.classifier import ClassificationAgent, ClassificationOutcome
+from src.agents.registry import ANALYST_FOR_CATEGORY, AgentRegistry, get_agent_registry
+from src.utils.incident_memory import build_fingerprint
+from src.utils.log_store import LogStore
+from src.utils.parse_cache import ParseCache
+
+if TYPE_CHECKING:
+    from langgraph.graph import StateGraph
+
+
+def merge_analysis_results(current: dict | None, update: dict | None) -> dict | None:
+    """analysis_results 리듀서 - 병렬로 실행한 분석 에이전트의 결과를 하나의 dict로 합침"""
+    if update is None:
+        return current
+    return {**(current or {}), **update}
 
 
 # State 정의
@@ -18,19 +33,39 @@ class AnalysisState(TypedDict):
     """워크플로우 상태"""
     log_file_path: str
     parsed_logs: dict | None
+    log_store: LogStore | None  # 파싱된 로그 엔트리 (규칙 기반 분류 입력)
     log_data: str | None
+    request_metrics: list | None  # 엔드포인트별 응답 시간/상태 코드 (파서가 계산)
+    incident_fingerprint: dict | None  # 유사 인시던트 검색용 로그 지문 (템플릿 히스토그램 + 에러 패턴)
     classification: dict | None
+    categories: list | None  # 관련 카테고리 순위 (팬아웃 모드에서 여러 개일 수 있음)
     analysis_result: dict | None
+    # 팬아웃 모드: 분석 에이전트 이름 → 분석 결과 (실패하면 {'error': 사유})
+    analysis_results: Annotated[dict | None, merge_analysis_results]
+    merged_analysis: dict | None  # 팬아웃 모드: 분석 결과를 합친 보고서 (MergedAnalysis)
+    speculation: str | None  # 투기 실행 모드: hit(추측 적중, 미리 시작한 분석 사용), miss(결과를 버리고 재라우팅)
     error: str | None
 
 
+class MergedAnalysis(TypedDict):
+    """팬아웃 모드에서 여러 분석 에이전트의 결과를 합친 보고서"""
+    categories: list[str]  # 분석한 에이전트 (분류 순위 순)
+    analyses: dict[str, dict]  # 분석 에이전트 이름 → 분석 결과
+    failed: dict[str, str]  # 실패한 분석 에이전트 → 에러 메시지
+    headlines: dict[str, str]  # 분석 에이전트 이름 → 한 줄 요약 (이슈/공격/성능 이슈 유형)
+    actions: list[str]  # 에이전트별 권장 조치를 순위 순으로 합친 목록 (중복 제거)
+
+
 # 노드 함수들
 def parse_logs_node(state: AnalysisState) -> AnalysisState:
-    """로그 파싱 노드"""
+    """로그 파싱 노드 (analyze_many()처럼 미리 파싱한 상태가 들어오면 그대로 통과)"""
+    if state.get('parsed_logs') is not None or state.get('error'):
+        return state
+
     print(f"[1/4] 로그 파싱 중: {state['log_file_path']}")
 
     try:
-        parser = LogParserAgent()
+        parser = LogParserAgent(extract_fields=True, cache=ParseCache())
         parser.parse_file(state['log_file_path'])
 
         # 통계 정보 저장
@@ -42,7 +77,10 @@ def parse_logs_node(state: AnalysisState) -> AnalysisState:
         return {
             **state,
             'parsed_logs': stats,
+            'log_store': parser.logs,
             'log_data': log_data,
+            'request_metrics': parser.get_request_metrics(),
+            'incident_fingerprint': build_fingerprint(parser.logs, stats),
             'error': None
         }
     except Exception as e:
@@ -52,124 +90,438 @@ def parse_logs_node(state: AnalysisState) -> AnalysisState:
         }
 
 
-def classify_node(state: AnalysisState) -> AnalysisState:
-    """분류 노드"""
+async def parse_logs_node_async(state: AnalysisState) -> AnalysisState:
+    """로그 파싱 노드 (비동기 실행용, 파싱은 CPU 작업이므로 스레드에서 실행)"""
+    return await asyncio.to_thread(parse_logs_node, state)
+
+
+def classify_node(state: AnalysisState, registry: AgentRegistry | None = None,
+                  ranked: bool = False) -> AnalysisState:
+    """분류 노드 (ranked=True면 팬아웃용 카테고리 순위도 계산)"""
     print("[2/4] 카테고리 분류 중...")
 
     if state.get('error'):
         return state
 
     try:
-        classifier = ClassificationAgent()
-        classification = classifier.classify(state['log_data'])
-
-        print(f"  → 카테고리: {classification['category']}")
-        print(f"  → 심각도: {classification['severity']}")
-
-        return {
-            **state,
-            'classification': classification,
-            'error': None
-        }
+        classifier = (registry or get_agent_registry()).classifier
+        outcome = classifier.classify_detailed(
+            state['log_data'],
+            fingerprint=state.get('incident_fingerprint'),
+            source=Path(state['log_file_path']).name,
+            logs=state.get('log_store'),
+            ranked=ranked
+        )
     except Exception as e:
         return {
             **state,
             'error': f"분류 실패: {str(e)}"
         }
 
+    return _classification_update(state, classifier, outcome)
 
-def infrastructure_analysis_node(state: AnalysisState) -> AnalysisState:
-    """인프라 분석 노드"""
-    print("[3/4] Infrastructure 심층 분석 중...")
+
+async def classify_node_async(state: AnalysisState, registry: AgentRegistry | None = None,
+                              ranked: bool = False) -> AnalysisState:
+    """분류 노드 (비동기 실행용)"""
+    print("[2/4] 카테고리 분류 중...")
 
     if state.get('error'):
         return state
 
     try:
-        analyst = InfrastructureAnalystAgent()
-        analysis = analyst.analyze(
+        classifier = (registry or get_agent_registry()).classifier
+        outcome = await classifier.aclassify_detailed(
             state['log_data'],
-            state['classification']
+            fingerprint=state.get('incident_fingerprint'),
+            source=Path(state['log_file_path']).name,
+            logs=state.get('log_store'),
+            ranked=ranked
         )
-
-        print(f"  → 이슈: {analysis['issue_type']}")
-        print(f"  → 긴급도: {analysis['urgency']}")
-
-        return {
-            **state,
-            'analysis_result': analysis,
-            'error': None
-        }
     except Exception as e:
         return {
             **state,
-            'error': f"Infrastructure 분석 실패: {str(e)}"
+            'error': f"분류 실패: {str(e)}"
         }
 
+    return _classification_update(state, classifier, outcome)
+
+
+def _classification_update(state: AnalysisState, classifier: ClassificationAgent,
+                           outcome: ClassificationOutcome) -> AnalysisState:
+    """분류 결과 출력 후 상태에 반영"""
+    classification = outcome['classification']
+    if outcome['method'] == "rules":
+        print(f"  → 규칙 기반 분류, LLM 호출 생략 (규칙 적중률 {classifier.rules.hit_rate:.0%})")
+    elif outcome['method'] == "memory":
+        match = outcome['match']
+        print(f"  → 유사 인시던트 재사용 (유사도 {match['similarity']:.2f}, {match['source']})")
+    print(f"  → 카테고리: {classification['category']}")
+    if len(outcome['categories']) > 1:
+        print(f"  → 관련 카테고리: {', '.join(outcome['categories'])}")
+    print(f"  → 심각도: {classification['severity']}")
+
+    return {
+        **state,
+        'classification': classification,
+        'categories': outcome['categories'],
+        'error': None
+    }
+
+
+def infrastructure_analysis_node(state: AnalysisState, registry: AgentRegistry | None = None) -> AnalysisState:
+    """인프라 분석 노드"""
+    print("[3/4] Infrastructure 심층 분석 중...")
+    return _run_analysis(
+        state, "Infrastructure", _report_infrastructure,
+        lambda: (registry or get_agent_registry()).infrastructure.analyze(
+            state['log_data'], state['classification'])
+    )
+
+
+async def infrastructure_analysis_node_async(state: AnalysisState,
+                                             registry: AgentRegistry | None = None) -> AnalysisState:
+    """인프라 분석 노드 (비동기 실행용)"""
+    print("[3/4] Infrastructure 심층 분석 중...")
+    return await _arun_analysis(
+        state, "Infrastructure", _report_infrastructure,
+        lambda: (registry or get_agent_registry()).infrastructure.aanalyze(
+            state['log_data'], state['classification'])
+    )
+
 
-def security_analysis_node(state: AnalysisState) -> AnalysisState:
+def security_analysis_node(state: AnalysisState, registry: AgentRegistry | None = None) -> AnalysisState:
     """보안 분석 노드"""
     print("[3/4] Security 심층 분석 중...")
+    return _run_analysis(
+        state, "Security", _report_security,
+        lambda: (registry or get_agent_registry()).security.analyze(
+            state['log_data'], state['classification'])
+    )
+
 
+async def security_analysis_node_async(state: AnalysisState,
+                                       registry: AgentRegistry | None = None) -> AnalysisState:
+    """보안 분석 노드 (비동기 실행용)"""
+    print("[3/4] Security 심층 분석 중...")
+    return await _arun_analysis(
+        state, "Security", _report_security,
+        lambda: (registry or get_agent_registry()).security.aanalyze(
+            state['log_data'], state['classification'])
+    )
+
+
+def performance_analysis_node(state: AnalysisState, registry: AgentRegistry | None = None) -> AnalysisState:
+    """성능 분석 노드"""
+    print("[3/4] Performance 심층 분석 중...")
+    return _run_analysis(
+        state, "Performance", _report_performance,
+        lambda: (registry or get_agent_registry()).performance.analyze(
+            state['log_data'], state['classification'], request_metrics=state.get('request_metrics'))
+    )
+
+
+async def performance_analysis_node_async(state: AnalysisState,
+                                          registry: AgentRegistry | None = None) -> AnalysisState:
+    """성능 분석 노드 (비동기 실행용)"""
+    print("[3/4] Performance 심층 분석 중...")
+    return await _arun_analysis(
+        state, "Performance", _report_performance,
+        lambda: (registry or get_agent_registry()).performance.aanalyze(
+            state['log_data'], state['classification'], request_metrics=state.get('request_metrics'))
+    )
+
+
+def application_analysis_node(state: AnalysisState, registry: AgentRegistry | None = None) -> AnalysisState:
+    """애플리케이션 분석 노드 (현재는 Infrastructure로 처리)"""
+    print("[3/4] Application 분석 중 (Infrastructure Analyst 사용)...")
+
+    # 현재는 Infrastructure Analyst로 처리
+    return infrastructure_analysis_node(state, registry)
+
+
+async def application_analysis_node_async(state: AnalysisState,
+                                          registry: AgentRegistry | None = None) -> AnalysisState:
+    """애플리케이션 분석 노드 (비동기 실행용)"""
+    print("[3/4] Application 분석 중 (Infrastructure Analyst 사용)...")
+    return await infrastructure_analysis_node_async(state, registry)
+
+
+def _run_analysis(state: AnalysisState, label: str, report: Callable[[dict], None],
+                  analyze: Callable[[], dict]) -> AnalysisState:
+    """분석 노드 공통 처리 (이전 단계 에러 전달, 예외는 상태의 error로 변환)"""
     if state.get('error'):
         return state
 
     try:
-        analyst = SecurityAnalystAgent()
-        analysis = analyst.analyze(
-            state['log_data'],
-            state['classification']
-        )
-
-        print(f"  → 공격 유형: {analysis['attack_type']}")
-        print(f"  → 심각도: {analysis['severity']}")
-
+        analysis = analyze()
+    except Exception as e:
         return {
             **state,
-            'analysis_result': analysis,
-            'error': None
+            'error': f"{label} 분석 실패: {str(e)}"
         }
+
+    report(analysis)
+    return {
+        **state,
+        'analysis_result': analysis,
+        'error': None
+    }
+
+
+async def _arun_analysis(state: AnalysisState, label: str, report: Callable[[dict], None],
+                         analyze: Callable[[], Awaitable[dict]]) -> AnalysisState:
+    """_run_analysis()의 비동기 버전"""
+    if state.get('error'):
+        return state
+
+    try:
+        analysis = await analyze()
     except Exception as e:
         return {
             **state,
-            'error': f"Security 분석 실패: {str(e)}"
+            'error': f"{label} 분석 실패: {str(e)}"
         }
 
+    report(analysis)
+    return {
+        **state,
+        'analysis_result': analysis,
+        'error': None
+    }
 
-def performance_analysis_node(state: AnalysisState) -> AnalysisState:
-    """성능 분석 노드"""
-    print("[3/4] Performance 심층 분석 중...")
 
-    if state.get('error'):
+def _report_infrastructure(analysis: dict) -> None:
+    print(f"  → 이슈: {analysis['issue_type']}")
+    print(f"  → 긴급도: {analysis['urgency']}")
+
+
+def _report_security(analysis: dict) -> None:
+    print(f"  → 공격 유형: {analysis['attack_type']}")
+    print(f"  → 심각도: {analysis['severity']}")
+
+
+def _report_performance(analysis: dict) -> None:
+    print(f"  → 성능 이슈: {analysis['performance_issue']}")
+
+
+# 팬아웃 모드의 분석 노드 (분석 에이전트 이름 → 동기/비동기 노드 함수)
+_ANALYSIS_NODES = {
+    'infrastructure': (infrastructure_analysis_node, infrastructure_analysis_node_async),
+    'security': (security_analysis_node, security_analysis_node_async),
+    'performance': (performance_analysis_node, performance_analysis_node_async),
+}
+
+# 분석 에이전트별 (한 줄 요약 필드, 권장 조치 필드들)
+_ANALYSIS_FIELDS = {
+    'infrastructure': ('issue_type', ('recommended_actions',)),
+    'security': ('attack_type', ('immediate_response', 'recommended_actions')),
+    'performance': ('performance_issue', ('quick_wins', 'optimization_plan')),
+}
+
+
+def fan_out_analysis_node(state: AnalysisState, analyst: str,
+                          registry: AgentRegistry | None = None) -> dict:
+    """팬아웃 분석 노드 - 분석 에이전트 하나를 실행하고 결과를 analysis_results에 추가"""
+    return _branch_update(analyst, _ANALYSIS_NODES[analyst][0](_branch_state(state, analyst), registry))
+
+
+async def fan_out_analysis_node_async(state: AnalysisState, analyst: str,
+                                      registry: AgentRegistry | None = None) -> dict:
+    """팬아웃 분석 노드 (비동기 실행용)"""
+    return _branch_update(analyst, await _ANALYSIS_NODES[analyst][1](_branch_state(state, analyst), registry))
+
+
+def _branch_state(state: AnalysisState, analyst: str) -> AnalysisState:
+    """주 카테고리가 아닌 분석 에이전트에는 자기 카테고리로 분류 결과를 넘김 (프롬프트의 분석 관점)"""
+    classification = state['classification']
+    if ANALYST_FOR_CATEGORY.get(classification['category'], 'infrastructure') == analyst:
         return state
+    return {**state, 'classification': {**classification, 'category': analyst}}
 
-    try:
-        analyst = PerformanceAnalystAgent()
-        analysis = analyst.analyze(
-            state['log_data'],
-            state['classification']
-        )
 
-        print(f"  → 성능 이슈: {analysis['performance_issue']}")
+def _branch_update(analyst: str, result: AnalysisState) -> dict:
+    """병렬 분기는 같은 키를 동시에 덮어쓸 수 없으므로 리듀서가 있는 analysis_results만 갱신"""
+    if result.get('error'):
+        return {'analysis_results': {analyst: {'error': result['error']}}}
+    return {'analysis_results': {analyst: result['analysis_result']}}
 
+
+def merge_analyses_node(state: AnalysisState) -> AnalysisState:
+    """병렬로 실행한 분석 결과를 하나의 보고서로 합치는 노드"""
+    print("[4/4] 분석 결과 병합 중...")
+
+    results = state.get('analysis_results') or {}
+    analysts = [analyst for analyst in _ranked_analysts(state) if analyst in results]
+    analyses = {analyst: results[analyst] for analyst in analysts if 'error' not in results[analyst]}
+    failed = {analyst: results[analyst]['error'] for analyst in analysts if 'error' in results[analyst]}
+
+    if not analyses:
         return {
             **state,
-            'analysis_result': analysis,
-            'error': None
+            'error': "; ".join(failed.values()) or "분석 결과가 없습니다"
         }
-    except Exception as e:
+
+    headlines = {}
+    actions = []
+    for analyst, analysis in analyses.items():
+        headline_field, action_fields = _ANALYSIS_FIELDS[analyst]
+        headlines[analyst] = analysis.get(headline_field, '')
+        for field in action_fields:
+            for action in analysis.get(field) or []:
+                if action not in actions:
+                    actions.append(action)
+
+    merged = MergedAnalysis(categories=analysts, analyses=analyses, failed=failed,
+                            headlines=headlines, actions=actions)
+    print(f"  → 분석 {len(analyses)}건 병합 (실패 {len(failed)}건), 권장 조치 {len(actions)}개")
+
+    return {
+        **state,
+        # 기존 소비자를 위해 가장 순위가 높은 분석 결과도 그대로 둠
+        'analysis_result': next(iter(analyses.values())),
+        'merged_analysis': merged,
+        'error': None
+    }
+
+
+def _ranked_analysts(state: AnalysisState) -> list[str]:
+    """카테고리 순위를 담당 분석 에이전트 순위로 변환 (application/user는 인프라, 중복 제거)"""
+    categories = state.get('categories') or [state['classification']['category']]
+    analysts = []
+    for category in categories:
+        analyst = ANALYST_FOR_CATEGORY.get(category, 'infrastructure')
+        if analyst not in analysts:
+            analysts.append(analyst)
+    return analysts
+
+
+def speculative_classify_node(state: AnalysisState, registry: AgentRegistry | None = None) -> AnalysisState:
+    """투기 실행 분류 노드 - LLM 분류를 기다리는 동안 로컬 추측의 분석 에이전트를 미리 실행
+
+    분류 LLM이 같은 분석 에이전트로 라우팅하면 미리 실행한 분석 결과를 쓰고, 다르면 정상 라우팅한다.
+    동기 실행에서는 이미 시작한 분석 스레드를 멈출 수 없으므로, 추측이 틀리거나 분류가 실패하면
+    미리 실행한 분석이 끝나기를 기다렸다가 결과를 버린다 (LLM 요청은 이미 나간 상태이며, 기다리는 동안
+    재라우팅한 분석과 출력이 섞이지 않음). 요청 자체를 중단하려면 비동기 실행(ainvoke)을 사용한다.
+    """
+    print("[2/4] 카테고리 분류 중 (투기 분석 병행)...")
+
+    if state.get('error'):
+        return state
+
+    registry = registry or get_agent_registry()
+    speculation: dict[str, Future] = {}
+
+    # with 블록을 나갈 때 미리 시작한 분석이 끝나기를 기다리므로 어떤 경로로도 스레드가 남지 않음
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        def start(guess: dict) -> None:
+            analyst = _speculate(guess)
+            speculation[analyst] = executor.submit(_ANALYSIS_NODES[analyst][0],
+                                                   {**state, 'classification': guess}, registry)
+
+        try:
+            classifier = registry.classifier
+            outcome = classifier.classify_detailed(
+                state['log_data'],
+                fingerprint=state.get('incident_fingerprint'),
+                source=Path(state['log_file_path']).name,
+                logs=state.get('log_store'),
+                on_guess=start
+            )
+        except Exception as e:
+            if speculation:
+                print("  → 분류 실패: 미리 실행한 분석이 끝나기를 기다린 뒤 결과를 버림")
+            return {
+                **state,
+                'error': f"분류 실패: {str(e)}"
+            }
+
+        state = _classification_update(state, classifier, outcome)
+        if not speculation:
+            return state
+
+        (analyst, future), = speculation.items()
+        if not _speculation_hit(state, analyst):
+            wait([future])
+            return _speculation_miss(state, analyst, cancelled=False)
+        return _speculation_result(state, analyst, future.result())
+
+
+async def speculative_classify_node_async(state: AnalysisState,
+                                          registry: AgentRegistry | None = None) -> AnalysisState:
+    """투기 실행 분류 노드 (비동기 실행용, 추측이 틀리면 분석 태스크를 취소)"""
+    print("[2/4] 카테고리 분류 중 (투기 분석 병행)...")
+
+    if state.get('error'):
+        return state
+
+    registry = registry or get_agent_registry()
+    speculation: dict[str, asyncio.Task] = {}
+
+    def start(guess: dict) -> None:
+        analyst = _speculate(guess)
+        speculation[analyst] = asyncio.ensure_future(
+            _ANALYSIS_NODES[analyst][1]({**state, 'classification': guess}, registry))
+
+    try:
+        classifier = registry.classifier
+        outcome = await classifier.aclassify_detailed(
+            state['log_data'],
+            fingerprint=state.get('incident_fingerprint'),
+            source=Path(state['log_file_path']).name,
+            logs=state.get('log_store'),
+            on_guess=start
+        )
+    except BaseException as e:
+        # 분류가 실패하거나 노드가 취소되면 미리 시작한 분석도 취소
+        for task in speculation.values():
+            task.cancel()
+        if not isinstance(e, Exception):
+            raise
         return {
             **state,
-            'error': f"Performance 분석 실패: {str(e)}"
+            'error': f"분류 실패: {str(e)}"
         }
 
+    state = _classification_update(state, classifier, outcome)
+    if not speculation:
+        return state
 
-def application_analysis_node(state: AnalysisState) -> AnalysisState:
-    """애플리케이션 분석 노드 (현재는 Infrastructure로 처리)"""
-    print("[3/4] Application 분석 중 (Infrastructure Analyst 사용)...")
+    (analyst, task), = speculation.items()
+    if not _speculation_hit(state, analyst):
+        task.cancel()
+        return _speculation_miss(state, analyst, cancelled=True)
+    return _speculation_result(state, analyst, await task)
 
-    # 현재는 Infrastructure Analyst로 처리
-    return infrastructure_analysis_node(state)
+
+def _speculate(guess: dict) -> str:
+    """추측한 카테고리의 분석 에이전트 이름"""
+    analyst = ANALYST_FOR_CATEGORY.get(guess['category'], 'infrastructure')
+    print(f"  → 사전 추측: {guess['category']} ({guess['reason'][:60]}), {analyst} 분석 미리 시작")
+    return analyst
+
+
+def _speculation_hit(state: AnalysisState, analyst: str) -> bool:
+    """분류 결과가 미리 시작한 분석 에이전트로 라우팅되는지"""
+    return ANALYST_FOR_CATEGORY.get(state['classification']['category'], 'infrastructure') == analyst
+
+
+def _speculation_miss(state: AnalysisState, analyst: str, cancelled: bool) -> AnalysisState:
+    """추측이 틀렸을 때 미리 실행한 분석을 버리고 재라우팅 (cancelled: 태스크를 취소했는지, 끝까지 기다렸는지)"""
+    if cancelled:
+        print(f"  → 추측 불일치: {analyst} 분석 취소 후 재라우팅")
+    else:
+        print(f"  → 추측 불일치: 미리 실행한 {analyst} 분석이 끝나기를 기다린 뒤 결과를 버리고 재라우팅")
+    return {**state, 'speculation': "miss"}
+
+
+def _speculation_result(state: AnalysisState, analyst: str, result: AnalysisState) -> AnalysisState:
+    """추측이 맞았을 때 미리 실행한 분석 결과 반영 (분석이 실패했으면 정상 라우팅으로 다시 실행)"""
+    if result.get('error'):
+        print(f"  → 추측 적중, 미리 실행한 분석 실패 ({result['error']}) - 다시 실행")
+        return {**state, 'speculation': "miss"}
+    print(f"  → 추측 적중: 미리 실행한 {analyst} 분석 결과 사용")
+    return {**state, 'analysis_result': result['analysis_result'], 'speculation': "hit"}
 
 
 # 라우팅 함수
@@ -192,6 +544,21 @@ def route_to_analyst(state: AnalysisState) -> Literal["infrastructure", "securit
     return routing_map.get(category, 'infrastructure')
 
 
+def route_after_speculation(state: AnalysisState) -> Literal["infrastructure", "security", "performance",
+                                                             "application", "error", "done"]:
+    """투기 실행 모드 라우팅 - 미리 실행한 분석 결과를 썼으면 종료, 아니면 분류 결과대로 라우팅"""
+    if not state.get('error') and state.get('speculation') == "hit":
+        return "done"
+    return route_to_analyst(state)
+
+
+def route_to_analysts(state: AnalysisState) -> list[str] | str:
+    """팬아웃 모드 라우팅 - 관련 카테고리의 분석 에이전트를 모두 병렬로 실행"""
+    if state.get('error'):
+        return "error"
+    return _ranked_analysts(state)
+
+
 def error_node(state: AnalysisState) -> AnalysisState:
     """에러 처리 노드"""
     print(f"[ERROR] {state.get('error', 'Unknown error')}")
@@ -199,34 +566,90 @@ def error_node(state: AnalysisState) -> AnalysisState:
 
 
 # WorkFlow 구축
-def create_workflow() -> StateGraph:
-    """로그 분석 워크플로우 생성"""
+def create_workflow(registry: AgentRegistry | None = None, fan_out: bool = False,
+                    speculative: bool = False) -> StateGraph:
+    """로그 분석 워크플로우 생성
+
+    각 노드는 동기/비동기 버전을 함께 등록하므로 invoke()는 동기 함수를, ainvoke()는
+    비동기 함수(LLM은 ainvoke, 파싱은 스레드)를 실행한다.
+
+    노드는 에이전트를 매번 만들지 않고 레지스트리에서 꺼내 쓴다. 레지스트리는 에이전트를
+    처음 필요할 때 한 번만 만들고, 모든 실행(스레드/코루틴)이 같은 인스턴스를 공유한다.
+
+    분석할 때마다 새로 만들 필요가 없으므로 보통은 get_workflow()로 공유 인스턴스를 쓴다.
+
+    fan_out=True면 분류기가 카테고리 순위를 반환하고, 관련 카테고리의 분석 에이전트를 LangGraph의
+    병렬 분기로 동시에 실행한 뒤 merge 노드에서 하나의 보고서(merged_analysis)로 합친다.
+    분석 에이전트들이 동시에 LLM을 기다리므로 복합 장애의 분석 시간은 합이 아니라 가장 느린 에이전트의 시간이다.
+
+    speculative=True면 분류 LLM을 호출하는 동안 로컬 추측(섞인 규칙 신호, 비슷한 과거 인시던트)이
+    가리키는 분석 에이전트를 미리 실행한다. 분류 결과가 추측과 같으면 분석 결과를 그대로 쓰고
+    (지연 시간 ≈ 분류와 분석 중 긴 쪽), 다르면 분류 결과대로 다시 라우팅한다. 틀린 추측의 분석은
+    ainvoke()에서는 태스크를 취소해 LLM 요청까지 중단하지만, invoke()에서는 스레드를 멈출 수 없으므로
+    끝나기를 기다렸다가 결과를 버린다 (요청 비용은 발생).
+    미리 실행한 분석은 LLM 분류 대신 추측한 분류 결과를 참고 정보로 받는다.
+
+    Args:
+        registry: 에이전트 레지스트리 (None이면 get_agent_registry()의 공유 레지스트리)
+        fan_out: 여러 분석 에이전트를 병렬로 실행하는 팬아웃 모드
+        speculative: 분류와 분석을 겹쳐 실행하는 투기 실행 모드 (fan_out과 함께 쓸 수 없음)
+    """
+    if fan_out and speculative:
+        raise ValueError("fan_out과 speculative는 함께 사용할 수 없습니다")
+
+    # langgraph는 임포트 비용이 커서 워크플로우를 만들 때 로드 (모듈 임포트만 하는 경우 불필요)
+    from langchain_core.runnables import RunnableLambda
+    from langgraph.graph import StateGraph, END
 
     workflow = StateGraph(AnalysisState)
+    registry = registry or get_agent_registry()
+
+    def node(func, afunc, **kwargs):
+        return RunnableLambda(partial(func, **kwargs), afunc=partial(afunc, **kwargs))
 
     # 노드 추가
-    workflow.add_node("parse", parse_logs_node)
-    workflow.add_node("classify", classify_node)
-    workflow.add_node("infrastructure", infrastructure_analysis_node)
-    workflow.add_node("security", security_analysis_node)
-    workflow.add_node("performance", performance_analysis_node)
-    workflow.add_node("application", application_analysis_node)
+    workflow.add_node("parse", node(parse_logs_node, parse_logs_node_async))
+    if speculative:
+        workflow.add_node("classify", node(speculative_classify_node, speculative_classify_node_async,
+                                           registry=registry))
+    else:
+        workflow.add_node("classify", node(classify_node, classify_node_async, registry=registry, ranked=fan_out))
     workflow.add_node("error", error_node)
 
-    # 엣지 연결
     workflow.set_entry_point("parse")
     workflow.add_edge("parse", "classify")
+    workflow.add_edge("error", END)
 
-    # 조건부 라우팅 (classify → analyst)
+    if fan_out:
+        # classify → 관련 분석 에이전트들 (병렬) → merge
+        for analyst in _ANALYSIS_NODES:
+            workflow.add_node(analyst, node(fan_out_analysis_node, fan_out_analysis_node_async,
+                                            analyst=analyst, registry=registry))
+            workflow.add_edge(analyst, "merge")
+        workflow.add_node("merge", merge_analyses_node)
+        workflow.add_conditional_edges("classify", route_to_analysts, [*_ANALYSIS_NODES, "error"])
+        workflow.add_edge("merge", END)
+        return workflow.compile()
+
+    workflow.add_node("infrastructure", node(infrastructure_analysis_node, infrastructure_analysis_node_async,
+                                             registry=registry))
+    workflow.add_node("security", node(security_analysis_node, security_analysis_node_async, registry=registry))
+    workflow.add_node("performance", node(performance_analysis_node, performance_analysis_node_async,
+                                          registry=registry))
+    workflow.add_node("application", node(application_analysis_node, application_analysis_node_async,
+                                          registry=registry))
+
+    # 조건부 라우팅 (classify → analyst, 투기 실행 결과를 쓰면 바로 종료)
     workflow.add_conditional_edges(
         "classify",
-        route_to_analyst,
+        route_after_speculation if speculative else route_to_analyst,
         {
             "infrastructure": "infrastructure",
             "security": "security",
             "performance": "performance",
             "application": "application",
-            "error": "error"
+            "error": "error",
+            **({"done": END} if speculative else {})
         }
     )
 
@@ -235,17 +658,38 @@ def create_workflow() -> StateGraph:
     workflow.add_edge("security", END)
     workflow.add_edge("performance", END)
     workflow.add_edge("application", END)
-    workflow.add_edge("error", END)
 
     return workflow.compile()
 
 
+_shared_workflows: dict[tuple[bool, bool], object] = {}
+_shared_workflow_lock = threading.Lock()
+
+
+def get_workflow(fan_out: bool = False, speculative: bool = False):
+    """프로세스 전체가 공유하는 컴파일된 워크플로우 (모드별로 처음 호출할 때 한 번만 컴파일)
+
+    컴파일된 그래프는 실행 상태를 갖지 않으므로 여러 스레드/코루틴이 동시에 invoke()/ainvoke() 해도 된다.
+
+    Args:
+        fan_out: 여러 분석 에이전트를 병렬로 실행하는 팬아웃 워크플로우 (create_workflow() 참고)
+        speculative: 분류와 분석을 겹쳐 실행하는 투기 실행 워크플로우 (create_workflow() 참고)
+    """
+    mode = (fan_out, speculative)
+    with _shared_workflow_lock:
+        if mode not in _shared_workflows:
+            _shared_workflows[mode] = create_workflow(fan_out=fan_out, speculative=speculative)
+        return _shared_workflows[mode]
+
+
 # 편의 함수
-def analyze_log_file(log_file_path: str) -> AnalysisState:
+def analyze_log_file(log_file_path: str, fan_out: bool = False, speculative: bool = False) -> AnalysisState:
     """로그 파일을 분석하는 편의 함수
 
     Args:
         log_file_path: 분석할 로그 파일 경로
+        fan_out: 관련 카테고리의 분석 에이전트를 모두 병렬로 실행하고 결과를 합침
+        speculative: 로컬 추측으로 분석을 분류와 동시에 시작 (추측이 틀리면 취소 후 재라우팅)
 
     Returns:
         분석 결과가 포함된 최종 상태
@@ -254,18 +698,11 @@ def analyze_log_file(log_file_path: str) -> AnalysisState:
     print("로그 분석 파이프라인 시작")
     print("="*60)
 
-    # 워크플로우 생성
-    app = create_workflow()
+    # 공유 워크플로우 (처음 한 번만 컴파일)
+    app = get_workflow(fan_out, speculative)
 
     # 초기 상태
-    initial_state: AnalysisState = {
-        'log_file_path': log_file_path,
-        'parsed_logs': None,
-        'log_data': None,
-        'classification': None,
-        'analysis_result': None,
-        'error': None
-    }
+    initial_state = _initial_state(log_file_path)
 
     # 실행
     final_state = app.invoke(initial_state)
@@ -277,6 +714,117 @@ def analyze_log_file(log_file_path: str) -> AnalysisState:
     return final_state
 
 
+async def analyze_log_file_async(log_file_path: str, fan_out: bool = False,
+                                 speculative: bool = False) -> AnalysisState:
+    """analyze_log_file()의 비동기 버전
+
+    LLM 호출은 ainvoke로, 파싱과 규칙/메모리 조회는 스레드에서 실행하므로 이벤트 루프를 막지 않는다.
+    하나의 이벤트 루프에서 여러 파일을 동시에 분석할 수 있다.
+
+    Args:
+        log_file_path: 분석할 로그 파일 경로
+        fan_out: 관련 카테고리의 분석 에이전트를 모두 병렬로 실행하고 결과를 합침
+        speculative: 로컬 추측으로 분석을 분류와 동시에 시작 (추측이 틀리면 취소 후 재라우팅)
+
+    Returns:
+        분석 결과가 포함된 최종 상태
+    """
+    print("="*60)
+    print("로그 분석 파이프라인 시작")
+    print("="*60)
+
+    app = get_workflow(fan_out, speculative)
+    final_state = await app.ainvoke(_initial_state(log_file_path))
+
+    print("\n" + "="*60)
+    print("[4/4] 분석 완료!")
+    print("="*60)
+
+    return final_state
+
+
+async def analyze_many(paths: Iterable[str | Path], max_concurrency: int = 4,
+                       parse_workers: int | None = None, fan_out: bool = False,
+                       speculative: bool = False,
+                       registry: AgentRegistry | None = None) -> AsyncIterator[AnalysisState]:
+    """여러 로그 파일을 동시에 분석하고 끝나는 순서대로 결과를 내보냄
+
+    - 파싱: 프로세스 풀에서 실행 (CPU 작업이므로 GIL 없이 병렬로)
+    - 분류/심층 분석: 하나의 이벤트 루프에서 ainvoke로 동시에 실행
+    - 동시에 진행하는 파일 수는 max_concurrency로 제한하므로, 한 파일이 LLM 응답을 기다리는 동안
+      다른 파일을 파싱하면서도 메모리에 올라가는 파싱 결과와 동시 API 요청 수는 일정하게 유지된다.
+    - API 요청 속도는 제공자별 rate limiter(CLAUDE_REQUESTS_PER_SECOND 등)가 제한한다.
+
+    Args:
+        paths: 분석할 로그 파일 경로들
+        max_concurrency: 동시에 분석하는 최대 파일 수
+        parse_workers: 파싱 프로세스 수 (None이면 min(max_concurrency, CPU 수))
+        fan_out: 파일마다 관련 카테고리의 분석 에이전트를 모두 병렬로 실행하고 결과를 합침
+        speculative: 파일마다 로컬 추측으로 분석을 분류와 동시에 시작 (추측이 틀리면 취소 후 재라우팅)
+        registry: 에이전트 레지스트리 (None이면 공유 워크플로우와 get_agent_registry()의 에이전트 사용)
+
+    Yields:
+        파일별 최종 상태 (log_file_path로 어떤 파일의 결과인지 확인, 실패하면 error에 사유)
+
+    예시:
+        async for state in analyze_many(glob.glob("logs/*.log"), max_concurrency=8):
+            print_analysis_summary(state)
+    """
+    paths = [str(path) for path in paths]
+    if not paths:
+        return
+
+    parse_workers = parse_workers or min(max_concurrency, os.cpu_count() or 1)
+    if registry is None:
+        app = get_workflow(fan_out, speculative)
+    else:
+        app = create_workflow(registry, fan_out=fan_out, speculative=speculative)
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(max_concurrency)
+
+    executor = ProcessPoolExecutor(max_workers=parse_workers)
+
+    async def analyze(path: str) -> AnalysisState:
+        async with slots:
+            state = _initial_state(path)
+            try:
+                # 워커에서 파싱한 상태(LogStore 포함)를 받아 그래프에 넣으면 파싱 노드는 건너뜀
+                state = await loop.run_in_executor(executor, parse_logs_node, state)
+            except Exception as e:
+                state = {**state, 'error': f"로그 파싱 실패: {str(e)}"}
+            return await app.ainvoke(state)
+
+    tasks = [asyncio.ensure_future(analyze(path)) for path in paths]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # 호출자가 중간에 순회를 멈추면 남은 분석을 취소 (이벤트 루프를 막지 않도록 풀 종료는 기다리지 않음)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _initial_state(log_file_path: str) -> AnalysisState:
+    """워크플로우 초기 상태"""
+    return {
+        'log_file_path': log_file_path,
+        'parsed_logs': None,
+        'log_store': None,
+        'log_data': None,
+        'request_metrics': None,
+        'incident_fingerprint': None,
+        'classification': None,
+        'categories': None,
+        'analysis_result': None,
+        'analysis_results': None,
+        'merged_analysis': None,
+        'speculation': None,
+        'error': None
+    }
+
+
 def print_analysis_summary(state: AnalysisState):
     """분석 결과 요약 출력"""
 
@@ -304,33 +852,45 @@ def print_analysis_summary(state: AnalysisState):
         print(f"  신뢰도: {classification['confidence']}")
         print(f"  이유: {classification['reason'][:100]}...")
 
-    # 분석 결과
-    if state.get('analysis_result'):
-        analysis = state['analysis_result']
-        category = state['classification']['category']
+    # 분석 결과 (팬아웃 모드면 분석 에이전트별로)
+    if state.get('merged_analysis'):
+        merged = state['merged_analysis']
+        for analyst, analysis in merged['analyses'].items():
+            _print_analysis(analyst, analysis)
+        for analyst, error in merged['failed'].items():
+            print(f"\n[심층 분석 - {analyst.upper()}] 실패: {error}")
+        print(f"\n[통합 권장 조치] {len(merged['actions'])}개")
+        for action in merged['actions'][:5]:
+            print(f"  - {action}")
+
+    elif state.get('analysis_result'):
+        _print_analysis(state['classification']['category'], state['analysis_result'])
 
-        print(f"\n[심층 분석 - {category.upper()}]")
+    print("\n" + "="*60)
 
-        if category == 'infrastructure':
-            print(f"  이슈 유형: {analysis['issue_type']}")
-            print(f"  긴급도: {analysis['urgency']}")
-            print(f"  근본 원인: {analysis['root_cause'][:100]}...")
-            print(f"  권장 조치: {len(analysis['recommended_actions'])}개")
 
-        elif category == 'security':
-            print(f"  공격 유형: {analysis['attack_type']}")
-            print(f"  심각도: {analysis['severity']}")
-            print(f"  공격자: {analysis['attacker_info'].get('identifier', 'N/A')}")
-            print(f"  즉시 대응: {len(analysis['immediate_response'])}개")
-            print(f"  장기 보안: {len(analysis['recommended_actions'])}개")
+def _print_analysis(category: str, analysis: dict) -> None:
+    """카테고리별 심층 분석 결과 출력"""
+    print(f"\n[심층 분석 - {category.upper()}]")
 
-        elif category == 'performance':
-            print(f"  성능 이슈: {analysis['performance_issue']}")
-            print(f"  Quick Wins: {len(analysis['quick_wins'])}개")
-            print(f"  최적화 계획: {len(analysis['optimization_plan'])}개")
-            print(f"  예상 개선: {analysis['estimated_improvement'][:80]}...")
+    if category == 'infrastructure':
+        print(f"  이슈 유형: {analysis['issue_type']}")
+        print(f"  긴급도: {analysis['urgency']}")
+        print(f"  근본 원인: {analysis['root_cause'][:100]}...")
+        print(f"  권장 조치: {len(analysis['recommended_actions'])}개")
 
-    print("\n" + "="*60)
+    elif category == 'security':
+        print(f"  공격 유형: {analysis['attack_type']}")
+        print(f"  심각도: {analysis['severity']}")
+        print(f"  공격자: {analysis['attacker_info'].get('identifier', 'N/A')}")
+        print(f"  즉시 대응: {len(analysis['immediate_response'])}개")
+        print(f"  장기 보안: {len(analysis['recommended_actions'])}개")
+
+    elif category == 'performance':
+        print(f"  성능 이슈: {analysis['performance_issue']}")
+        print(f"  Quick Wins: {len(analysis['quick_wins'])}개")
+        print(f"  최적화 계획: {len(analysis['optimization_plan'])}개")
+        print(f"  예상 개선: {analysis['estimated_improvement'][:80]}...")
 
 
 # 사용 예시
@@ -352,6 +912,7 @@ if __name__ == "__main__":
         ("N+1 쿼리", "datasets/scenario-03-n-plus-one-query/dataset-01.log"),
     ]
 
+    scenario_names = {}
     for scenario_name, log_file in test_scenarios:
         log_path = project_root / log_file
 
@@ -359,17 +920,16 @@ if __name__ == "__main__":
             print(f"[SKIP] {scenario_name} - 파일 없음")
             continue
 
-        print(f"\n\n{'#'*60}")
-        print(f"# 시나리오: {scenario_name}")
-        print(f"{'#'*60}\n")
+        scenario_names[str(log_path)] = scenario_name
 
-        # 워크플로우 실행
-        result = analyze_log_file(str(log_path))
+    async def run_scenarios():
+        # 시나리오를 동시에 분석하고 끝나는 순서대로 결과 출력
+        async for result in analyze_many(scenario_names, max_concurrency=3):
+            print(f"\n\n{'#'*60}")
+            print(f"# 시나리오: {scenario_names[result['log_file_path']]}")
+            print(f"{'#'*60}\n")
 
-        # 결과 출력
-        print_analysis_summary(result)
+            # 결과 출력
+            print_analysis_summary(result)
 
-        # 다음 시나리오 전 대기
-        print("\n(다음 시나리오로 이동...)")
-        import time
-        time.sleep(2)
\ No newline at end of file
+    asyncio.run(run_scenarios())
@@ -1,5 +1,6 @@
 """Chainlit UI - 로그 분석 웹 인터페이스"""
 
+import re
 import sys
 from pathlib import Path
 import chainlit as cl
@@ -8,8 +9,10 @@ import chainlit as cl
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.graph.workflow import create_workflow
-from src.graph.workflow import AnalysisState
+from src.agents.registry import get_agent_registry
+
+# 업로드 가능한 로그 파일 이름 (회전 번호와 gzip/bz2/xz/zstd 압축 확장자 허용)
+LOG_FILE_PATTERN = re.compile(r'\.log(\.\d+)?(\.(gz|bz2|xz|zst))?$')
 
 
 @cl.on_chat_start
@@ -34,10 +37,6 @@ async def start():
 """
     ).send()
 
-    # 세션에 워크플로우 저장
-    workflow = create_workflow()
-    cl.user_session.set("workflow", workflow)
-
 
 @cl.on_message
 async def main(message: cl.Message):
@@ -53,10 +52,10 @@ async def main(message: cl.Message):
     # 업로드된 파일 처리
     file = message.elements[0]
 
-    # .log 파일 확인
-    if not file.name.endswith('.log'):
+    # .log 파일 확인 (회전/압축된 .log.1, .log.gz 등 포함)
+    if not LOG_FILE_PATTERN.search(file.name):
         await cl.Message(
-            content=f"❌ '.log' 파일만 업로드 가능합니다. (업로드된 파일: {file.name})"
+            content=f"❌ '.log' 파일만 업로드 가능합니다 (.log.1, .log.gz 등 회전/압축 파일 포함). (업로드된 파일: {file.name})"
         ).send()
         return
 
@@ -66,18 +65,12 @@ async def main(message: cl.Message):
     ).send()
 
     try:
-        # 워크플로우 가져오기
-        workflow = cl.user_session.get("workflow")
-
         # Step 1: 로그 파싱
         step1_msg = cl.Message(content="### [1/4] 🔄 로그 파싱 중...")
         await step1_msg.send()
 
-        from src.agents.log_parser import LogParserAgent
-        parser = LogParserAgent()
-        parser.parse_file(file.path)
-        stats = parser.get_statistics()
-        log_data = parser.format_for_llm()
+        # 파싱은 CPU 작업이므로 스레드에서 실행 (다른 세션의 이벤트 처리를 막지 않도록)
+        parser, stats, log_data, fingerprint = await cl.make_async(parse_upload)(file.path)
 
         step1_msg.content = f"""### [1/4] ✅ 로그 파싱 완료
 
@@ -91,9 +84,21 @@ async def main(message: cl.Message):
         step2_msg = cl.Message(content="### [2/4] 🔄 카테고리 분류 중...")
         await step2_msg.send()
 
-        from src.agents.classifier import ClassificationAgent
-        classifier = ClassificationAgent()
-        classification = classifier.classify(log_data)
+        # 에이전트는 프로세스 공유 레지스트리에서 꺼내 씀 (세션/업로드마다 새로 만들지 않음)
+        registry = get_agent_registry()
+        classifier = registry.classifier
+        outcome = await classifier.aclassify_detailed(
+            log_data,
+            fingerprint=fingerprint,
+            source=file.name,
+            logs=parser.logs
+        )
+        classification = outcome['classification']
+        method_label = {
+            'rules': f"규칙 기반 (LLM 호출 생략, 규칙 적중률 {classifier.rules.hit_rate:.0%})",
+            'memory': "유사 인시던트 재사용 (LLM 호출 생략)",
+            'llm': "LLM",
+        }[outcome['method']]
 
         category_emoji = {
             'infrastructure': '🏗️',
@@ -115,6 +120,7 @@ async def main(message: cl.Message):
 - 카테고리: {category_emoji.get(classification['category'], '📋')} **{classification['category'].upper()}**
 - 심각도: {severity_emoji.get(classification['severity'], '⚪')} **{classification['severity'].upper()}**
 - 신뢰도: **{classification['confidence']}**
+- 분류 방법: {method_label}
 
 **분류 이유:**
 > {classification['reason']}
@@ -125,23 +131,14 @@ async def main(message: cl.Message):
         step3_msg = cl.Message(content="### [3/4] 🔄 심층 분석 중...")
         await step3_msg.send()
 
+        # user 이슈도 workflow와 같이 인프라 분석 에이전트가 처리
         category = classification['category']
-        analysis = None
-
-        if category == 'infrastructure' or category == 'application':
-            from src.agents.infrastructure_analyst import InfrastructureAnalystAgent
-            analyst = InfrastructureAnalystAgent()
-            analysis = analyst.analyze(log_data, classification)
-
-        elif category == 'security':
-            from src.agents.security_analyst import SecurityAnalystAgent
-            analyst = SecurityAnalystAgent()
-            analysis = analyst.analyze(log_data, classification)
-
-        elif category == 'performance':
-            from src.agents.performance_analyst import PerformanceAnalystAgent
-            analyst = PerformanceAnalystAgent()
-            analysis = analyst.analyze(log_data, classification)
+        analyst = registry.analyst_for(category)
+        if category == 'performance':
+            analysis = await analyst.aanalyze(log_data, classification,
+                                              request_metrics=parser.get_request_metrics())
+        else:
+            analysis = await analyst.aanalyze(log_data, classification)
 
         step3_msg.content = "### [3/4] ✅ 심층 분석 완료"
         await step3_msg.update()
@@ -165,6 +162,19 @@ async def main(message: cl.Message):
         ).send()
 
 
+def parse_upload(file_path: str):
+    """업로드된 로그 파싱 (파서, 통계, LLM용 로그 데이터, 인시던트 지문)"""
+    from src.agents.log_parser import LogParserAgent
+    from src.utils.incident_memory import build_fingerprint
+    from src.utils.parse_cache import ParseCache
+
+    # 업로드 파일은 매번 경로가 달라지므로 내용 해시로 캐시 키를 만듦
+    parser = LogParserAgent(extract_fields=True, cache=ParseCache(content_hash=True))
+    parser.parse_file(file_path)
+    stats = parser.get_statistics()
+    return parser, stats, parser.format_for_llm(), build_fingerprint(parser.logs, stats)
+
+
 def generate_report(classification: dict, analysis: dict, stats: dict) -> str:
     """최종 분석 보고서 생성"""
 
@@ -185,7 +195,7 @@ def generate_report(classification: dict, analysis: dict, stats: dict) -> str:
 """
 
     # 카테고리별 상세 분석
-    if category in ['infrastructure', 'application']:
+    if category in ['infrastructure', 'application', 'user']:
         report += f"""## 🏗️ 인프라 분석
 
 ### 🔍 이슈 유형
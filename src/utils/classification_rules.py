@@ -0,0 +1,214 @@
+"""Classification Rules - LLM 호출 전에 명확한 신호로 로그를 분류하는 규칙 엔진"""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import TYPE_CHECKING, TypedDict
+
+from src.utils.log_store import LogStore
+from src.utils.request_fields import RequestFieldExtractor
+
+if TYPE_CHECKING:
+    from src.agents.classifier import ClassificationResult
+
+
+class RuleHit(TypedDict):
+    """발동한 규칙 하나"""
+    rule: str
+    category: str
+    severity: str
+    indicators: list[str]
+
+
+# 심각도 순서 (여러 규칙이 같은 카테고리로 발동하면 가장 높은 심각도 사용)
+_SEVERITY_ORDER = ['low', 'medium', 'high', 'critical']
+
+
+class RuleClassifier:
+    """파싱된 로그에서 오해의 여지가 없는 신호만 골라 분류하는 결정적 규칙 엔진
+
+    규칙:
+    - econnrefused: ECONNREFUSED 에러 → infrastructure / critical
+    - script_injection: 메시지의 <script 태그 → security / high
+    - login_brute_force: 한 IP의 POST /login 401 응답이 login_failure_threshold회 이상 → security / high
+    - memory_growth: "Server memory usage: NMB"가 memory_min_samples회 이상 한 번도 줄지 않고
+      처음 값의 memory_growth_ratio배 이상으로 증가 → infrastructure / high
+
+    발동한 규칙이 모두 같은 카테고리를 가리킬 때만 결과를 반환하고,
+    아무 규칙도 발동하지 않거나 서로 다른 카테고리가 섞이면 None을 반환해 LLM이 판단하게 한다.
+    classify_ranked()는 여러 카테고리가 섞인 복합 장애도 심각도 순위와 함께 결정한다.
+    classify_or_guess()는 결정하지 못한 경우에도 가장 심각한 카테고리를 추측으로 돌려준다 (투기 실행용).
+
+    evaluations/hits에 호출 수와 규칙으로 결정한 수를 집계하므로 hit_rate로
+    LLM 호출을 얼마나 줄였는지 확인할 수 있다.
+    """
+
+    MEMORY_PATTERN = re.compile(r'\bServer memory usage:\s*(\d+(?:\.\d+)?)\s*MB\b')
+
+    def __init__(self, login_failure_threshold: int = 5, memory_min_samples: int = 4,
+                 memory_growth_ratio: float = 1.5):
+        """
+        Args:
+            login_failure_threshold: 무차별 대입 공격으로 볼 IP당 로그인 실패 횟수
+            memory_min_samples: 메모리 증가 추세를 판단할 최소 측정 횟수
+            memory_growth_ratio: 메모리 누수로 볼 최소 증가 배율 (마지막 값 / 처음 값)
+        """
+        self.login_failure_threshold = login_failure_threshold
+        self.memory_min_samples = memory_min_samples
+        self.memory_growth_ratio = memory_growth_ratio
+        self.field_extractor = RequestFieldExtractor()
+
+        self.evaluations = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        """규칙만으로 분류를 끝낸 비율 (0~1)"""
+        return self.hits / self.evaluations if self.evaluations else 0.0
+
+    def classify(self, store: LogStore) -> ClassificationResult | None:
+        """규칙이 결정적이면 분류 결과, 아니면 None"""
+        return self.classify_or_guess(store)[0]
+
+    def classify_or_guess(self, store: LogStore) -> tuple[ClassificationResult | None, ClassificationResult | None]:
+        """(결정적 분류 결과, None), 카테고리가 섞였으면 (None, 가장 심각한 카테고리의 추측), 미발동이면 (None, None)
+
+        추측은 LLM 분류를 기다리는 동안 분석을 미리 시작하는 데만 쓰고, 분류 결과로 쓰지 않는다.
+        """
+        hits = self.evaluate(store)
+        decided = len(rank_categories(hits)) == 1
+        self._count(decided)
+        if not hits:
+            return None, None
+        return (self._result(hits), None) if decided else (None, self._result(hits))
+
+    def classify_ranked(self, store: LogStore) -> tuple[ClassificationResult, list[str]] | None:
+        """규칙이 하나라도 발동하면 (분류 결과, 순위별 카테고리), 아니면 None
+
+        여러 카테고리가 섞이면 가장 심각한 카테고리를 주 카테고리로 하고, 나머지는 순위 목록에 남긴다
+        (예: 무차별 대입 공격 + DB 연결 거부 → ['infrastructure', 'security']).
+        """
+        hits = self.evaluate(store)
+        self._count(bool(hits))
+        if not hits:
+            return None
+        return self._result(hits), rank_categories(hits)
+
+    def _count(self, decided: bool) -> None:
+        with self._lock:
+            self.evaluations += 1
+            if decided:
+                self.hits += 1
+
+    def _result(self, hits: list[RuleHit]) -> ClassificationResult:
+        categories = rank_categories(hits)
+        # 주 카테고리의 지표를 앞에 둠
+        hits = sorted(hits, key=lambda hit: categories.index(hit['category']))
+        severity = max((hit['severity'] for hit in hits), key=_SEVERITY_ORDER.index)
+        indicators = [indicator for hit in hits for indicator in hit['indicators']]
+        return {
+            'category': categories[0],
+            'confidence': 'high',
+            'reason': f"규칙 기반 분류 ({', '.join(hit['rule'] for hit in hits)}): {indicators[0]}",
+            'severity': severity,
+            'key_indicators': indicators,
+        }
+
+    def evaluate(self, store: LogStore) -> list[RuleHit]:
+        """발동한 규칙 목록"""
+        hits = []
+        for rule in (self._econnrefused, self._script_injection, self._login_brute_force, self._memory_growth):
+            hit = rule(store)
+            if hit is not None:
+                hits.append(hit)
+        return hits
+
+    def _econnrefused(self, store: LogStore) -> RuleHit | None:
+        indices = store.indices_with_keyword('ECONNREFUSED', case_sensitive=True)
+        errors = store.filter_by_level(indices, 'ERROR')
+        if not errors:
+            return None
+
+        indicators = [f"ECONNREFUSED 에러 {len(errors)}건"]
+        server_errors = len(store.indices_with_keyword(' 500 - ', case_sensitive=True))
+        if server_errors:
+            indicators.append(f"HTTP 500 응답 {server_errors}건")
+        return RuleHit(rule='econnrefused', category='infrastructure', severity='critical',
+                       indicators=indicators)
+
+    def _script_injection(self, store: LogStore) -> RuleHit | None:
+        indices = store.indices_with_keyword('<script', case_sensitive=False)
+        if not indices:
+            return None
+        return RuleHit(rule='script_injection', category='security', severity='high',
+                       indicators=[f"<script> 태그 삽입 시도 {len(indices)}건"])
+
+    def _login_brute_force(self, store: LogStore) -> RuleHit | None:
+        """IP별 POST /login 401 횟수
+
+        401 응답 라인에는 IP가 없는 경우가 많으므로, 바로 앞의 POST /login 요청 라인에서 본 IP로 집계한다.
+        """
+        table = store.request_fields
+        failures: dict[str, int] = {}
+        last_ip = None
+
+        for index in store.indices_with_keyword('/login', case_sensitive=True):
+            fields = table.fields_of(index) if table is not None else self.field_extractor.extract(
+                store.message_of(index))
+            if fields is None or fields['method'] != 'POST' or not (fields['path'] or '').startswith('/login'):
+                continue
+            if fields['ip'] is not None:
+                last_ip = fields['ip']
+            if fields['status'] == 401:
+                ip = fields['ip'] or last_ip
+                if ip is not None:
+                    failures[ip] = failures.get(ip, 0) + 1
+
+        if not failures:
+            return None
+        ip, count = max(failures.items(), key=lambda item: item[1])
+        if count < self.login_failure_threshold:
+            return None
+        return RuleHit(rule='login_brute_force', category='security', severity='high',
+                       indicators=[f"동일 IP {ip}의 로그인 실패(401) {count}회"])
+
+    def _memory_growth(self, store: LogStore) -> RuleHit | None:
+        samples = []
+        for index in store.indices_with_keyword('Server memory usage', case_sensitive=True):
+            match = self.MEMORY_PATTERN.search(store.message_of(index))
+            if match:
+                samples.append(float(match.group(1)))
+
+        if len(samples) < self.memory_min_samples:
+            return None
+        if any(later < earlier for earlier, later in zip(samples, samples[1:])):
+            return None
+        if samples[-1] < samples[0] * self.memory_growth_ratio:
+            return None
+        return RuleHit(rule='memory_growth', category='infrastructure', severity='high',
+                       indicators=[f"서버 메모리 사용량 지속 증가 {samples[0]:g}MB → {samples[-1]:g}MB "
+                                   f"({len(samples)}회 측정)"])
+
+
+def rank_categories(hits: list[RuleHit]) -> list[str]:
+    """발동한 규칙의 카테고리를 가장 높은 심각도 순으로 (같으면 규칙 평가 순서)"""
+    severities: dict[str, int] = {}
+    for hit in hits:
+        level = _SEVERITY_ORDER.index(hit['severity'])
+        severities[hit['category']] = max(level, severities.get(hit['category'], level))
+    return sorted(severities, key=lambda category: -severities[category])
+
+
+_shared_rules: RuleClassifier | None = None
+_shared_rules_lock = threading.Lock()
+
+
+def get_rule_classifier() -> RuleClassifier:
+    """프로세스 전체가 공유하는 기본 규칙 엔진 (적중률이 호출 간에 누적됨)"""
+    global _shared_rules
+    with _shared_rules_lock:
+        if _shared_rules is None:
+            _shared_rules = RuleClassifier()
+        return _shared_rules
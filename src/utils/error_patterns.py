@@ -0,0 +1,106 @@
+"""Error Pattern Engine - 에러 메시지 패턴 분류"""
+
+from __future__ import annotations
+
+import re
+from typing import TypedDict
+
+
+class ErrorPatternRule(TypedDict):
+    """에러 패턴 규칙"""
+    bucket: str  # 분류 결과로 쓰일 패턴 이름 (예: Database Error)
+    pattern: str  # 정규식 (키워드는 이스케이프된 형태)
+    case_sensitive: bool
+
+
+# 기본 규칙 (위에서부터 우선순위가 높음)
+DEFAULT_ERROR_PATTERNS: list[ErrorPatternRule] = [
+    ErrorPatternRule(bucket='Database Error', pattern='Database|database', case_sensitive=True),
+    ErrorPatternRule(bucket='Connection Error', pattern='connect', case_sensitive=False),
+    ErrorPatternRule(bucket='HTTP 500', pattern='500', case_sensitive=True),
+    ErrorPatternRule(bucket='HTTP 401 Unauthorized', pattern='401', case_sensitive=True),
+    ErrorPatternRule(bucket='HTTP 403 Forbidden', pattern='403', case_sensitive=True),
+    ErrorPatternRule(bucket='HTTP 400 Bad Request', pattern='400', case_sensitive=True),
+]
+
+
+class ErrorPatternEngine:
+    """여러 에러 패턴을 하나의 정규식으로 컴파일해 한 번의 스캔으로 분류하는 엔진
+
+    규칙은 등록 순서가 곧 우선순위이며, 메시지 안에서 매치되는 규칙 중
+    가장 우선순위가 높은 규칙의 bucket을 반환한다. 어떤 규칙도 매치되지 않으면
+    default_bucket을 반환한다.
+
+    예시:
+        engine = ErrorPatternEngine()
+        engine.register('ECONNREFUSED', 'ECONNREFUSED')
+        engine.register('JWT Expired', r'jwt\\s+expired', regex=True, case_sensitive=False)
+        engine.classify("Database connection error: ECONNREFUSED")  # 'ECONNREFUSED'
+    """
+
+    def __init__(self, rules: list[ErrorPatternRule] | None = None,
+                 default_bucket: str = 'Other Error'):
+        self.rules: list[ErrorPatternRule] = list(DEFAULT_ERROR_PATTERNS if rules is None else rules)
+        self.default_bucket = default_bucket
+        self._compiled: re.Pattern | None = None
+
+    def register(self, bucket: str, *keywords: str, regex: bool = False,
+                 case_sensitive: bool = True, first: bool = True) -> None:
+        """사용자 정의 에러 패턴 등록
+
+        Args:
+            bucket: 패턴 이름 (통계의 error_patterns 키)
+            keywords: 매치할 키워드 (여러 개면 OR)
+            regex: True면 keywords를 정규식으로 취급
+            case_sensitive: 대소문자 구분 여부
+            first: True면 기존 규칙보다 먼저 검사 (보통 사용자 규칙이 더 구체적이므로 기본값)
+        """
+        if not keywords:
+            raise ValueError(f"에러 패턴 '{bucket}'에 키워드가 없습니다")
+
+        parts = keywords if regex else [re.escape(keyword) for keyword in keywords]
+        pattern = '|'.join(parts)
+        re.compile(pattern)  # 잘못된 정규식은 등록 시점에 에러
+
+        rule = ErrorPatternRule(bucket=bucket, pattern=pattern, case_sensitive=case_sensitive)
+        if first:
+            self.rules.insert(0, rule)
+        else:
+            self.rules.append(rule)
+
+        self._compiled = None
+
+    def classify(self, message: str) -> str:
+        """에러 메시지를 분류하여 bucket 이름 반환"""
+        compiled = self._compiled or self._compile()
+
+        best = len(self.rules)
+        for match in compiled.finditer(message):
+            # 한 위치에서는 대안 순서대로 시도되므로 매치된 그룹이 그 위치의 최우선 규칙
+            priority = int(match.lastgroup[1:])
+            if priority < best:
+                best = priority
+                if best == 0:
+                    break
+
+        if best == len(self.rules):
+            return self.default_bucket
+        return self.rules[best]['bucket']
+
+    def _compile(self) -> re.Pattern:
+        """모든 규칙을 하나의 정규식으로 결합
+
+        전방탐색(?=...)으로 감싸 겹치는 매치도 놓치지 않고, 위치마다 규칙 순서대로
+        시도하므로 메시지를 한 번만 훑어서 가장 우선순위가 높은 규칙을 찾을 수 있다.
+        규칙 그룹은 r<우선순위>로 이름 붙여, 규칙 정규식 내부의 그룹과 섞이지 않게 한다.
+        """
+        alternatives = []
+        for priority, rule in enumerate(self.rules):
+            body = rule['pattern'] if rule['case_sensitive'] else f"(?i:{rule['pattern']})"
+            alternatives.append(f"(?P<r{priority}>{body})")
+
+        if not alternatives:
+            self._compiled = re.compile('(?!)')
+        else:
+            self._compiled = re.compile('(?=' + '|'.join(alternatives) + ')')
+        return self._compiled
@@ -0,0 +1,262 @@
+"""Incident Memory - 과거 인시던트와의 유사도로 분류 결과 재사용"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, TypedDict
+
+from src.utils.log_compactor import mask_variables
+from src.utils.log_store import LogStore
+
+
+# 인시던트 DB 위치와 최대 보관 수 (환경 변수로 변경 가능)
+DEFAULT_INCIDENT_MEMORY_PATH = Path(os.getenv(
+    "INCIDENT_MEMORY_PATH", Path(__file__).resolve().parents[2] / ".cache" / "incident_memory.sqlite3"
+))
+DEFAULT_MAX_INCIDENTS = int(os.getenv("INCIDENT_MEMORY_MAX_INCIDENTS", "1000"))
+
+# 지문 항목 접두사 (템플릿과 에러 패턴이 같은 문자열이어도 섞이지 않도록)
+TEMPLATE_TERM = 't:'
+PATTERN_TERM = 'p:'
+
+
+class IncidentMatch(TypedDict):
+    """가장 비슷한 과거 인시던트"""
+    incident_id: int
+    similarity: float  # TF-IDF 코사인 유사도 (0~1)
+    classification: dict  # 당시의 ClassificationResult
+    created_at: float
+    source: str | None  # 당시 로그 파일 이름
+
+
+def build_fingerprint(store: LogStore, statistics: dict | None = None,
+                      template_of: Callable[[str], str] | None = None) -> dict[str, int]:
+    """로그의 지문 (항목 → 횟수)
+
+    - 템플릿 히스토그램: "레벨 템플릿"별 발생 횟수 (여러 줄 메시지는 첫 줄 기준)
+    - 에러 패턴: 통계의 error_patterns 버킷별 건수 (DB 에러, 401 등 분류 근거가 되는 지표)
+
+    타임스탬프, ID, IP처럼 매번 바뀌는 값은 템플릿에서 지워지므로 같은 장애가 다른 시각에
+    다시 일어나도 지문이 거의 같다.
+
+    Args:
+        store: 파싱된 로그
+        statistics: LogParserAgent의 통계 (None이면 에러 패턴 항목 제외)
+        template_of: 메시지 → 템플릿 함수 (기본: mask_variables)
+    """
+    template_of = template_of or mask_variables
+    # 같은 첫 줄은 반복이 많으므로 템플릿 변환 결과를 재사용
+    templates: dict[str, str] = {}
+    fingerprint: dict[str, int] = {}
+
+    for index in range(len(store)):
+        line = store.message_of(index).split('\n', 1)[0]
+        template = templates.get(line)
+        if template is None:
+            template = templates[line] = template_of(line)
+        term = f"{TEMPLATE_TERM}{store.level_of(index)} {template}"
+        fingerprint[term] = fingerprint.get(term, 0) + 1
+
+    if statistics:
+        for pattern, count in statistics['error_patterns'].items():
+            fingerprint[PATTERN_TERM + pattern] = count
+
+    return fingerprint
+
+
+class IncidentMemory:
+    """분석한 인시던트의 지문과 분류 결과를 기억해 두고, 비슷한 로그가 오면 찾아주는 저장소
+
+    지문 항목을 단어로 보는 TF-IDF 벡터의 코사인 유사도로 비교한다.
+    - TF: 1 + log(횟수) (라인 수가 다른 로그끼리도 비교할 수 있도록 완만하게)
+    - IDF: 기억된 인시던트 중 그 항목이 나온 비율의 역수 (모든 로그에 흔한 서버 시작 로그 등은 가중치가 낮음)
+
+    항목 → 인시던트 역색인으로 공통 항목이 있는 인시던트만 비교하므로, 인시던트 수가 늘어도
+    조회 비용은 겹치는 인시던트 수에 비례한다. 인시던트는 SQLite에 저장되며 처음 사용할 때
+    메모리로 읽어 둔다. 여러 스레드에서 하나의 인스턴스를 공유할 수 있다.
+
+    예시:
+        memory = IncidentMemory()
+        fingerprint = build_fingerprint(parser.logs, parser.get_statistics())
+        match = memory.find_similar(fingerprint)
+        if match and match['similarity'] >= memory.reuse_threshold:
+            classification = match['classification']
+        else:
+            classification = classifier.classify(log_data)
+            memory.remember(fingerprint, classification)
+    """
+
+    def __init__(self, database_path: str | Path | None = None, reuse_threshold: float = 0.9,
+                 seed_threshold: float = 0.4, max_incidents: int | None = None):
+        """
+        Args:
+            database_path: SQLite 파일 경로 (None이면 INCIDENT_MEMORY_PATH 또는 프로젝트의 .cache/incident_memory.sqlite3)
+            reuse_threshold: 이 유사도 이상이면 과거 분류 결과를 그대로 재사용
+            seed_threshold: 이 유사도 이상이면 과거 분류 결과를 LLM에 참고 정보로 제공
+            max_incidents: 최대 보관 수 (넘치면 가장 오래 쓰이지 않은 인시던트부터 삭제)
+        """
+        self.database_path = Path(database_path) if database_path is not None else DEFAULT_INCIDENT_MEMORY_PATH
+        self.reuse_threshold = reuse_threshold
+        self.seed_threshold = seed_threshold
+        self.max_incidents = DEFAULT_MAX_INCIDENTS if max_incidents is None else max_incidents
+
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+        # 인시던트 ID → (지문, 분류 결과, 생성 시각, 출처)
+        self._incidents: dict[int, tuple[dict[str, int], dict, float, str | None]] = {}
+        # 항목 → 그 항목이 있는 인시던트 ID 집합 (문서 빈도 = 집합 크기)
+        self._postings: dict[str, set[int]] = {}
+
+    def find_similar(self, fingerprint: dict[str, int]) -> IncidentMatch | None:
+        """가장 비슷한 과거 인시던트 (겹치는 항목이 있는 인시던트가 없으면 None)"""
+        with self._lock:
+            self._connect()
+
+            candidates: set[int] = set()
+            for term in fingerprint:
+                candidates.update(self._postings.get(term, ()))
+            if not candidates:
+                return None
+
+            query = self._weights(fingerprint)
+            query_norm = math.sqrt(sum(weight * weight for weight in query.values()))
+
+            best_id = None
+            best_similarity = 0.0
+            for incident_id in candidates:
+                weights = self._weights(self._incidents[incident_id][0])
+                norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+                if not norm or not query_norm:
+                    continue
+                dot = sum(weight * weights.get(term, 0.0) for term, weight in query.items())
+                similarity = dot / (norm * query_norm)
+                if similarity > best_similarity:
+                    best_id, best_similarity = incident_id, similarity
+
+            if best_id is None:
+                return None
+
+            self._connection.execute("UPDATE incidents SET last_used = ? WHERE id = ?", (time.time(), best_id))
+            self._connection.commit()
+
+            _, classification, created_at, source = self._incidents[best_id]
+            return IncidentMatch(
+                incident_id=best_id,
+                similarity=min(best_similarity, 1.0),
+                classification=dict(classification),
+                created_at=created_at,
+                source=source
+            )
+
+    def remember(self, fingerprint: dict[str, int], classification: dict, source: str | None = None) -> int:
+        """인시던트 저장 후 최대 보관 수를 넘으면 오래 쓰이지 않은 인시던트 삭제
+
+        Returns:
+            저장된 인시던트 ID
+        """
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            cursor = connection.execute(
+                "INSERT INTO incidents (fingerprint, classification, source, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (json.dumps(fingerprint, ensure_ascii=False), json.dumps(classification, ensure_ascii=False),
+                 source, now, now)
+            )
+            incident_id = cursor.lastrowid
+            self._add(incident_id, fingerprint, classification, now, source)
+
+            evicted = [row[0] for row in connection.execute(
+                "SELECT id FROM incidents ORDER BY last_used DESC LIMIT -1 OFFSET ?", (self.max_incidents,)
+            )]
+            for old_id in evicted:
+                connection.execute("DELETE FROM incidents WHERE id = ?", (old_id,))
+                self._discard(old_id)
+            connection.commit()
+
+        return incident_id
+
+    def clear(self) -> None:
+        """기억된 인시던트 전체 삭제"""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM incidents")
+            connection.commit()
+            self._incidents.clear()
+            self._postings.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._connect()
+            return len(self._incidents)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+                self._incidents.clear()
+                self._postings.clear()
+
+    def _weights(self, fingerprint: dict[str, int]) -> dict[str, float]:
+        """TF-IDF 가중치 (IDF는 smooth 방식으로 계산해 처음 보는 항목도 가중치를 가짐)"""
+        total = len(self._incidents)
+        return {
+            term: (1.0 + math.log(count)) * (math.log((1 + total) / (1 + len(self._postings.get(term, ())))) + 1.0)
+            for term, count in fingerprint.items() if count > 0
+        }
+
+    def _add(self, incident_id: int, fingerprint: dict[str, int], classification: dict,
+             created_at: float, source: str | None) -> None:
+        self._incidents[incident_id] = (fingerprint, classification, created_at, source)
+        for term in fingerprint:
+            self._postings.setdefault(term, set()).add(incident_id)
+
+    def _discard(self, incident_id: int) -> None:
+        incident = self._incidents.pop(incident_id, None)
+        if incident is None:
+            return
+        for term in incident[0]:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.discard(incident_id)
+                if not postings:
+                    del self._postings[term]
+
+    def _connect(self) -> sqlite3.Connection:
+        """처음 사용할 때 DB를 열고 저장된 인시던트를 메모리로 로드 (호출자가 락을 잡고 있어야 함)"""
+        if self._connection is None:
+            self.database_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.database_path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS incidents ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, fingerprint TEXT NOT NULL, classification TEXT NOT NULL, "
+                "source TEXT, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            connection.commit()
+
+            for incident_id, fingerprint, classification, source, created_at in connection.execute(
+                    "SELECT id, fingerprint, classification, source, created_at FROM incidents"):
+                self._add(incident_id, json.loads(fingerprint), json.loads(classification), created_at, source)
+            self._connection = connection
+        return self._connection
+
+
+_shared_memory: IncidentMemory | None = None
+_shared_memory_lock = threading.Lock()
+
+
+def get_incident_memory() -> IncidentMemory:
+    """프로세스 전체가 공유하는 기본 인시던트 메모리"""
+    global _shared_memory
+    with _shared_memory_lock:
+        if _shared_memory is None:
+            _shared_memory = IncidentMemory()
+        return _shared_memory
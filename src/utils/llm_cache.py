@@ -0,0 +1,168 @@
+"""LLM Response Cache - 동일한 프롬프트의 LLM 응답을 재사용하는 SQLite 캐시"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, Generation
+
+
+# 캐시 파일 위치, 유효 기간, 최대 항목 수 (환경 변수로 변경 가능)
+DEFAULT_LLM_CACHE_PATH = Path(os.getenv(
+    "LLM_CACHE_PATH", Path(__file__).resolve().parents[2] / ".cache" / "llm_responses.sqlite3"
+))
+DEFAULT_LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+DEFAULT_LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+
+
+class LLMResponseCache(BaseCache):
+    """프롬프트가 완전히 같을 때 LLM 응답을 재사용하는 영구 캐시
+
+    LangChain 채팅 모델의 cache 옵션에 넘기면 invoke()/ainvoke()가 API를 호출하기 전에
+    이 캐시를 먼저 조회한다. 키는 LangChain이 넘겨주는 두 문자열의 해시이다.
+    - llm_string: 제공자(모델 클래스), 모델 이름, temperature 등 호출 설정
+    - prompt: 시스템 프롬프트를 포함한 전체 메시지
+
+    - ttl_seconds가 지난 응답은 조회 시 버린다.
+    - 항목이 max_entries를 넘으면 가장 오래 쓰이지 않은 항목부터 지운다.
+
+    temperature=0처럼 같은 입력에 같은 응답을 기대할 수 있는 호출에만 사용해야 한다.
+    여러 스레드에서 하나의 인스턴스를 공유할 수 있다.
+
+    예시:
+        llm = ChatAnthropic(model=..., temperature=0.0, cache=LLMResponseCache())
+    """
+
+    def __init__(self, database_path: str | Path | None = None, ttl_seconds: float | None = None,
+                 max_entries: int | None = None):
+        """
+        Args:
+            database_path: SQLite 파일 경로 (None이면 LLM_CACHE_PATH 또는 프로젝트의 .cache/llm_responses.sqlite3)
+            ttl_seconds: 응답 유효 기간 (None이면 LLM_CACHE_TTL 또는 7일)
+            max_entries: 최대 항목 수 (None이면 LLM_CACHE_MAX_ENTRIES 또는 10000)
+        """
+        self.database_path = Path(database_path) if database_path is not None else DEFAULT_LLM_CACHE_PATH
+        self.ttl_seconds = DEFAULT_LLM_CACHE_TTL if ttl_seconds is None else ttl_seconds
+        self.max_entries = DEFAULT_LLM_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+
+        # 조회 결과 집계 (캐시 효과 측정용)
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def lookup(self, prompt: str, llm_string: str) -> Sequence[Generation] | None:
+        """캐시된 응답 조회 (없거나 만료되었으면 None)"""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    connection.commit()
+                self.misses += 1
+                return None
+
+            connection.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            connection.commit()
+            self.hits += 1
+
+        return [self._decode(item) for item in json.loads(row[0])]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        """응답 저장 후 최대 항목 수를 넘으면 오래 쓰이지 않은 항목 삭제"""
+        key = self._key(prompt, llm_string)
+        value = json.dumps([self._encode(generation) for generation in return_val], ensure_ascii=False)
+        now = time.time()
+
+        with self._lock:
+            connection = self._connect()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            connection.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            connection.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        """캐시 항목 전체 삭제"""
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM responses")
+            connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """처음 사용할 때 DB를 열고 테이블 생성 (호출자가 락을 잡고 있어야 함)"""
+        if self._connection is None:
+            self.database_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.database_path, timeout=30, check_same_thread=False)
+            # 여러 프로세스(UI, CLI)가 같은 파일을 읽고 쓸 수 있도록 WAL 모드 사용
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _encode(generation: Generation) -> dict:
+        # 에이전트는 응답 본문만 쓰므로 메시지 내용만 저장 (토큰 사용량 등 메타데이터는 제외)
+        if isinstance(generation, ChatGeneration):
+            return {'content': generation.message.content}
+        return {'text': generation.text}
+
+    @staticmethod
+    def _decode(item: dict) -> Generation:
+        if 'content' in item:
+            return ChatGeneration(message=AIMessage(content=item['content']))
+        return Generation(text=item['text'])
+
+
+_shared_cache: LLMResponseCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> LLMResponseCache:
+    """프로세스 전체가 공유하는 기본 응답 캐시"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMResponseCache()
+        return _shared_cache
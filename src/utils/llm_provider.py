@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 import os
+import threading
 
 from dotenv import load_dotenv
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
 
-load_dotenv()  # .env 파일 로드
+# 제공자 SDK(langchain_anthropic, langchain_google_genai)는 임포트에만 수 초가 걸리므로
+# 모듈 상단이 아니라 해당 제공자의 클라이언트를 처음 만들 때 임포트한다.
+# 파싱만 하는 CLI 실행이나 테스트 수집은 SDK를 로드하지 않는다.
+
+load_dotenv()  # .env 파일 로드 (파일 하나를 읽는 정도라 임포트 시점에 해도 부담 없음)
 
 # 어떤 LLM 제공자를 사용할지 설정
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "claude").strip().lower()
@@ -22,11 +25,32 @@ GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-pro")
 # LLM 설정
 TEMPERATURE = float(os.getenv("TEMPERATURE", "0.0"))
 
+# 같은 프롬프트의 응답 재사용 여부 (temperature=0 호출에만 적용)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "on").strip().lower() not in ("off", "false", "0")
+
+# 제공자별 초당 최대 요청 수 (0이면 제한 없음)
+# 같은 제공자의 클라이언트는 temperature가 달라도 하나의 제한을 공유한다 (API 쿼터가 계정 단위이므로).
+RATE_LIMITS = {
+    "claude": float(os.getenv("CLAUDE_REQUESTS_PER_SECOND", "0")),
+    "gemini": float(os.getenv("GEMINI_REQUESTS_PER_SECOND", "0")),
+}
+
+# (provider, model, temperature) → 생성된 LLM 클라이언트
+# 클라이언트는 내부에 HTTP 커넥션 풀(keep-alive, TLS 세션)을 갖고 있으므로 에이전트마다 새로 만들지 않고 공유한다.
+_clients: dict[tuple[str, str, float], object] = {}
+_clients_lock = threading.Lock()
+# provider → 공유 rate limiter
+_rate_limiters: dict[str, object] = {}
+
 
 def get_llm(temperature: float | None = None):
     """
     환경 변수에 따라 적절한 LLM을 반환
 
+    같은 (provider, model, temperature) 조합은 프로세스 안에서 하나의 클라이언트를 공유하므로,
+    분석을 여러 번 실행해도 HTTP 커넥션 풀이 재사용된다. 여러 스레드에서 동시에 호출해도 안전하며,
+    LangChain 채팅 모델은 invoke()/ainvoke() 모두 동시 호출을 지원한다.
+
     .env 파일 설정:
     LLM_PROVIDER=claude  # 또는 gemini
     ANTHROPIC_API_KEY=your-key-here  # Claude 사용 시
@@ -34,10 +58,42 @@ def get_llm(temperature: float | None = None):
     CLAUDE_MODEL=claude-3-5-sonnet-20241022
     GEMINI_MODEL=gemini-1.5-pro
     TEMPERATURE=0.0
+    LLM_CACHE=on  # temperature=0 응답을 .cache/llm_responses.sqlite3에 저장해 재사용
+    CLAUDE_REQUESTS_PER_SECOND=0  # 제공자별 초당 최대 요청 수 (0이면 제한 없음)
+    GEMINI_REQUESTS_PER_SECOND=0
     """
-    temp = temperature if temperature is not None else TEMPERATURE
-
-    if LLM_PROVIDER == "claude":
+    temp = float(temperature if temperature is not None else TEMPERATURE)
+    model = CLAUDE_MODEL if LLM_PROVIDER == "claude" else GEMINI_MODEL
+    key = (LLM_PROVIDER, model, temp)
+
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            # 락을 기다리는 동안 다른 스레드가 만들었을 수 있으므로 다시 확인
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = _create_llm(LLM_PROVIDER, model, temp)
+    return client
+
+
+def clear_llm_clients() -> None:
+    """공유 중인 LLM 클라이언트 폐기 (API 키나 모델 설정을 바꾼 뒤 새로 만들 때)"""
+    with _clients_lock:
+        _clients.clear()
+        _rate_limiters.clear()
+
+
+def _create_llm(provider: str, model: str, temp: float):
+    """LLM 클라이언트 생성 (제공자 SDK는 여기서 처음 임포트)"""
+    from src.utils.llm_cache import get_response_cache
+
+    # temperature가 0이면 같은 입력에 같은 응답을 기대할 수 있으므로 응답 캐시 사용
+    # (None이면 LangChain 전역 캐시 설정을 따름)
+    cache = get_response_cache() if LLM_CACHE_ENABLED and temp == 0 else None
+    # 캐시에서 응답을 찾으면 rate limiter를 거치지 않으므로 실제 API 호출만 제한됨
+    rate_limiter = _get_rate_limiter(provider)
+
+    if provider == "claude":
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError(
@@ -45,13 +101,17 @@ def get_llm(temperature: float | None = None):
                 ".env 파일에서 ANTHROPIC_API_KEY를 설정해주세요."
             )
 
+        from langchain_anthropic import ChatAnthropic
+
         return ChatAnthropic(
-            model=CLAUDE_MODEL,
+            model=model,
             temperature=temp,
-            anthropic_api_key=api_key
+            anthropic_api_key=api_key,
+            cache=cache,
+            rate_limiter=rate_limiter
         )
 
-    elif LLM_PROVIDER == "gemini":
+    elif provider == "gemini":
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise ValueError(
@@ -59,13 +119,32 @@ def get_llm(temperature: float | None = None):
                 ".env 파일에서 GOOGLE_API_KEY를 설정해주세요."
             )
 
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         return ChatGoogleGenerativeAI(
-            model=GEMINI_MODEL,
+            model=model,
             temperature=temp,
-            google_api_key=api_key
+            google_api_key=api_key,
+            cache=cache,
+            rate_limiter=rate_limiter
         )
 
 
+def _get_rate_limiter(provider: str):
+    """제공자의 공유 rate limiter (제한이 없으면 None, 호출자가 _clients_lock을 잡고 있어야 함)"""
+    requests_per_second = RATE_LIMITS.get(provider, 0.0)
+    if requests_per_second <= 0:
+        return None
+
+    limiter = _rate_limiters.get(provider)
+    if limiter is None:
+        from langchain_core.rate_limiters import InMemoryRateLimiter
+
+        # 버킷 크기 1: 몰아서 보내지 않고 일정한 간격으로 요청
+        limiter = _rate_limiters[provider] = InMemoryRateLimiter(requests_per_second=requests_per_second)
+    return limiter
+
+
 # 사용 예시
 if __name__ == "__main__":
     # 테스트
@@ -0,0 +1,184 @@
+"""Log Compactor - 토큰 예산에 맞춘 LLM용 로그 압축"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable
+
+from src.utils.log_store import LogStore
+
+
+# 메시지에서 값이 바뀌는 부분 (템플릿 변수) 패턴
+_VARIABLE_PATTERNS = [
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', re.IGNORECASE), '<UUID>'),
+    (re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b'), '<IP>'),
+    (re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+'), '<EMAIL>'),
+    (re.compile(r'\b0x[0-9a-f]+\b', re.IGNORECASE), '<HEX>'),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), '<STR>'),
+    (re.compile(r'\d+(?:\.\d+)?'), '<NUM>'),
+]
+
+
+def mask_variables(message: str) -> str:
+    """메시지의 가변 값(숫자, IP, 이메일 등)을 치환하여 템플릿 문자열로 변환
+
+    예시: "SELECT * FROM comment WHERE postId = 12" → "SELECT * FROM comment WHERE postId = <NUM>"
+    """
+    for pattern, placeholder in _VARIABLE_PATTERNS:
+        message = pattern.sub(placeholder, message)
+    return message
+
+
+def estimate_tokens(text: str) -> int:
+    """텍스트의 토큰 수를 보수적으로 추정
+
+    영문은 약 4바이트, 한글은 약 3바이트(1글자)당 1토큰 정도이므로 UTF-8 바이트 수 / 3을 쓴다.
+    """
+    return len(text.encode('utf-8')) // 3 + 1
+
+
+class LogCompactor:
+    """반복되는 로그를 템플릿 단위로 묶어 토큰 예산 안에서 LLM용 텍스트를 만드는 압축기
+
+    출력 구성 (앞쪽일수록 우선순위가 높음):
+    1. 주요 로그: ERROR/WARN 라인과 전후 context_lines 라인의 원문.
+       같은 템플릿은 max_examples번까지만 원문을 보여주고 나머지는 생략 건수로 표시한다.
+    2. 로그 템플릿 요약: 모든 고유 템플릿의 발생 횟수와 예시 라인 번호.
+
+    주요 로그는 예산의 IMPORTANT_SHARE 비율까지만 쓰고, 남은 예산은 템플릿 요약에 쓴다.
+    각 구간이 예산을 넘기면 그 지점에서 출력을 멈추고 생략 안내를 붙인다.
+    따라서 프롬프트 크기는 라인 수가 아니라 고유 이벤트 수에 비례한다.
+    """
+
+    IMPORTANT_LEVELS = ('ERROR', 'WARN')
+    IMPORTANT_SHARE = 0.6
+
+    def __init__(self, context_lines: int = 2, max_examples: int = 3,
+                 template_of: Callable[[str], str] | None = None):
+        """
+        Args:
+            context_lines: ERROR/WARN 라인 전후로 함께 보여줄 라인 수
+            max_examples: 템플릿별로 원문을 보여줄 최대 횟수
+            template_of: 메시지 → 템플릿 문자열 함수 (기본: mask_variables)
+        """
+        self.context_lines = context_lines
+        self.max_examples = max_examples
+        self.template_of = template_of or mask_variables
+
+    def compact(self, store: LogStore, token_budget: int) -> str:
+        """LogStore를 토큰 예산 안의 텍스트로 압축
+
+        Args:
+            store: 파싱된 로그
+            token_budget: 최대 토큰 수 (추정치)
+
+        Returns:
+            압축된 로그 문자열
+        """
+        size = len(store)
+
+        # 1. 템플릿 집계 (한 번의 순회)
+        template_ids: dict[tuple[str, str], int] = {}
+        templates: list[tuple[str, str]] = []
+        counts: list[int] = []
+        examples: list[list[int]] = []
+        entry_templates: list[int] = []
+
+        for index in range(size):
+            # 여러 줄 메시지는 첫 줄로 템플릿을 정함 (스택 트레이스 제외)
+            key = (store.level_of(index), self.template_of(store.message_of(index).split('\n', 1)[0]))
+            template_id = template_ids.get(key)
+            if template_id is None:
+                template_id = template_ids[key] = len(templates)
+                templates.append(key)
+                counts.append(0)
+                examples.append([])
+
+            counts[template_id] += 1
+            if len(examples[template_id]) < self.max_examples:
+                examples[template_id].append(store.line_numbers[index])
+            entry_templates.append(template_id)
+
+        # 2. ERROR/WARN 전후 문맥 표시
+        in_window = bytearray(size)
+        for level in self.IMPORTANT_LEVELS:
+            for index in store.indices_by_level(level):
+                low = max(0, index - self.context_lines)
+                high = min(size, index + self.context_lines + 1)
+                in_window[low:high] = b'\x01' * (high - low)
+
+        output = _BudgetedOutput(int(token_budget * self.IMPORTANT_SHARE))
+
+        # 3. 주요 로그 (시간순)
+        output.append(f"=== 주요 로그 (ERROR/WARN 및 전후 {self.context_lines}라인) ===")
+        shown = [0] * len(templates)
+        skipped = 0
+        previous = -1
+
+        for index in range(size):
+            if not in_window[index]:
+                continue
+
+            template_id = entry_templates[index]
+            if shown[template_id] >= self.max_examples:
+                skipped += 1
+                previous = index
+                continue
+
+            if skipped:
+                output.append(f"  ... (같은 패턴 반복 {skipped}건 생략)")
+                skipped = 0
+            elif previous != -1 and index != previous + 1:
+                output.append("  ...")
+
+            shown[template_id] += 1
+            entry = store[index]
+            if not output.append(f"[Line {entry['line_number']:3d}] {entry['raw']}"):
+                break
+            previous = index
+
+        if skipped:
+            output.append(f"  ... (같은 패턴 반복 {skipped}건 생략)")
+
+        important = output.finish()
+
+        # 4. 템플릿 요약 (발생 횟수 순, 남은 예산 사용)
+        output = _BudgetedOutput(token_budget - estimate_tokens(important))
+        output.append(f"\n=== 로그 템플릿 요약 (고유 패턴 {len(templates)}종) ===")
+        for template_id in sorted(range(len(templates)), key=lambda t: counts[t], reverse=True):
+            level, template = templates[template_id]
+            lines = ', '.join(str(line) for line in examples[template_id])
+            if not output.append(f"  - [{counts[template_id]}회] {level} {template} (예: Line {lines})"):
+                break
+
+        return important + "\n" + output.finish()
+
+
+class _BudgetedOutput:
+    """토큰 예산을 넘지 않는 범위에서만 라인을 쌓는 출력 버퍼"""
+
+    TRUNCATED_NOTICE = "\n(토큰 예산 초과로 이하 생략)"
+
+    def __init__(self, token_budget: int):
+        self.lines: list[str] = []
+        self.remaining = token_budget - estimate_tokens(self.TRUNCATED_NOTICE)
+        self.truncated = False
+
+    def append(self, line: str) -> bool:
+        """라인 추가 (예산 초과 시 추가하지 않고 False 반환)"""
+        if self.truncated:
+            return False
+
+        cost = estimate_tokens(line)
+        if cost > self.remaining:
+            self.truncated = True
+            return False
+
+        self.lines.append(line)
+        self.remaining -= cost
+        return True
+
+    def finish(self) -> str:
+        if self.truncated:
+            self.lines.append(self.TRUNCATED_NOTICE)
+        return "\n".join(self.lines)
@@ -0,0 +1,305 @@
+"""Log Formats - 로그 포맷 레지스트리와 자동 감지"""
+
+from __future__ import annotations
+
+import calendar
+import json
+import re
+import time
+from typing import Iterable
+
+try:
+    # 설치되어 있으면 더 빠른 JSON 디코더 사용
+    import orjson
+    _json_loads = orjson.loads
+    _JSON_ERRORS: tuple[type[Exception], ...] = (orjson.JSONDecodeError,)
+except ImportError:
+    _json_loads = json.loads
+    _JSON_ERRORS = (json.JSONDecodeError,)
+
+
+# 파싱 결과: (timestamp 'YYYY-MM-DD HH:MM:SS', level, message)
+ParsedLine = tuple[str, str, str]
+
+# 여러 로깅 라이브러리의 레벨 이름 → 표준 레벨 (INFO/ERROR/WARN/DEBUG)
+LEVEL_ALIASES: dict[str, str] = {
+    'INFO': 'INFO', 'NOTICE': 'INFO', 'HTTP': 'INFO',
+    'WARN': 'WARN', 'WARNING': 'WARN',
+    'ERROR': 'ERROR', 'ERR': 'ERROR', 'CRITICAL': 'ERROR', 'CRIT': 'ERROR',
+    'FATAL': 'ERROR', 'ALERT': 'ERROR', 'EMERG': 'ERROR',
+    'DEBUG': 'DEBUG', 'TRACE': 'DEBUG', 'VERBOSE': 'DEBUG', 'SILLY': 'DEBUG',
+}
+
+_MONTHS = {name: number for number, name in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), start=1)}
+
+
+def _format_epoch(epoch: float) -> str:
+    """epoch 초를 UTC 'YYYY-MM-DD HH:MM:SS'로 변환"""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(epoch))
+
+
+def _normalize_iso(timestamp: str) -> str:
+    """ISO 8601 타임스탬프를 'YYYY-MM-DD HH:MM:SS'로 자름 (소수 초와 타임존은 무시)"""
+    return timestamp[:10] + ' ' + timestamp[11:19]
+
+
+class LogFormat:
+    """로그 포맷 하나의 파서
+
+    서브클래스는 parse()를 구현하며, 라인이 이 포맷이 아니면 None을 반환한다.
+    ENTRY_START는 파싱에는 실패했지만 새 엔트리의 시작으로 보이는 라인을 가리는 정규식으로,
+    이런 라인은 앞 엔트리의 연속 라인으로 붙이지 않는다.
+    """
+
+    name = ''
+    ENTRY_START: re.Pattern | None = None
+
+    def parse(self, line: str) -> ParsedLine | None:
+        raise NotImplementedError
+
+    def is_entry_start(self, line: str) -> bool:
+        return self.ENTRY_START is not None and self.ENTRY_START.match(line) is not None
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class Pm2Format(LogFormat):
+    """PM2 기본 포맷: [2026-01-05 03:14:55] INFO message"""
+
+    name = 'pm2'
+    PATTERN = re.compile(
+        r'^\[(?P<timestamp>[\d\-\s:]+)\]\s+'
+        r'(?P<level>[A-Z]+)\s+'
+        r'(?P<message>.+)$'
+    )
+    ENTRY_START = re.compile(r'^\[[\d\-\s:]+\]')
+
+    def parse(self, line: str) -> ParsedLine | None:
+        match = self.PATTERN.match(line)
+        if match is None:
+            return None
+
+        level = LEVEL_ALIASES.get(match.group('level'))
+        if level is None:
+            return None
+        return match.group('timestamp').strip(), level, match.group('message').strip()
+
+
+class Pm2TimeFormat(LogFormat):
+    """PM2 --time 옵션 포맷: 2026-01-05T03:14:55: message
+
+    뒤따르는 메시지가 PM2 기본 포맷이면 그 타임스탬프와 레벨을 쓰고,
+    "LEVEL message" 형태면 레벨만 읽으며, 그 외에는 INFO로 취급한다.
+    """
+
+    name = 'pm2-time'
+    PATTERN = re.compile(
+        r'^(?P<timestamp>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?:\s+'
+        r'(?P<rest>.+)$'
+    )
+    LEVEL_PATTERN = re.compile(r'^(?P<level>[A-Z]+):?\s+(?P<message>.+)$')
+    ENTRY_START = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
+
+    def __init__(self):
+        self.inner = Pm2Format()
+
+    def parse(self, line: str) -> ParsedLine | None:
+        match = self.PATTERN.match(line)
+        if match is None:
+            return None
+
+        rest = match.group('rest')
+        inner = self.inner.parse(rest)
+        if inner is not None:
+            return inner
+
+        timestamp = _normalize_iso(match.group('timestamp'))
+        level_match = self.LEVEL_PATTERN.match(rest)
+        if level_match:
+            level = LEVEL_ALIASES.get(level_match.group('level'))
+            if level is not None:
+                return timestamp, level, level_match.group('message').strip()
+        return timestamp, 'INFO', rest.strip()
+
+
+class JsonLinesFormat(LogFormat):
+    """JSON lines 포맷 (pino, winston)
+
+    정규식 대신 JSON 디코더로 한 번에 파싱한다 (orjson이 있으면 사용).
+    - 시각: time (pino, epoch ms) 또는 timestamp (winston, ISO 8601)
+    - 레벨: pino 숫자 레벨 (10~60) 또는 문자열 레벨
+    - 메시지: msg 또는 message. pino-http의 req/res/responseTime이 있으면
+      "GET /path 200 - 12ms - message" 형태로 요청 라인을 앞에 붙이고,
+      err.stack이 있으면 여러 줄 메시지로 이어 붙인다.
+    """
+
+    name = 'json'
+    ENTRY_START = re.compile(r'^\{')
+
+    @staticmethod
+    def _level(value) -> str:
+        if isinstance(value, (int, float)):
+            # pino: 10 trace, 20 debug, 30 info, 40 warn, 50 error, 60 fatal
+            if value >= 50:
+                return 'ERROR'
+            if value >= 40:
+                return 'WARN'
+            if value >= 30:
+                return 'INFO'
+            return 'DEBUG'
+        return LEVEL_ALIASES.get(str(value).upper(), 'INFO')
+
+    @staticmethod
+    def _timestamp(record: dict) -> str | None:
+        value = record.get('time', record.get('timestamp'))
+        if isinstance(value, (int, float)):
+            # 10^11 이상이면 밀리초 단위 (pino 기본값)
+            return _format_epoch(value / 1000 if value >= 1e11 else value)
+        if isinstance(value, str) and len(value) >= 19:
+            return _normalize_iso(value)
+        return None
+
+    def parse(self, line: str) -> ParsedLine | None:
+        if not line.startswith('{'):
+            return None
+        try:
+            record = _json_loads(line)
+        except _JSON_ERRORS:
+            return None
+        if not isinstance(record, dict):
+            return None
+
+        timestamp = self._timestamp(record)
+        if timestamp is None:
+            return None
+
+        message = record.get('msg', record.get('message'))
+        message = line if message is None else str(message)
+
+        request = record.get('req')
+        if isinstance(request, dict) and 'method' in request and 'url' in request:
+            parts = [f"{request['method']} {request['url']}"]
+            response = record.get('res')
+            if isinstance(response, dict) and 'statusCode' in response:
+                parts.append(str(response['statusCode']))
+            request_line = ' '.join(parts)
+            if 'responseTime' in record:
+                request_line += f" - {record['responseTime']}ms"
+            message = f"{request_line} - {message}"
+
+        error = record.get('err', record.get('error'))
+        if isinstance(error, dict) and isinstance(error.get('stack'), str):
+            message += '\n' + error['stack']
+
+        return timestamp, self._level(record.get('level', 'info')), message
+
+
+class NginxAccessFormat(LogFormat):
+    """nginx access log (combined 포맷, 마지막에 $request_time이 있으면 응답 시간으로 사용)
+
+    레벨은 상태 코드로 정한다 (5xx: ERROR, 4xx: WARN, 그 외: INFO).
+    메시지는 "GET /path 200 - 12ms - IP: 1.2.3.4" 형태로 만들어 PM2 요청 로그와 같은
+    방식으로 요청 필드를 추출할 수 있게 하고, 시각은 UTC로 변환한다.
+    """
+
+    name = 'nginx'
+    PATTERN = re.compile(
+        r'^(?P<ip>\S+) \S+ (?P<user>\S+) '
+        r'\[(?P<day>\d{2})/(?P<month>\w{3})/(?P<year>\d{4}):(?P<time>\d{2}:\d{2}:\d{2}) (?P<zone>[+-]\d{4})\] '
+        r'"(?P<method>[A-Z]+) (?P<path>\S+)[^"]*" (?P<status>\d{3}) \S+'
+        r'(?: "[^"]*" "[^"]*")?'
+        r'(?: (?P<request_time>\d+(?:\.\d+)?))?'
+    )
+    ENTRY_START = re.compile(r'^\S+ \S+ \S+ \[\d{2}/\w{3}/\d{4}:')
+
+    def parse(self, line: str) -> ParsedLine | None:
+        match = self.PATTERN.match(line)
+        if match is None:
+            return None
+
+        month = _MONTHS.get(match.group('month'))
+        if month is None:
+            return None
+        hour, minute, second = (int(part) for part in match.group('time').split(':'))
+        zone = match.group('zone')
+        offset = (int(zone[1:3]) * 3600 + int(zone[3:5]) * 60) * (-1 if zone[0] == '-' else 1)
+        epoch = calendar.timegm((int(match.group('year')), month, int(match.group('day')),
+                                 hour, minute, second)) - offset
+
+        status = int(match.group('status'))
+        level = 'ERROR' if status >= 500 else 'WARN' if status >= 400 else 'INFO'
+
+        message = f"{match.group('method')} {match.group('path')} {status}"
+        if match.group('request_time'):
+            message += f" - {float(match.group('request_time')) * 1000:g}ms"
+        message += f" - IP: {match.group('ip')}"
+        if match.group('user') != '-':
+            message += f" - User: {match.group('user')}"
+
+        return _format_epoch(epoch), level, message
+
+
+# 기본 포맷 (자동 감지 시 동점이면 앞쪽 포맷 우선)
+DEFAULT_LOG_FORMATS: list[LogFormat] = [Pm2Format(), Pm2TimeFormat(), JsonLinesFormat(), NginxAccessFormat()]
+
+
+class LogFormatRegistry:
+    """이름으로 로그 포맷을 찾고, 샘플 라인으로 포맷을 자동 감지하는 레지스트리
+
+    예시:
+        registry = LogFormatRegistry()
+        registry.register(MyFormat())
+        registry.sniff(first_lines)  # 가장 많이 파싱되는 포맷
+    """
+
+    # 자동 감지에 쓰는 샘플 라인 수
+    SNIFF_LINES = 100
+
+    def __init__(self, formats: list[LogFormat] | None = None):
+        self.formats: list[LogFormat] = list(DEFAULT_LOG_FORMATS if formats is None else formats)
+
+    def register(self, log_format: LogFormat, first: bool = False) -> None:
+        """포맷 등록 (같은 이름이 있으면 교체)
+
+        Args:
+            log_format: 등록할 포맷
+            first: True면 자동 감지 동점 시 기존 포맷보다 우선
+        """
+        if not log_format.name:
+            raise ValueError("로그 포맷에 이름이 없습니다")
+
+        self.formats = [existing for existing in self.formats if existing.name != log_format.name]
+        if first:
+            self.formats.insert(0, log_format)
+        else:
+            self.formats.append(log_format)
+
+    def get(self, name: str) -> LogFormat:
+        """이름으로 포맷 조회"""
+        for log_format in self.formats:
+            if log_format.name == name:
+                return log_format
+        raise ValueError(f"알 수 없는 로그 포맷입니다: {name} (지원: {', '.join(self.names())})")
+
+    def names(self) -> list[str]:
+        return [log_format.name for log_format in self.formats]
+
+    def sniff(self, lines: Iterable[str]) -> LogFormat | None:
+        """앞쪽 SNIFF_LINES개의 비어 있지 않은 라인을 가장 많이 파싱하는 포맷 (하나도 없으면 None)"""
+        sample = []
+        for line in lines:
+            line = line.strip()
+            if line:
+                sample.append(line)
+                if len(sample) >= self.SNIFF_LINES:
+                    break
+
+        best = None
+        best_count = 0
+        for log_format in self.formats:
+            count = sum(1 for line in sample if log_format.parse(line) is not None)
+            if count > best_count:
+                best, best_count = log_format, count
+        return best
@@ -0,0 +1,171 @@
+"""Log Index - LogStore 위의 검색용 인덱스"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable
+
+from src.utils.log_store import LogStore
+
+
+class KeywordIndex:
+    """소문자 메시지의 trigram 역색인
+
+    키워드의 모든 trigram을 포함하는 엔트리만 후보로 뽑은 뒤 실제 부분 문자열 검사로
+    확정하므로, 결과는 `keyword.lower() in message.lower()` 전체 스캔과 동일하다.
+    3글자 미만 키워드는 trigram이 없으므로 전체 스캔으로 처리한다.
+
+    store가 커지면 (follow 모드 등) 다음 조회 때 새 엔트리만 추가로 색인한다.
+    """
+
+    GRAM_SIZE = 3
+
+    def __init__(self, store: LogStore):
+        self.store = store
+        self.postings: dict[str, array] = {}
+        self.indexed_count = 0
+
+    def update(self) -> None:
+        """아직 색인되지 않은 엔트리를 색인"""
+        store = self.store
+        postings = self.postings
+        size = self.GRAM_SIZE
+
+        for index in range(self.indexed_count, len(store)):
+            message = store.message_of(index).lower()
+            for gram in {message[i:i + size] for i in range(len(message) - size + 1)}:
+                posting = postings.get(gram)
+                if posting is None:
+                    # 엔트리 인덱스는 uint32 범위로 충분하므로 메모리를 아끼기 위해 'I' 사용
+                    posting = postings[gram] = array('I')
+                posting.append(index)
+
+        self.indexed_count = len(store)
+
+    def invalidate_from(self, index: int) -> None:
+        """index 이후 엔트리를 다음 조회 때 다시 색인 (메시지 끝에 내용이 덧붙은 경우)
+
+        다시 색인할 때 중복이 생기지 않도록 posting에서 index 이상인 항목을 먼저 잘라낸다.
+        메시지는 뒤로만 늘어나므로 예전 trigram은 모두 현재 메시지에도 있다. 따라서 현재 메시지의
+        trigram이 가리키는 posting만 자르면 되고, posting은 오름차순이라 bisect로 자를 위치를 찾는다.
+        """
+        if index >= self.indexed_count:
+            return
+
+        store = self.store
+        postings = self.postings
+        size = self.GRAM_SIZE
+
+        grams: set[str] = set()
+        for position in range(index, self.indexed_count):
+            message = store.message_of(position).lower()
+            grams.update(message[i:i + size] for i in range(len(message) - size + 1))
+
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                continue
+            del posting[bisect_left(posting, index):]
+            if not posting:
+                del postings[gram]
+
+        self.indexed_count = index
+
+    def lookup(self, keyword: str) -> list[int]:
+        """대소문자 구분 없이 키워드를 포함한 엔트리 인덱스 목록 (오름차순)"""
+        self.update()
+
+        keyword_lower = keyword.lower()
+        store = self.store
+
+        if len(keyword_lower) < self.GRAM_SIZE:
+            return [index for index in range(len(store))
+                    if keyword_lower in store.message_of(index).lower()]
+
+        size = self.GRAM_SIZE
+        grams = {keyword_lower[i:i + size] for i in range(len(keyword_lower) - size + 1)}
+        posting_lists = []
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                return []
+            posting_lists.append(posting)
+
+        # 가장 짧은 posting부터 교집합을 구해 후보 수를 빠르게 줄임
+        posting_lists.sort(key=len)
+        candidates = set(posting_lists[0])
+        for posting in posting_lists[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+
+        return [index for index in sorted(candidates)
+                if keyword_lower in store.message_of(index).lower()]
+
+
+class TimeIndex:
+    """epoch 타임스탬프 기준으로 정렬된 엔트리 인덱스
+
+    대부분의 로그는 이미 시간순이므로 정렬 여부를 먼저 확인하고, 순서가 조금 어긋난
+    라인이 있을 때만 안정 정렬한다 (같은 시각은 파일 순서 유지).
+    타임스탬프를 epoch로 변환할 수 없는 엔트리는 색인하지 않는다.
+
+    store가 커지면 다음 조회 때 새 엔트리를 반영한다. 새 엔트리가 모두 기존 마지막
+    시각 이후라면 뒤에 이어 붙이고, 그렇지 않으면 다시 정렬한다.
+    """
+
+    def __init__(self, store: LogStore):
+        self.store = store
+        self.order = array('I')  # 시간순으로 정렬된 엔트리 인덱스
+        self.epochs = array('q')  # order와 같은 순서의 epoch (bisect용)
+        self.indexed_count = 0
+
+    def update(self) -> None:
+        """아직 색인되지 않은 엔트리를 반영"""
+        timestamps = self.store.timestamps
+        new_indices = [index for index in range(self.indexed_count, len(timestamps))
+                       if timestamps[index] != LogStore.NO_TIMESTAMP]
+        self.indexed_count = len(timestamps)
+
+        if not new_indices:
+            return
+
+        new_epochs = [timestamps[index] for index in new_indices]
+        in_order = all(a <= b for a, b in zip(new_epochs, new_epochs[1:]))
+
+        if in_order and (not self.epochs or self.epochs[-1] <= new_epochs[0]):
+            self.order.extend(new_indices)
+            self.epochs.extend(new_epochs)
+            return
+
+        # 순서가 어긋난 라인이 있으면 전체를 안정 정렬
+        merged = sorted(list(self.order) + new_indices, key=timestamps.__getitem__)
+        self.order = array('I', merged)
+        self.epochs = array('q', (timestamps[index] for index in merged))
+
+    def between(self, start: int, end: int) -> list[int]:
+        """start <= epoch <= end 인 엔트리 인덱스 목록 (시간순)"""
+        self.update()
+
+        low = bisect_left(self.epochs, start)
+        high = bisect_right(self.epochs, end)
+        return list(self.order[low:high])
+
+
+def combine_indices(results: Iterable[list[int]], match_all: bool) -> list[int]:
+    """여러 검색 결과(인덱스 목록)를 AND/OR로 결합하여 오름차순으로 반환"""
+    combined: set[int] | None = None
+
+    for indices in results:
+        if combined is None:
+            combined = set(indices)
+        elif match_all:
+            combined.intersection_update(indices)
+        else:
+            combined.update(indices)
+
+        if match_all and not combined:
+            break
+
+    return sorted(combined) if combined else []
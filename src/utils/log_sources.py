@@ -0,0 +1,95 @@
+"""Log Sources - 압축/회전된 로그 파일 입력"""
+
+from __future__ import annotations
+
+import bz2
+import glob
+import gzip
+import io
+import lzma
+from pathlib import Path
+from typing import IO, Iterable
+
+try:
+    import zstandard
+except ImportError:  # zstd 지원은 선택 사항
+    zstandard = None
+
+
+# 압축 해제 스트림의 읽기 버퍼 크기 (작은 read 호출이 압축 해제 비용을 키우지 않도록 크게 잡음)
+READ_BUFFER_SIZE = 1024 * 1024
+
+# 파일 앞부분 매직 바이트 → 압축 형식 (확장자가 없거나 틀려도 내용으로 판별)
+_MAGIC_BYTES = [
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+]
+
+
+def detect_compression(file_path: str | Path) -> str | None:
+    """파일의 압축 형식 ('gzip', 'bz2', 'xz', 'zstd', 압축되지 않았으면 None)"""
+    with open(file_path, 'rb') as f:
+        head = f.read(6)
+
+    for magic, compression in _MAGIC_BYTES:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_log_text(file_path: str | Path) -> IO[str]:
+    """로그 파일을 텍스트 스트림으로 열기 (압축 파일은 디스크에 풀지 않고 스트리밍 해제)
+
+    Raises:
+        ImportError: zstd 파일인데 zstandard 패키지가 없는 경우
+    """
+    compression = detect_compression(file_path)
+
+    if compression is None:
+        return open(file_path, 'r', encoding='utf-8')
+
+    if compression == 'gzip':
+        raw = gzip.open(file_path, 'rb')
+    elif compression == 'bz2':
+        raw = bz2.open(file_path, 'rb')
+    elif compression == 'xz':
+        raw = lzma.open(file_path, 'rb')
+    else:
+        if zstandard is None:
+            raise ImportError(f"zstd 압축 로그를 읽으려면 zstandard 패키지가 필요합니다: {file_path}")
+        raw = zstandard.ZstdDecompressor().stream_reader(
+            open(file_path, 'rb'), read_size=READ_BUFFER_SIZE, read_across_frames=True, closefd=True
+        )
+
+    buffered = io.BufferedReader(raw, buffer_size=READ_BUFFER_SIZE)
+    return io.TextIOWrapper(buffered, encoding='utf-8')
+
+
+def resolve_log_paths(file_path: str | Path | Iterable[str | Path]) -> list[Path]:
+    """파일 경로, glob 패턴, 경로 목록을 실제 로그 파일 목록으로 변환
+
+    glob 패턴(예: logs/app-out.log*)은 회전된 파일을 모두 포함하며, 수정 시각이 오래된
+    파일부터 정렬한다 (같은 시각의 로그는 이 순서대로 병합된다).
+
+    Raises:
+        FileNotFoundError: 파일이 없거나 패턴과 일치하는 파일이 없는 경우
+    """
+    if isinstance(file_path, (str, Path)):
+        path = Path(file_path)
+        if path.exists():
+            return [path]
+
+        matches = [Path(match) for match in glob.glob(str(file_path)) if Path(match).is_file()]
+        if not glob.has_magic(str(file_path)) or not matches:
+            raise FileNotFoundError(f"로그 파일을 찾을 수 없습니다: {file_path}")
+        return sorted(matches, key=lambda match: (match.stat().st_mtime, str(match)))
+
+    paths = [Path(path) for path in file_path]
+    for path in paths:
+        if not path.exists():
+            raise FileNotFoundError(f"로그 파일을 찾을 수 없습니다: {path}")
+    if not paths:
+        raise FileNotFoundError("로그 파일 목록이 비어 있습니다")
+    return paths
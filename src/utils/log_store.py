@@ -0,0 +1,475 @@
+"""Log Store - 컬럼형 로그 엔트리 저장소"""
+
+from __future__ import annotations
+
+import calendar
+import re
+import time
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from datetime import date
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from src.utils.request_fields import RequestTable
+
+if TYPE_CHECKING:
+    from src.agents.log_parser import LogEntry
+
+
+class LogStore(Sequence):
+    """로그 엔트리를 컬럼 단위로 압축 저장하는 시퀀스
+
+    엔트리마다 dict를 두는 대신 컬럼별 배열에 나눠 저장한다.
+    - levels: 레벨 코드 (uint8)
+    - timestamps: epoch 초 (int64)
+    - line_numbers: 라인 번호 (int64)
+    - messages: 하나의 UTF-8 버퍼 + 오프셋 배열
+    - template_ids: 템플릿 ID (uint32, 템플릿 마이닝을 켠 경우에만)
+    - parameters: 템플릿의 <*> 위치 값 - 엔트리별로 줄바꿈으로 이은 UTF-8 버퍼 + 오프셋 배열
+      (공백으로 나눈 토큰이므로 줄바꿈이나 빈 문자열이 들어 있지 않음, 템플릿 마이닝을 켠 경우에만)
+    - request_fields: HTTP 요청 필드 희소 테이블 (필드 추출을 켠 경우에만)
+
+    raw는 "[timestamp] LEVEL message"로 복원 가능하면 저장하지 않으며,
+    복원 결과가 원본과 다를 때만 별도로 보관한다.
+    인덱싱/순회 시 LogEntry dict가 그때그때 만들어진다.
+
+    to_buffers()/from_buffers()로 컬럼을 바이트 버퍼로 내보내고 되살릴 수 있다.
+    from_buffers()에 mmap 기반 memoryview를 넘기면 복사 없이 읽기 전용으로 열리고,
+    엔트리를 추가할 때 처음 한 번만 쓰기 가능한 배열로 복사한다.
+    pickle도 같은 버퍼 형식을 쓰므로 캐시에서 연 스토어도 프로세스 간에 주고받을 수 있다.
+    """
+
+    # 배열 컬럼 이름 → array 타입 코드
+    COLUMN_TYPES = {'levels': 'B', 'timestamps': 'q', 'line_numbers': 'q', 'message_offsets': 'q'}
+
+    TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+    TIMESTAMP_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+
+    # 타임스탬프를 epoch로 변환할 수 없는 엔트리 표시값
+    NO_TIMESTAMP = -(2 ** 63)
+
+    def __init__(self):
+        self.level_names: list[str] = []
+        self._level_codes: dict[str, int] = {}
+
+        self.levels = array('B')
+        self.timestamps = array('q')
+        self.line_numbers = array('q')
+        self.message_offsets = array('q', [0])
+        self.message_buffer = bytearray()
+        self.template_ids: array | None = None
+        self.parameter_offsets: array | None = None
+        self.parameter_buffer: bytearray | None = None
+        self.request_fields: RequestTable | None = None
+
+        # 컬럼으로 복원할 수 없는 값 (인덱스 → 원본 문자열)
+        self._timestamp_overrides: dict[int, str] = {}
+        self._raw_overrides: dict[int, str] = {}
+
+        # 날짜 문자열 → 해당 날짜 자정의 epoch
+        self._day_epochs: dict[str, int] = {}
+
+        # from_buffers()로 읽기 전용 버퍼를 그대로 쓰고 있는지
+        self._frozen = False
+
+    # ------------------------------------------------------------------
+    # 적재
+    # ------------------------------------------------------------------
+
+    def append(self, entry: LogEntry) -> None:
+        """엔트리 하나를 컬럼에 추가"""
+        if self._frozen:
+            self._thaw()
+
+        index = len(self.levels)
+        timestamp = entry['timestamp']
+        level = entry['level']
+        message = entry['message']
+
+        code = self._level_codes.get(level)
+        self.levels.append(code if code is not None else self._level_code(level))
+        self.timestamps.append(self._to_epoch(timestamp, index))
+        self.line_numbers.append(entry['line_number'])
+
+        self.message_buffer += message.encode('utf-8')
+        self.message_offsets.append(len(self.message_buffer))
+
+        if entry['raw'] != f"[{timestamp}] {level} {message}":
+            self._raw_overrides[index] = entry['raw']
+
+        template_id = entry.get('template_id')
+        if template_id is not None:
+            if self.template_ids is None:
+                self._init_templates()
+            self.template_ids.append(template_id)
+            self._append_parameters(entry.get('parameters', ()))
+
+        if 'fields' in entry:
+            if self.request_fields is None:
+                self.request_fields = RequestTable()
+            if entry['fields'] is not None:
+                self.request_fields.add(index, entry['fields'])
+
+    def extend(self, entries: Iterable[LogEntry]) -> None:
+        """여러 엔트리를 순서대로 추가"""
+        for entry in entries:
+            self.append(entry)
+
+    def extend_store(self, other: LogStore) -> None:
+        """다른 LogStore의 컬럼을 그대로 이어 붙임 (dict 변환 없음)"""
+        if self._frozen:
+            self._thaw()
+
+        base = len(self.levels)
+        buffer_base = len(self.message_buffer)
+
+        # 레벨 코드 테이블이 다르면 other의 코드를 이쪽 코드로 변환
+        codes = bytes(self._level_code(name) for name in other.level_names)
+        if codes == bytes(range(len(codes))):
+            self.levels.extend(other.levels)
+        else:
+            table = codes + bytes(256 - len(codes))
+            self.levels.frombytes(other.levels.tobytes().translate(table))
+
+        self.timestamps.extend(other.timestamps)
+        self.line_numbers.extend(other.line_numbers)
+        self.message_buffer += other.message_buffer
+        self.message_offsets.extend(offset + buffer_base for offset in other.message_offsets[1:])
+
+        if other.template_ids is not None:
+            if self.template_ids is None:
+                self._init_templates()
+            parameter_base = len(self.parameter_buffer)
+            self.template_ids.extend(other.template_ids)
+            self.parameter_buffer += other.parameter_buffer
+            self.parameter_offsets.extend(offset + parameter_base for offset in other.parameter_offsets[1:])
+
+        if other.request_fields is not None:
+            if self.request_fields is None:
+                self.request_fields = RequestTable()
+            self.request_fields.extend_table(other.request_fields, base)
+
+        for index, value in other._timestamp_overrides.items():
+            self._timestamp_overrides[base + index] = value
+        for index, value in other._raw_overrides.items():
+            self._raw_overrides[base + index] = value
+
+    def assign_templates(self, matches: Iterable[tuple[int, list[str]]]) -> None:
+        """전체 엔트리의 (템플릿 ID, 파라미터)를 한 번에 교체 (병합 후 다시 마이닝한 결과 반영용)"""
+        if self._frozen:
+            self._thaw()
+
+        self._init_templates()
+        for template_id, parameters in matches:
+            self.template_ids.append(template_id)
+            self._append_parameters(parameters)
+        if len(self.template_ids) != len(self.levels):
+            raise ValueError("템플릿 매칭 결과 수가 엔트리 수와 다릅니다")
+
+    def _init_templates(self) -> None:
+        self.template_ids = array('I')
+        self.parameter_offsets = array('q', [0])
+        self.parameter_buffer = bytearray()
+
+    def _append_parameters(self, parameters: Iterable[str]) -> None:
+        self.parameter_buffer += '\n'.join(parameters).encode('utf-8')
+        self.parameter_offsets.append(len(self.parameter_buffer))
+
+    def extend_last_message(self, text: str) -> None:
+        """마지막 엔트리의 message와 raw 끝에 text를 덧붙임 (여러 줄 로그의 연속 라인용)
+
+        마지막 메시지는 버퍼 끝에 있으므로 버퍼에 이어 쓰고 끝 오프셋만 옮기면 된다.
+        """
+        index = len(self.levels) - 1
+        if index < 0:
+            raise IndexError("LogStore가 비어 있습니다")
+        if self._frozen:
+            self._thaw()
+
+        self.message_buffer += text.encode('utf-8')
+        self.message_offsets[-1] = len(self.message_buffer)
+
+        raw = self._raw_overrides.get(index)
+        if raw is not None:
+            self._raw_overrides[index] = raw + text
+
+    def to_buffers(self) -> tuple[dict, dict[str, bytes | bytearray | memoryview]]:
+        """컬럼을 (JSON 직렬화 가능한 메타데이터, 이름 → 바이트 버퍼)로 내보냄
+
+        메타데이터의 'columns'에 버퍼별 array 타입 코드가 들어 있다.
+        """
+        columns = dict(self.COLUMN_TYPES)
+        buffers: dict[str, bytes | bytearray | memoryview] = {
+            name: memoryview(getattr(self, name)).cast('B') for name in self.COLUMN_TYPES
+        }
+        buffers['message_buffer'] = self.message_buffer
+        columns['message_buffer'] = 'B'
+
+        if self.template_ids is not None:
+            buffers['template_ids'] = memoryview(self.template_ids).cast('B')
+            buffers['parameter_offsets'] = memoryview(self.parameter_offsets).cast('B')
+            buffers['parameter_buffer'] = self.parameter_buffer
+            columns.update({'template_ids': 'I', 'parameter_offsets': 'q', 'parameter_buffer': 'B'})
+
+        for name, overrides in (('timestamp_overrides', self._timestamp_overrides),
+                                ('raw_overrides', self._raw_overrides)):
+            indices, offsets, text = _encode_strings(overrides)
+            buffers[f'{name}.indices'] = indices.tobytes()
+            buffers[f'{name}.offsets'] = offsets.tobytes()
+            buffers[f'{name}.text'] = text
+            columns.update({f'{name}.indices': 'q', f'{name}.offsets': 'q', f'{name}.text': 'B'})
+
+        request_meta = None
+        if self.request_fields is not None:
+            request_meta, request_buffers = self.request_fields.to_buffers()
+            for name, buffer in request_buffers.items():
+                buffers[f'request.{name}'] = buffer
+            columns.update({f'request.{name}': code for name, code in request_meta['columns'].items()})
+
+        meta = {'level_names': self.level_names, 'columns': columns, 'request_fields': request_meta}
+        return meta, buffers
+
+    @classmethod
+    def from_buffers(cls, meta: dict, buffers: dict) -> LogStore:
+        """to_buffers()의 결과로 LogStore 복원
+
+        buffers의 값은 바이트 단위 버퍼이며, 컬럼은 타입 코드로 cast 한 memoryview로 복사 없이 쓴다.
+        message_buffer는 슬라이싱과 find()를 지원하는 객체(bytes, mmap 등)여야 한다.
+        """
+        store = cls()
+        columns = meta['columns']
+
+        def column(name: str):
+            return memoryview(buffers[name]).cast('B').cast(columns[name])
+
+        store.level_names = list(meta['level_names'])
+        store._level_codes = {name: code for code, name in enumerate(store.level_names)}
+        for name in cls.COLUMN_TYPES:
+            setattr(store, name, column(name))
+        store.message_buffer = buffers['message_buffer']
+        if 'template_ids' in buffers:
+            store.template_ids = column('template_ids')
+            store.parameter_offsets = column('parameter_offsets')
+            store.parameter_buffer = buffers['parameter_buffer']
+
+        store._timestamp_overrides = _decode_strings(
+            column('timestamp_overrides.indices'), column('timestamp_overrides.offsets'),
+            buffers['timestamp_overrides.text'])
+        store._raw_overrides = _decode_strings(
+            column('raw_overrides.indices'), column('raw_overrides.offsets'), buffers['raw_overrides.text'])
+
+        if meta['request_fields'] is not None:
+            prefix = 'request.'
+            store.request_fields = RequestTable.from_buffers(meta['request_fields'], {
+                name[len(prefix):]: buffer for name, buffer in buffers.items() if name.startswith(prefix)
+            })
+
+        store._frozen = True
+        return store
+
+    def __reduce__(self):
+        # mmap 기반 memoryview는 pickle 할 수 없으므로 버퍼를 bytes로 복사해 전달
+        meta, buffers = self.to_buffers()
+        return LogStore.from_buffers, (meta, {name: bytes(buffer) for name, buffer in buffers.items()})
+
+    def _thaw(self) -> None:
+        """읽기 전용 버퍼로 열린 컬럼을 쓰기 가능한 배열로 복사"""
+        for name, code in self.COLUMN_TYPES.items():
+            column = array(code)
+            column.frombytes(memoryview(getattr(self, name)).cast('B'))
+            setattr(self, name, column)
+        self.message_buffer = bytearray(self.message_buffer)
+
+        if self.template_ids is not None:
+            template_ids = array('I')
+            template_ids.frombytes(memoryview(self.template_ids).cast('B'))
+            self.template_ids = template_ids
+            parameter_offsets = array('q')
+            parameter_offsets.frombytes(memoryview(self.parameter_offsets).cast('B'))
+            self.parameter_offsets = parameter_offsets
+            self.parameter_buffer = bytearray(self.parameter_buffer)
+        if self.request_fields is not None:
+            self.request_fields.thaw()
+
+        self._frozen = False
+
+    def _level_code(self, level: str) -> int:
+        """레벨 이름을 uint8 코드로 변환 (처음 보는 레벨은 새 코드 할당)"""
+        code = self._level_codes.get(level)
+        if code is None:
+            code = len(self.level_names)
+            if code > 255:
+                raise ValueError(f"레벨 종류가 너무 많습니다: {level}")
+            self._level_codes[level] = code
+            self.level_names.append(level)
+        return code
+
+    def _to_epoch(self, timestamp: str, index: int) -> int:
+        """타임스탬프를 epoch로 변환하고, 변환할 수 없으면 원본 문자열을 보관"""
+        epoch = self.parse_epoch(timestamp)
+        if epoch == self.NO_TIMESTAMP:
+            self._timestamp_overrides[index] = timestamp
+        return epoch
+
+    def parse_epoch(self, timestamp: str) -> int:
+        """'YYYY-MM-DD HH:MM:SS' 타임스탬프를 epoch 초로 변환
+
+        Returns:
+            epoch 초 (형식이 다르거나 잘못된 값이면 NO_TIMESTAMP)
+        """
+        if not self.TIMESTAMP_PATTERN.match(timestamp):
+            return self.NO_TIMESTAMP
+
+        # 날짜 부분은 종류가 적으므로 날짜별 자정 epoch를 캐싱하고 시각만 더함
+        day_epoch = self._day_epochs.get(timestamp[:10])
+        if day_epoch is None:
+            try:
+                day = date(int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]))
+            except ValueError:
+                return self.NO_TIMESTAMP
+            day_epoch = calendar.timegm(day.timetuple())
+            self._day_epochs[timestamp[:10]] = day_epoch
+
+        hour, minute, second = int(timestamp[11:13]), int(timestamp[14:16]), int(timestamp[17:19])
+        if hour > 23 or minute > 59 or second > 59:
+            return self.NO_TIMESTAMP
+
+        return day_epoch + hour * 3600 + minute * 60 + second
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LogStore index out of range")
+        return self._materialize(index)
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        for index in range(len(self)):
+            yield self._materialize(index)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"<LogStore entries={len(self)} levels={self.level_names}>"
+
+    def level_of(self, index: int) -> str:
+        return self.level_names[self.levels[index]]
+
+    def message_of(self, index: int) -> str:
+        start = self.message_offsets[index]
+        end = self.message_offsets[index + 1]
+        return self.message_buffer[start:end].decode('utf-8')
+
+    def parameters_of(self, index: int) -> list[str]:
+        """템플릿의 <*> 위치 값 (템플릿 마이닝을 켜지 않았으면 빈 목록)"""
+        if self.parameter_offsets is None:
+            return []
+        start = self.parameter_offsets[index]
+        end = self.parameter_offsets[index + 1]
+        return bytes(self.parameter_buffer[start:end]).decode('utf-8').split('\n') if end > start else []
+
+    def timestamp_of(self, index: int) -> str:
+        override = self._timestamp_overrides.get(index)
+        if override is not None:
+            return override
+        return time.strftime(self.TIMESTAMP_FORMAT, time.gmtime(self.timestamps[index]))
+
+    def _materialize(self, index: int) -> LogEntry:
+        """인덱스의 엔트리를 LogEntry dict로 복원"""
+        timestamp = self.timestamp_of(index)
+        level = self.level_of(index)
+        message = self.message_of(index)
+        raw = self._raw_overrides.get(index)
+
+        entry = {
+            'timestamp': timestamp,
+            'level': level,
+            'message': message,
+            'raw': raw if raw is not None else f"[{timestamp}] {level} {message}",
+            'line_number': self.line_numbers[index],
+        }
+        if self.template_ids is not None:
+            entry['template_id'] = self.template_ids[index]
+            entry['parameters'] = self.parameters_of(index)
+        if self.request_fields is not None:
+            entry['fields'] = self.request_fields.fields_of(index)
+        return entry
+
+    def entries(self, indices: Iterable[int]) -> list[LogEntry]:
+        """인덱스 목록에 해당하는 엔트리만 dict로 복원"""
+        return [self._materialize(index) for index in indices]
+
+    def indices_by_level(self, level: str) -> list[int]:
+        """특정 레벨 엔트리의 인덱스 목록"""
+        return self.filter_by_level(range(len(self)), level)
+
+    def filter_by_level(self, indices: Iterable[int], level: str) -> list[int]:
+        """인덱스 목록 중 특정 레벨인 엔트리만 남김"""
+        code = self._level_codes.get(level)
+        if code is None:
+            return []
+
+        levels = self.levels
+        return [index for index in indices if levels[index] == code]
+
+    def indices_with_keyword(self, keyword: str, case_sensitive: bool = False) -> list[int]:
+        """메시지에 키워드를 포함한 엔트리의 인덱스 목록"""
+        if not case_sensitive:
+            keyword_lower = keyword.lower()
+            return [index for index in range(len(self))
+                    if keyword_lower in self.message_of(index).lower()]
+
+        # 대소문자 구분 검색은 공유 버퍼에서 바로 찾고 오프셋으로 엔트리를 역추적
+        needle = keyword.encode('utf-8')
+        buffer = self.message_buffer
+        offsets = self.message_offsets
+        indices = []
+
+        if not needle:
+            return list(range(len(self)))
+
+        position = buffer.find(needle)
+        while position != -1:
+            index = bisect_right(offsets, position) - 1
+            message_end = offsets[index + 1]
+
+            # 메시지 경계에 걸친 매치는 무시
+            if position + len(needle) <= message_end:
+                indices.append(index)
+
+            # 같은 메시지 안의 나머지 매치는 건너뛰고 다음 메시지부터 재탐색
+            position = buffer.find(needle, message_end)
+
+        return indices
+
+
+def _encode_strings(strings: dict[int, str]) -> tuple[array, array, bytes]:
+    """인덱스 → 문자열 dict를 (인덱스 배열, 오프셋 배열, UTF-8 버퍼)로 변환"""
+    indices = array('q', strings.keys())
+    encoded = [value.encode('utf-8') for value in strings.values()]
+    offsets = array('q', [0])
+    total = 0
+    for value in encoded:
+        total += len(value)
+        offsets.append(total)
+    return indices, offsets, b''.join(encoded)
+
+
+def _decode_strings(indices, offsets, text) -> dict[int, str]:
+    """_encode_strings()의 역변환"""
+    text = bytes(text)
+    return {index: text[offsets[i]:offsets[i + 1]].decode('utf-8') for i, index in enumerate(indices)}
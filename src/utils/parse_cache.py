@@ -0,0 +1,254 @@
+"""Parse Cache - 파싱된 로그의 디스크 캐시"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Iterable, TypedDict
+
+from src.utils.log_store import LogStore
+
+
+# 캐시 파일 형식 버전 (레이아웃이나 파싱 결과가 바뀌면 올려서 기존 캐시를 무효화)
+CACHE_FORMAT_VERSION = 1
+
+# 캐시 디렉터리와 최대 크기 (환경 변수로 변경 가능)
+DEFAULT_CACHE_DIR = Path(os.getenv(
+    "LOG_CACHE_DIR", Path(__file__).resolve().parents[2] / ".cache" / "parsed_logs"
+))
+DEFAULT_CACHE_MAX_BYTES = int(os.getenv("LOG_CACHE_MAX_BYTES", str(1024 ** 3)))
+
+# 내용 해시를 계산할 때 한 번에 읽는 크기
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+_MAGIC = b'LOGCACHE'
+_HEADER_LENGTH = struct.Struct('<Q')
+# 섹션 시작 위치 정렬 (int64/float64 컬럼을 그대로 cast 할 수 있도록)
+_ALIGNMENT = 8
+
+
+class CachedParse(TypedDict):
+    """캐시에서 읽은 파싱 결과"""
+    logs: LogStore  # mmap 위의 읽기 전용 LogStore (추가하면 그때 메모리로 복사)
+    statistics: dict
+    log_format: str  # 파싱에 사용된 로그 포맷 이름
+
+
+class ParseCache:
+    """파싱된 LogStore와 통계를 파일 단위로 저장하고 다시 여는 디스크 캐시
+
+    캐시 항목 하나는 두 파일로 이루어진다.
+    - <key>.cols: 헤더(JSON: 섹션 위치, 타입 코드, 통계) + 8바이트 정렬된 컬럼 섹션들
+    - <key>.msg: 메시지 UTF-8 버퍼
+
+    읽을 때는 두 파일을 mmap 하고 컬럼을 memoryview로 cast 하므로, 로그 크기와 무관하게
+    역직렬화 비용 없이 바로 조회할 수 있다. 실제로 읽은 페이지만 메모리에 올라간다.
+
+    키는 입력 파일의 (절대 경로, 크기, 수정 시각) 또는 content_hash=True면 내용 해시와
+    파서 옵션으로 만든다. 업로드처럼 같은 내용이 매번 다른 경로로 들어오는 경우 content_hash를 쓴다.
+
+    전체 크기가 max_bytes를 넘으면 가장 오래 쓰이지 않은 항목부터 지운다 (LRU, 파일 수정 시각 기준).
+
+    예시:
+        cache = ParseCache()
+        parser = LogParserAgent(cache=cache)
+        parser.parse_file("app-out.log")  # 첫 호출: 파싱 후 저장
+        parser.parse_file("app-out.log")  # 두 번째 호출: 캐시에서 mmap으로 로드
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None, max_bytes: int | None = None,
+                 content_hash: bool = False):
+        """
+        Args:
+            cache_dir: 캐시 디렉터리 (None이면 LOG_CACHE_DIR 또는 프로젝트의 .cache/parsed_logs)
+            max_bytes: 캐시 전체 최대 크기 (None이면 LOG_CACHE_MAX_BYTES 또는 1GiB)
+            content_hash: True면 파일 경로/수정 시각 대신 내용 해시로 키 생성
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+        self.max_bytes = DEFAULT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.content_hash = content_hash
+
+    def key(self, paths: Iterable[str | Path], options: dict) -> str:
+        """입력 파일과 파서 옵션으로 캐시 키 생성
+
+        Args:
+            paths: 입력 파일 목록 (병합 순서대로)
+            options: 파싱 결과에 영향을 주는 파서 옵션 (JSON 직렬화 가능해야 함)
+        """
+        files = []
+        for path in paths:
+            path = Path(path)
+            stat = path.stat()
+            if self.content_hash:
+                files.append([stat.st_size, self._hash_file(path)])
+            else:
+                files.append([str(path.resolve()), stat.st_size, stat.st_mtime_ns])
+
+        payload = json.dumps({'version': CACHE_FORMAT_VERSION, 'files': files, 'options': options},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def load(self, key: str) -> CachedParse | None:
+        """캐시 항목을 mmap으로 열기 (없거나 손상되었으면 None, 손상된 항목은 삭제)"""
+        columns_path, message_path = self._paths(key)
+        if not columns_path.exists():
+            return None
+
+        try:
+            with open(columns_path, 'rb') as f:
+                columns_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            if columns_map[:len(_MAGIC)] != _MAGIC:
+                raise ValueError("캐시 파일 형식이 아닙니다")
+            header_start = len(_MAGIC) + _HEADER_LENGTH.size
+            (header_length,) = _HEADER_LENGTH.unpack_from(columns_map, len(_MAGIC))
+            header = json.loads(columns_map[header_start:header_start + header_length])
+            if header['version'] != CACHE_FORMAT_VERSION:
+                raise ValueError("캐시 파일 버전이 다릅니다")
+
+            view = memoryview(columns_map)
+            data_start = _align(header_start + header_length)
+            buffers = {}
+            for name, (offset, length) in header['sections'].items():
+                start = data_start + offset
+                if start + length > len(columns_map):
+                    raise ValueError(f"캐시 섹션이 잘렸습니다: {name}")
+                buffers[name] = view[start:start + length]
+
+            buffers['message_buffer'] = self._map_messages(message_path, header['message_length'])
+            store = LogStore.from_buffers(header['store'], buffers)
+        except (OSError, ValueError, KeyError, TypeError, struct.error):
+            self._remove(key)
+            return None
+
+        # LRU 판단용으로 마지막 사용 시각 갱신
+        os.utime(columns_path)
+
+        return CachedParse(logs=store, statistics=header['statistics'], log_format=header['log_format'])
+
+    def save(self, key: str, store: LogStore, statistics: dict, log_format: str) -> None:
+        """파싱 결과를 캐시에 저장하고 크기 제한을 넘으면 오래된 항목 삭제
+
+        임시 파일에 쓴 뒤 이름을 바꾸므로 동시에 읽는 프로세스가 반쯤 쓰인 파일을 보지 않는다.
+        메시지 파일을 먼저 쓰고 컬럼 파일을 나중에 쓰므로, 컬럼 파일이 있으면 항목이 완성된 것이다.
+        캐시는 최적화일 뿐이므로 디스크 오류로 저장하지 못하면 조용히 건너뛴다.
+        """
+        columns_path, message_path = self._paths(key)
+
+        meta, buffers = store.to_buffers()
+        message_buffer = buffers.pop('message_buffer')
+
+        sections = {}
+        offset = 0
+        for name, buffer in buffers.items():
+            length = memoryview(buffer).nbytes
+            sections[name] = [offset, length]
+            offset = _align(offset + length)
+
+        header = json.dumps({
+            'version': CACHE_FORMAT_VERSION,
+            'store': meta,
+            'statistics': statistics,
+            'log_format': log_format,
+            'message_length': len(message_buffer),
+            'sections': sections,
+        }, ensure_ascii=False).encode('utf-8')
+
+        header_end = len(_MAGIC) + _HEADER_LENGTH.size + len(header)
+        parts = [_MAGIC, _HEADER_LENGTH.pack(len(header)), header, bytes(_align(header_end) - header_end)]
+        for name, buffer in buffers.items():
+            length = sections[name][1]
+            parts.append(buffer)
+            parts.append(bytes(_align(length) - length))
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._write_atomic(message_path, [message_buffer])
+            self._write_atomic(columns_path, parts)
+        except OSError:
+            self._remove(key)
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        """전체 크기가 max_bytes 이하가 될 때까지 가장 오래 쓰이지 않은 항목 삭제"""
+        if not self.cache_dir.exists():
+            return
+
+        entries = []
+        total = 0
+        for columns_path in self.cache_dir.glob('*.cols'):
+            key = columns_path.stem
+            try:
+                stat = columns_path.stat()
+                size = stat.st_size
+                message_path = self._paths(key)[1]
+                if message_path.exists():
+                    size += message_path.stat().st_size
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, key, size))
+            total += size
+
+        for _, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= size
+
+    def clear(self) -> None:
+        """캐시 항목 전체 삭제"""
+        if not self.cache_dir.exists():
+            return
+        for path in list(self.cache_dir.glob('*.cols')) + list(self.cache_dir.glob('*.msg')):
+            path.unlink(missing_ok=True)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f"{key}.cols", self.cache_dir / f"{key}.msg"
+
+    def _remove(self, key: str) -> None:
+        # 컬럼 파일을 먼저 지워 메시지 파일만 남은 항목이 완성된 것으로 보이지 않게 함
+        for path in self._paths(key):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _map_messages(message_path: Path, length: int) -> bytes | mmap.mmap:
+        with open(message_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size != length:
+                raise ValueError("메시지 파일 크기가 헤더와 다릅니다")
+            # 빈 파일은 mmap 할 수 없음
+            if size == 0:
+                return b''
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _write_atomic(path: Path, parts: list) -> None:
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_path, 'wb') as f:
+                for part in parts:
+                    f.write(part)
+            os.replace(temp_path, path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, 'rb') as f:
+            while block := f.read(_HASH_BLOCK_SIZE):
+                digest.update(block)
+        return digest.hexdigest()
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
@@ -0,0 +1,332 @@
+"""Request Fields - HTTP 요청 로그의 구조화 필드 추출 및 집계"""
+
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from bisect import bisect_left
+from typing import TypedDict
+
+
+class RequestFields(TypedDict):
+    """로그 메시지에서 추출한 구조화 필드 (없는 값은 None)"""
+    method: str | None
+    path: str | None
+    status: int | None
+    latency_ms: float | None
+    user: str | None
+    ip: str | None
+    query: str | None
+
+
+class EndpointMetrics(TypedDict):
+    """엔드포인트별 응답 시간/상태 코드 집계"""
+    endpoint: str  # 예: GET /api/posts/:id
+    requests: int  # 상태 코드 또는 응답 시간이 기록된 (완료된) 요청 수
+    p50_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+    max_ms: float | None
+    status_counts: dict[int, int]
+
+
+class RequestFieldExtractor:
+    """HTTP 요청 라인에서 필드를 뽑는 추출기 (정규식은 클래스 로드 시 한 번만 컴파일)
+
+    지원 형식:
+    - GET /api/posts?page=1 200 - 45ms - User: user123
+    - POST /login - IP: 192.168.1.10 - admin@example.com
+    - Executed query: SELECT * FROM comment WHERE postId = 12
+
+    요청 라인은 메시지 맨 앞의 HTTP 메서드로만 인식하므로,
+    "Slow query detected: GET /api/posts - 1234ms" 같은 부가 경고가 요청으로 중복 집계되지 않는다.
+    """
+
+    REQUEST_PATTERN = re.compile(
+        r'^(?P<method>GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS)\s+(?P<path>/\S*)'
+        r'(?:\s+(?P<status>[1-5]\d\d)\b)?'
+        r'(?:\s+-\s+(?P<latency>\d+(?:\.\d+)?)ms\b)?'
+    )
+    USER_PATTERN = re.compile(r'\bUser:\s*(?P<user>[^\s()]+)')
+    EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+    IP_PATTERN = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b')
+    QUERY_PATTERN = re.compile(r'\b[Qq]uery:\s*(?P<query>(?:SELECT|INSERT|UPDATE|DELETE|WITH)\b.*)$')
+
+    def extract(self, message: str) -> RequestFields | None:
+        """메시지에서 필드 추출 (아무 필드도 없으면 None)"""
+        method = path = user = ip = query = None
+        status = latency_ms = None
+
+        match = self.REQUEST_PATTERN.match(message)
+        if match:
+            method = match.group('method')
+            path = match.group('path')
+            if match.group('status'):
+                status = int(match.group('status'))
+            if match.group('latency'):
+                latency_ms = float(match.group('latency'))
+
+        match = self.USER_PATTERN.search(message)
+        if match:
+            user = match.group('user')
+        elif method is not None:
+            # 로그인 요청처럼 사용자 대신 이메일만 남는 경우
+            match = self.EMAIL_PATTERN.search(message)
+            if match:
+                user = match.group(0)
+
+        match = self.IP_PATTERN.search(message)
+        if match:
+            ip = match.group(0)
+
+        if method is None:
+            match = self.QUERY_PATTERN.search(message)
+            if match:
+                query = match.group('query')
+
+        if method is None and user is None and ip is None and query is None:
+            return None
+
+        return RequestFields(
+            method=method,
+            path=path,
+            status=status,
+            latency_ms=latency_ms,
+            user=user,
+            ip=ip,
+            query=query
+        )
+
+
+def normalize_endpoint(method: str, path: str) -> str:
+    """메서드와 경로를 엔드포인트 키로 정규화
+
+    쿼리 문자열을 떼고 숫자가 들어간 경로 조각은 :id로 바꾼다.
+    예시: ("GET", "/api/posts/15?x=1") → "GET /api/posts/:id"
+    """
+    path = path.split('?', 1)[0]
+    segments = [':id' if any(ch.isdigit() for ch in segment) else segment
+                for segment in path.split('/')]
+    return f"{method} {'/'.join(segments)}"
+
+
+def percentile(sorted_values: list[float], p: float) -> float | None:
+    """정렬된 값의 p 백분위수 (nearest-rank 방식, 항상 실제 관측값을 반환)"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class _InternedColumn:
+    """반복이 많은 문자열 컬럼 (고유 값 테이블 + int32 코드, -1은 None)"""
+
+    __slots__ = ('values', 'codes', 'data')
+
+    def __init__(self):
+        self.values: list[str] = []
+        self.codes: dict[str, int] = {}
+        self.data = array('i')
+
+    def append(self, value: str | None) -> None:
+        self.data.append(-1 if value is None else self._code(value))
+
+    def get(self, row: int) -> str | None:
+        code = self.data[row]
+        return None if code < 0 else self.values[code]
+
+    def extend(self, other: _InternedColumn) -> None:
+        remap = [self._code(value) for value in other.values]
+        self.data.extend(-1 if code < 0 else remap[code] for code in other.data)
+
+    def thaw(self) -> None:
+        """읽기 전용 버퍼(memoryview)로 열린 코드 배열을 쓰기 가능한 배열로 복사"""
+        if not isinstance(self.data, array):
+            data = array('i')
+            data.frombytes(memoryview(self.data).cast('B'))
+            self.data = data
+
+    def _code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class RequestTable:
+    """추출된 필드를 컬럼 단위로 보관하는 희소 테이블
+
+    필드가 있는 엔트리만 한 행을 차지하며, entry_indices로 LogStore의 인덱스와 연결된다.
+    - 문자열 필드 (method, path, user, ip, query): 고유 값 테이블 + 코드 배열
+    - status: uint16 (0은 없음)
+    - latency_ms: float64 (NaN은 없음)
+    """
+
+    NO_STATUS = 0
+
+    # 배열 컬럼 이름 → array 타입 코드
+    COLUMN_TYPES = {'entry_indices': 'I', 'statuses': 'H', 'latencies': 'd'}
+    STRING_COLUMNS = ('methods', 'paths', 'users', 'ips', 'queries')
+
+    def __init__(self):
+        self.entry_indices = array('I')
+        self.methods = _InternedColumn()
+        self.paths = _InternedColumn()
+        self.users = _InternedColumn()
+        self.ips = _InternedColumn()
+        self.queries = _InternedColumn()
+        self.statuses = array('H')
+        self.latencies = array('d')
+
+    def __len__(self) -> int:
+        return len(self.entry_indices)
+
+    def to_buffers(self) -> tuple[dict, dict[str, memoryview]]:
+        """컬럼을 (JSON 직렬화 가능한 메타데이터, 이름 → 바이트 버퍼)로 내보냄"""
+        columns = dict(self.COLUMN_TYPES)
+        buffers = {name: memoryview(getattr(self, name)).cast('B') for name in self.COLUMN_TYPES}
+        values = {}
+        for name in self.STRING_COLUMNS:
+            column = getattr(self, name)
+            buffers[name] = memoryview(column.data).cast('B')
+            columns[name] = 'i'
+            values[name] = column.values
+        return {'columns': columns, 'values': values}, buffers
+
+    @classmethod
+    def from_buffers(cls, meta: dict, buffers: dict) -> RequestTable:
+        """to_buffers()의 결과로 복원 (배열은 복사 없이 memoryview로 사용)"""
+        table = cls()
+        columns = meta['columns']
+        for name in cls.COLUMN_TYPES:
+            setattr(table, name, memoryview(buffers[name]).cast('B').cast(columns[name]))
+        for name in cls.STRING_COLUMNS:
+            column = getattr(table, name)
+            column.values = list(meta['values'][name])
+            column.codes = {value: code for code, value in enumerate(column.values)}
+            column.data = memoryview(buffers[name]).cast('B').cast('i')
+        return table
+
+    def thaw(self) -> None:
+        """읽기 전용 버퍼로 열린 컬럼을 쓰기 가능한 배열로 복사"""
+        for name, code in self.COLUMN_TYPES.items():
+            if not isinstance(getattr(self, name), array):
+                column = array(code)
+                column.frombytes(memoryview(getattr(self, name)).cast('B'))
+                setattr(self, name, column)
+        for name in self.STRING_COLUMNS:
+            getattr(self, name).thaw()
+
+    def add(self, entry_index: int, fields: RequestFields) -> None:
+        """엔트리 하나의 필드를 행으로 추가 (entry_index는 오름차순이어야 함)"""
+        self.entry_indices.append(entry_index)
+        self.methods.append(fields['method'])
+        self.paths.append(fields['path'])
+        self.users.append(fields['user'])
+        self.ips.append(fields['ip'])
+        self.queries.append(fields['query'])
+        self.statuses.append(self.NO_STATUS if fields['status'] is None else fields['status'])
+        self.latencies.append(math.nan if fields['latency_ms'] is None else fields['latency_ms'])
+
+    def extend_table(self, other: RequestTable, base: int) -> None:
+        """뒤따르는 구간의 테이블을 이어 붙임 (other의 엔트리 인덱스에 base를 더함)"""
+        self.entry_indices.extend(index + base for index in other.entry_indices)
+        self.methods.extend(other.methods)
+        self.paths.extend(other.paths)
+        self.users.extend(other.users)
+        self.ips.extend(other.ips)
+        self.queries.extend(other.queries)
+        self.statuses.extend(other.statuses)
+        self.latencies.extend(other.latencies)
+
+    def row(self, row: int) -> RequestFields:
+        status = self.statuses[row]
+        latency_ms = self.latencies[row]
+        return RequestFields(
+            method=self.methods.get(row),
+            path=self.paths.get(row),
+            status=None if status == self.NO_STATUS else status,
+            latency_ms=None if math.isnan(latency_ms) else latency_ms,
+            user=self.users.get(row),
+            ip=self.ips.get(row),
+            query=self.queries.get(row)
+        )
+
+    def fields_of(self, entry_index: int) -> RequestFields | None:
+        """LogStore 인덱스에 해당하는 필드 (필드가 없는 엔트리면 None)"""
+        row = bisect_left(self.entry_indices, entry_index)
+        if row < len(self.entry_indices) and self.entry_indices[row] == entry_index:
+            return self.row(row)
+        return None
+
+    def endpoint_metrics(self) -> list[EndpointMetrics]:
+        """엔드포인트별 p50/p95/p99 응답 시간과 상태 코드 분포 (요청 수 내림차순)
+
+        상태 코드나 응답 시간이 없는 요청 시작 라인은 완료된 요청이 아니므로 제외한다.
+        """
+        latencies: dict[str, list[float]] = {}
+        status_counts: dict[str, dict[int, int]] = {}
+        requests: dict[str, int] = {}
+        endpoints: dict[tuple[int, int], str] = {}
+
+        methods = self.methods
+        paths = self.paths
+        for row in range(len(self)):
+            method_code = methods.data[row]
+            status = self.statuses[row]
+            latency_ms = self.latencies[row]
+            if method_code < 0 or (status == self.NO_STATUS and math.isnan(latency_ms)):
+                continue
+
+            # 같은 (메서드, 경로) 조합은 정규화 결과를 재사용
+            key = (method_code, paths.data[row])
+            endpoint = endpoints.get(key)
+            if endpoint is None:
+                endpoint = endpoints[key] = normalize_endpoint(methods.values[key[0]],
+                                                               paths.values[key[1]])
+
+            requests[endpoint] = requests.get(endpoint, 0) + 1
+            if not math.isnan(latency_ms):
+                latencies.setdefault(endpoint, []).append(latency_ms)
+            if status != self.NO_STATUS:
+                counts = status_counts.setdefault(endpoint, {})
+                counts[status] = counts.get(status, 0) + 1
+
+        metrics = []
+        for endpoint, count in sorted(requests.items(), key=lambda item: item[1], reverse=True):
+            values = sorted(latencies.get(endpoint, []))
+            metrics.append(EndpointMetrics(
+                endpoint=endpoint,
+                requests=count,
+                p50_ms=percentile(values, 50),
+                p95_ms=percentile(values, 95),
+                p99_ms=percentile(values, 99),
+                max_ms=values[-1] if values else None,
+                status_counts=dict(sorted(status_counts.get(endpoint, {}).items()))
+            ))
+
+        return metrics
+
+
+def format_endpoint_metrics(metrics: list[EndpointMetrics], limit: int = 20) -> str:
+    """엔드포인트 메트릭을 LLM 프롬프트용 표로 포맷팅 (요청 수 상위 limit개)"""
+    if not metrics:
+        return "요청 메트릭이 없습니다."
+
+    def ms(value: float | None) -> str:
+        return '-' if value is None else f"{value:g}ms"
+
+    lines = ["엔드포인트 | 요청 수 | p50 | p95 | p99 | 최대 | 상태 코드"]
+    for metric in metrics[:limit]:
+        statuses = ', '.join(f"{status}: {count}" for status, count in metric['status_counts'].items()) or '-'
+        lines.append(
+            f"{metric['endpoint']} | {metric['requests']} | {ms(metric['p50_ms'])} | "
+            f"{ms(metric['p95_ms'])} | {ms(metric['p99_ms'])} | {ms(metric['max_ms'])} | {statuses}"
+        )
+
+    if len(metrics) > limit:
+        lines.append(f"... (외 {len(metrics) - limit}개 엔드포인트)")
+
+    return "\n".join(lines)
@@ -0,0 +1,187 @@
+"""Template Miner - Drain 방식의 온라인 로그 템플릿 추출"""
+
+from __future__ import annotations
+
+import re
+from typing import TypedDict
+
+
+class TemplateMatch(TypedDict):
+    """메시지 하나에 대한 템플릿 매칭 결과"""
+    template_id: int
+    template: str
+    parameters: list[str]  # 템플릿의 <*> 위치에 들어간 실제 값
+
+
+class LogTemplate(TypedDict):
+    """추출된 템플릿 정보"""
+    template_id: int
+    template: str
+    count: int
+
+
+class LogCluster:
+    """같은 템플릿으로 묶인 메시지 그룹"""
+
+    __slots__ = ('cluster_id', 'tokens', 'count')
+
+    def __init__(self, cluster_id: int, tokens: list[str]):
+        self.cluster_id = cluster_id
+        self.tokens = tokens
+        self.count = 0
+
+    @property
+    def template(self) -> str:
+        return ' '.join(self.tokens)
+
+
+class TemplateMiner:
+    """Drain 알고리즘 기반 온라인 템플릿 마이너
+
+    고정 깊이 파스 트리로 후보 클러스터를 빠르게 좁힌다.
+    - 1단계: 토큰 수
+    - 2단계 ~ depth단계: 앞쪽 토큰 (숫자가 들어간 토큰은 와일드카드 노드로)
+    - 리프: 클러스터 목록, 토큰 유사도가 similarity_threshold 이상인 것 중 가장 비슷한 클러스터에 합류
+
+    합류할 때 서로 다른 위치는 <*>로 일반화되며, 클러스터 ID는 템플릿이 바뀌어도 유지된다.
+    메시지를 한 번씩만 보면 되므로 수백만 라인도 한 번의 순회로 템플릿별 건수를 얻을 수 있다.
+
+    참고: He et al., "Drain: An Online Log Parsing Approach with Fixed Depth Tree" (ICWS 2017)
+    """
+
+    WILDCARD = '<*>'
+    DIGIT_PATTERN = re.compile(r'\d')
+
+    def __init__(self, depth: int = 4, similarity_threshold: float = 0.5, max_children: int = 100):
+        """
+        Args:
+            depth: 파스 트리 깊이 (루트/토큰 수 노드 포함, 최소 3)
+            similarity_threshold: 클러스터에 합류하기 위한 최소 토큰 유사도
+            max_children: 노드당 최대 자식 수 (넘치면 와일드카드 노드로 보냄)
+        """
+        if depth < 3:
+            raise ValueError("depth는 3 이상이어야 합니다")
+
+        self.depth = depth
+        self.similarity_threshold = similarity_threshold
+        self.max_children = max_children
+
+        self.root: dict = {}
+        self.clusters: list[LogCluster] = []
+
+    def add(self, message: str) -> TemplateMatch:
+        """메시지를 학습하고 소속 템플릿과 파라미터를 반환"""
+        tokens = self._tokenize(message)
+        cluster = self._search(tokens)
+
+        if cluster is None:
+            cluster = LogCluster(len(self.clusters), self._mask(tokens))
+            self.clusters.append(cluster)
+            self._insert(cluster)
+        else:
+            # 서로 다른 토큰 위치를 와일드카드로 일반화
+            template = cluster.tokens
+            for position, token in enumerate(tokens):
+                if template[position] != token:
+                    template[position] = self.WILDCARD
+
+        cluster.count += 1
+
+        return TemplateMatch(
+            template_id=cluster.cluster_id,
+            template=cluster.template,
+            parameters=self._parameters(cluster, tokens)
+        )
+
+    def match(self, message: str) -> LogCluster | None:
+        """학습 없이 메시지가 속할 클러스터 조회"""
+        return self._search(self._tokenize(message))
+
+    def template_of(self, message: str) -> str:
+        """메시지의 현재 템플릿 문자열 (매칭되는 클러스터가 없으면 마스킹한 메시지)"""
+        tokens = self._tokenize(message)
+        cluster = self._search(tokens)
+        if cluster is None:
+            return ' '.join(self._mask(tokens))
+        return cluster.template
+
+    def extract_parameters(self, template_id: int, message: str) -> list[str]:
+        """현재 템플릿 기준으로 메시지에서 파라미터 추출"""
+        return self._parameters(self.clusters[template_id], self._tokenize(message))
+
+    def templates(self) -> list[LogTemplate]:
+        """추출된 템플릿 목록 (건수 내림차순)"""
+        return [
+            LogTemplate(template_id=cluster.cluster_id, template=cluster.template, count=cluster.count)
+            for cluster in sorted(self.clusters, key=lambda c: c.count, reverse=True)
+        ]
+
+    @staticmethod
+    def _tokenize(message: str) -> list[str]:
+        """첫 줄만 토큰화 (여러 줄 메시지의 스택 트레이스는 템플릿에서 제외)"""
+        return message.split('\n', 1)[0].split()
+
+    def _parameters(self, cluster: LogCluster, tokens: list[str]) -> list[str]:
+        return [token for token, template_token in zip(tokens, cluster.tokens)
+                if template_token == self.WILDCARD]
+
+    def _mask(self, tokens: list[str]) -> list[str]:
+        """숫자가 들어간 토큰은 처음부터 와일드카드로 취급"""
+        return [self.WILDCARD if self.DIGIT_PATTERN.search(token) else token for token in tokens]
+
+    def _path(self, tokens: list[str]) -> list[str]:
+        """트리 탐색 경로 키 (토큰 수 + 앞쪽 토큰들)"""
+        path = [str(len(tokens))]
+        for token in tokens[:self.depth - 2]:
+            path.append(self.WILDCARD if self.DIGIT_PATTERN.search(token) else token)
+        return path
+
+    def _search(self, tokens: list[str]) -> LogCluster | None:
+        node = self.root
+        for key in self._path(tokens):
+            child = node.get(key)
+            if child is None:
+                child = node.get(self.WILDCARD)
+                if child is None:
+                    return None
+            node = child
+
+        # 숫자 토큰은 템플릿과 마찬가지로 <*>로 바꿔 비교해야 같은 자리의 값 차이가 유사도를 깎지 않음
+        masked = self._mask(tokens)
+        best = None
+        best_similarity = -1.0
+        best_wildcards = -1
+        for cluster in node.get('', ()):
+            similarity, wildcards = self._similarity(cluster.tokens, masked)
+            if similarity > best_similarity or (similarity == best_similarity and wildcards > best_wildcards):
+                best, best_similarity, best_wildcards = cluster, similarity, wildcards
+
+        if best is not None and best_similarity >= self.similarity_threshold:
+            return best
+        return None
+
+    def _similarity(self, template: list[str], tokens: list[str]) -> tuple[float, int]:
+        if not tokens:
+            return 1.0, 0
+
+        same = 0
+        wildcards = 0
+        for template_token, token in zip(template, tokens):
+            if template_token == token:
+                same += 1
+            elif template_token == self.WILDCARD:
+                wildcards += 1
+        return same / len(tokens), wildcards
+
+    def _insert(self, cluster: LogCluster) -> None:
+        node = self.root
+        for level, key in enumerate(self._path(cluster.tokens)):
+            child = node.get(key)
+            if child is None:
+                # 자식이 너무 많으면 와일드카드 노드로 모아 트리 폭을 제한 (토큰 수 노드는 제외)
+                if level > 0 and key != self.WILDCARD and len(node) >= self.max_children:
+                    key = self.WILDCARD
+                child = node.setdefault(key, {})
+            node = child
+
+        node.setdefault('', []).append(cluster)
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # UTF-8 출력 설정
@@ -18,6 +21,8 @@ from src.agents.classifier import ClassificationAgent
 from src.agents.infrastructure_analyst import InfrastructureAnalystAgent
 from src.agents.security_analyst import SecurityAnalystAgent
 from src.agents.performance_analyst import PerformanceAnalystAgent
+from src.agents.registry import AgentRegistry
+from langchain_core.language_models import FakeListChatModel
 
 
 def test_full_pipeline_infrastructure():
@@ -232,12 +237,99 @@ def test_detailed_performance_output():
     print(f"  {analysis['estimated_improvement'][:150]}...")
 
 
+def test_async_analysts():
+    """aanalyze()가 analyze()와 같은 결과를 내는지 검증 (LLM API 호출 없음)"""
+    print("\n=== 비동기 분석 API ===")
+
+    test_file = project_root / "datasets/scenario-03-n-plus-one-query/dataset-01.log"
+    if not test_file.exists():
+        print(f"[SKIP] 테스트 파일이 없습니다: {test_file}")
+        return
+
+    parser = LogParserAgent(extract_fields=True)
+    parser.parse_file(test_file)
+    log_data = parser.format_for_llm()
+    classification = {'category': 'performance', 'severity': 'medium', 'key_indicators': ['N+1']}
+
+    responses = {
+        InfrastructureAnalystAgent: {'issue_type': 'Database Overload', 'urgency': 'urgent'},
+        SecurityAnalystAgent: {'attack_type': 'None', 'severity': 'low'},
+        PerformanceAnalystAgent: {'performance_issue': 'N+1 Query', 'quick_wins': ['eager loading']},
+    }
+
+    async def analyze_all():
+        analysts = [agent_class(llm=FakeListChatModel(responses=[f"```json\n{json.dumps(response)}\n```"]))
+                    for agent_class, response in responses.items()]
+        kwargs = [{}, {}, {'request_metrics': parser.get_request_metrics()}]
+        async_results = await asyncio.gather(*(
+            analyst.aanalyze(log_data, classification, **extra) for analyst, extra in zip(analysts, kwargs)
+        ))
+        sync_results = [analyst.analyze(log_data, classification, **extra) for analyst, extra in zip(analysts, kwargs)]
+        return async_results, sync_results
+
+    async_results, sync_results = asyncio.run(analyze_all())
+
+    for (agent_class, response), result, sync_result in zip(responses.items(), async_results, sync_results):
+        assert result == sync_result, f"{agent_class.__name__}: 동기/비동기 결과가 다름"
+        for key, value in response.items():
+            assert result[key] == value, f"{agent_class.__name__}.{key}: {result[key]}"
+        print(f"✓ {agent_class.__name__}.aanalyze: {next(iter(response.values()))}")
+
+
+def test_agent_registry():
+    """에이전트 레지스트리의 지연 생성과 공유 검증 (LLM API 호출 없음)"""
+    print("\n=== 에이전트 레지스트리 ===")
+
+    created = []
+
+    def factory(agent_class):
+        def create():
+            created.append(agent_class.__name__)
+            return agent_class(llm=FakeListChatModel(responses=["{}"]))
+        return create
+
+    registry = AgentRegistry({
+        'classifier': factory(ClassificationAgent),
+        'infrastructure': factory(InfrastructureAnalystAgent),
+        'security': factory(SecurityAnalystAgent),
+        'performance': factory(PerformanceAnalystAgent),
+    })
+    assert not created, "에이전트는 처음 요청할 때 만들어야 합니다"
+
+    # 여러 스레드가 동시에 요청해도 에이전트는 하나만 생성
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        classifiers = list(executor.map(lambda _: registry.classifier, range(32)))
+    assert len({id(classifier) for classifier in classifiers}) == 1
+    assert created == ['ClassificationAgent']
+    print("✓ 동시 요청 32건에도 분류 에이전트 1개 생성")
+
+    assert registry.analyst_for('security') is registry.security
+    assert registry.analyst_for('performance') is registry.performance
+    for category in ('infrastructure', 'application', 'user', 'unknown'):
+        assert registry.analyst_for(category) is registry.infrastructure
+    assert sorted(created) == sorted(['ClassificationAgent', 'InfrastructureAnalystAgent',
+                                      'SecurityAnalystAgent', 'PerformanceAnalystAgent'])
+    print("✓ 카테고리별 분석 에이전트 조회 (application/user → infrastructure)")
+
+    try:
+        registry.get('database')
+        raise AssertionError("등록되지 않은 에이전트는 KeyError여야 합니다")
+    except KeyError:
+        pass
+
+    registry.clear()
+    assert registry.classifier is not classifiers[0]
+    print("✓ clear() 후 새로 생성")
+
+
 if __name__ == "__main__":
     try:
         print("All Analyst Agents 통합 테스트 시작\n")
         print("⚠️  이 테스트는 LLM API를 호출합니다.")
         print("⚠️  .env 파일에 API 키가 설정되어 있어야 합니다.\n")
 
+        test_async_analysts()
+        test_agent_registry()
         test_full_pipeline_infrastructure()
         test_full_pipeline_security()
         test_full_pipeline_performance()
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import sys
+import tempfile
+import time
 from pathlib import Path
 
 # UTF-8 출력 설정
@@ -13,8 +16,13 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from langchain_core.language_models import FakeListChatModel
+
 from src.agents.classifier import ClassificationAgent
 from src.agents.log_parser import LogParserAgent
+from src.utils.classification_rules import RuleClassifier
+from src.utils.incident_memory import IncidentMemory, build_fingerprint
+from src.utils.llm_cache import LLMResponseCache
 
 
 def test_db_connection_failure():
@@ -183,12 +191,264 @@ def test_classification_result_structure():
     print(f"  주요 지표 개수: {len(result['key_indicators'])}개")
 
 
+def test_response_cache():
+    """동일 프롬프트 응답 캐시 검증 (LLM API 호출 없음)"""
+    print("\n=== Test 5: LLM 응답 캐시 ===")
+
+    response = ('{"category": "infrastructure", "confidence": "high", "reason": "DB 연결 실패", '
+                '"severity": "critical", "key_indicators": ["ECONNREFUSED"]}')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = LLMResponseCache(Path(tmp_dir) / "llm.sqlite3", max_entries=2)
+        # API 대신 정해진 응답을 돌려주는 가짜 모델 주입
+        classifier = ClassificationAgent(llm=FakeListChatModel(responses=[response], cache=cache))
+
+        first = classifier.classify("[2026-01-05 03:14:55] ERROR connect ECONNREFUSED")
+        start = time.perf_counter()
+        second = classifier.classify("[2026-01-05 03:14:55] ERROR connect ECONNREFUSED")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        assert first == second and first['category'] == 'infrastructure'
+        assert cache.hits == 1 and cache.misses == 1
+        print(f"✓ 같은 로그 재분류: 캐시 적중 ({elapsed_ms:.1f}ms)")
+
+        # 프롬프트가 다르면 캐시를 쓰지 않음
+        classifier.llm = FakeListChatModel(responses=[response, response], cache=cache)
+        classifier.classify("[2026-01-05 03:14:56] ERROR other error")
+        assert cache.misses == 2
+
+        # 최대 항목 수 초과 시 가장 오래 쓰이지 않은 항목 삭제
+        classifier.classify("[2026-01-05 03:14:57] ERROR third error")
+        assert len(cache) == 2
+        print(f"✓ 최대 항목 수 유지: {len(cache)}개")
+
+        # 유효 기간이 지난 응답은 버림
+        cache.ttl_seconds = 0
+        time.sleep(0.01)
+        classifier.llm = FakeListChatModel(responses=[response], cache=cache)
+        classifier.classify("[2026-01-05 03:14:57] ERROR third error")
+        assert cache.misses == 4
+        print("✓ 만료된 응답은 다시 호출")
+        cache.close()
+
+
+def test_incident_memory():
+    """유사 인시던트 재사용 검증 (LLM API 호출 없음)"""
+    print("\n=== Test 6: 유사 인시던트 메모리 ===")
+
+    db_file = project_root / "datasets/scenario-01-db-connection-failure/dataset-01.log"
+    xss_file = project_root / "datasets/scenario-02-xss-attack/dataset-01.log"
+
+    if not db_file.exists() or not xss_file.exists():
+        print(f"[SKIP] 테스트 파일이 없습니다")
+        return
+
+    response = ('{"category": "infrastructure", "confidence": "high", "reason": "DB 연결 실패", '
+                '"severity": "critical", "key_indicators": ["ECONNREFUSED"]}')
+
+    def fingerprint_of(path: Path) -> tuple[str, dict[str, int]]:
+        parser = LogParserAgent()
+        parser.parse_file(path)
+        return parser.format_for_llm(), build_fingerprint(parser.logs, parser.get_statistics())
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        memory = IncidentMemory(Path(tmp_dir) / "incidents.sqlite3")
+        classifier = ClassificationAgent(incident_memory=memory, llm=FakeListChatModel(responses=[response]))
+
+        log_data, fingerprint = fingerprint_of(db_file)
+        first = classifier.classify(log_data, fingerprint=fingerprint, source=db_file.name)
+        assert classifier.last_match is None and len(memory) == 1
+
+        # 같은 장애가 다른 날짜, 다른 값으로 다시 발생
+        recurring = Path(tmp_dir) / "recurring.log"
+        recurring.write_text(
+            db_file.read_text(encoding='utf-8').replace('2026-01-05', '2026-02-11').replace('3333', '8080'),
+            encoding='utf-8'
+        )
+        log_data, fingerprint = fingerprint_of(recurring)
+        # 재사용되지 않으면 LLM 응답 파싱 실패 결과가 나오도록 가짜 응답을 바꿔 둠
+        classifier.llm = FakeListChatModel(responses=["not json"])
+        reused = classifier.classify(log_data, fingerprint=fingerprint, source=recurring.name)
+        match = classifier.last_match
+        assert match is not None and match['similarity'] >= memory.reuse_threshold
+        assert reused['category'] == first['category'] and reused['severity'] == first['severity']
+        print(f"✓ 재발한 DB 장애: LLM 호출 없이 재사용 (유사도 {match['similarity']:.2f})")
+
+        # 다른 종류의 장애는 재사용하지 않음
+        log_data, fingerprint = fingerprint_of(xss_file)
+        classifier.classify(log_data, fingerprint=fingerprint, source=xss_file.name)
+        assert classifier.last_match['similarity'] < memory.seed_threshold
+        print(f"✓ XSS 공격 로그: 유사도 {classifier.last_match['similarity']:.2f}로 LLM 분류")
+
+        # 저장된 인시던트는 새 인스턴스에서도 조회 가능
+        memory.close()
+        reopened = IncidentMemory(Path(tmp_dir) / "incidents.sqlite3")
+        assert len(reopened) == 1
+        assert reopened.find_similar(fingerprint_of(recurring)[1])['source'] == db_file.name
+        print("✓ 인시던트 메모리 영구 저장")
+        reopened.close()
+
+
+def test_rule_preclassifier():
+    """규칙 기반 사전 분류 검증 (LLM API 호출 없음)"""
+    print("\n=== Test 7: 규칙 기반 사전 분류 ===")
+
+    expected = {
+        "scenario-01-db-connection-failure": ('infrastructure', 'critical'),
+        "scenario-02-xss-attack": ('security', 'high'),
+        "scenario-04-brute-force-attack": ('security', 'high'),
+        "scenario-07-memory-leak": ('infrastructure', 'high'),
+        # 명확한 신호가 없으므로 LLM으로 넘어가야 함
+        "scenario-03-n-plus-one-query": None,
+    }
+
+    rules = RuleClassifier()
+    classifier = ClassificationAgent(rules=rules, llm=FakeListChatModel(responses=["not json"]))
+    response = ('{"category": "performance", "confidence": "medium", "reason": "반복 쿼리", '
+                '"severity": "medium", "key_indicators": ["N+1"]}')
+
+    for scenario, decision in expected.items():
+        test_file = project_root / "datasets" / scenario / "dataset-01.log"
+        if not test_file.exists():
+            print(f"[SKIP] 테스트 파일이 없습니다: {test_file}")
+            continue
+
+        parser = LogParserAgent(extract_fields=True)
+        parser.parse_file(test_file)
+        classifier.llm = FakeListChatModel(responses=[response])
+        result = classifier.classify(parser.format_for_llm(), logs=parser.logs)
+
+        if decision is None:
+            assert classifier.last_method == "llm", f"{scenario}: LLM으로 넘어가야 합니다"
+            print(f"✓ {scenario}: 규칙 미발동 → LLM 분류")
+            continue
+
+        assert classifier.last_method == "rules", f"{scenario}: 규칙으로 분류되어야 합니다"
+        assert (result['category'], result['severity']) == decision, f"{scenario}: {result}"
+        assert result['confidence'] == 'high' and result['key_indicators']
+        print(f"✓ {scenario}: {result['category']}/{result['severity']} - {result['key_indicators'][0]}")
+
+    # 필드 추출 없이 파싱한 로그에서도 같은 결과
+    brute_force = project_root / "datasets/scenario-04-brute-force-attack/dataset-01.log"
+    if brute_force.exists():
+        parser = LogParserAgent()
+        parser.parse_file(brute_force)
+        assert rules.classify(parser.logs)['category'] == 'security'
+
+    # 서로 다른 카테고리의 신호가 섞이면 규칙으로 결정하지 않음
+    mixed = LogParserAgent()
+    mixed.logs.extend([
+        {'timestamp': '2026-01-05 03:15:22', 'level': 'ERROR', 'line_number': 1,
+         'message': 'Database connection error: Error: connect ECONNREFUSED 127.0.0.1:3306',
+         'raw': '[2026-01-05 03:15:22] ERROR Database connection error: Error: connect ECONNREFUSED 127.0.0.1:3306'},
+        {'timestamp': '2026-01-05 03:15:23', 'level': 'WARN', 'line_number': 2,
+         'message': "Dangerous HTML content detected: <script>alert('XSS')</script>",
+         'raw': "[2026-01-05 03:15:23] WARN Dangerous HTML content detected: <script>alert('XSS')</script>"},
+    ])
+    assert len(rules.evaluate(mixed.logs)) == 2
+    assert rules.classify(mixed.logs) is None
+    print(f"✓ 규칙 적중률: {rules.hits}/{rules.evaluations} ({rules.hit_rate:.0%})")
+
+
+class _SlowChatModel(FakeListChatModel):
+    """응답마다 지연이 있는 가짜 모델 (비동기 호출이 이벤트 루프를 막지 않는지 확인용)"""
+
+    delay: float = 0.3
+
+    async def _agenerate(self, *args, **kwargs):
+        await asyncio.sleep(self.delay)
+        return await super()._agenerate(*args, **kwargs)
+
+
+def test_async_classify():
+    """aclassify() 동시 실행 검증 (LLM API 호출 없음)"""
+    print("\n=== Test 8: 비동기 분류 ===")
+
+    test_file = project_root / "datasets/scenario-03-n-plus-one-query/dataset-01.log"
+    if not test_file.exists():
+        print(f"[SKIP] 테스트 파일이 없습니다: {test_file}")
+        return
+
+    parser = LogParserAgent()
+    parser.parse_file(test_file)
+    log_data = parser.format_for_llm()
+
+    response = ('{"category": "performance", "confidence": "medium", "reason": "반복 쿼리", '
+                '"severity": "medium", "key_indicators": ["N+1"]}')
+    classifier = ClassificationAgent(llm=_SlowChatModel(responses=[response]))
+
+    sync_result = classifier.classify(log_data)
+
+    async def classify_many(count: int):
+        return await asyncio.gather(*(classifier.aclassify(log_data) for _ in range(count)))
+
+    start = time.perf_counter()
+    results = asyncio.run(classify_many(5))
+    elapsed = time.perf_counter() - start
+
+    assert all(result == sync_result for result in results), "동기/비동기 분류 결과가 같아야 합니다"
+    assert classifier.last_method == "llm"
+
+    # 공유 인스턴스에서는 분류 방법을 결과와 함께 받음
+    outcome = asyncio.run(classifier.aclassify_detailed(log_data))
+    assert outcome['classification'] == sync_result and outcome['method'] == "llm" and outcome['match'] is None
+    # 순차 실행이면 5 * 0.3초 이상 걸림
+    assert elapsed < 5 * classifier.llm.delay, f"LLM 호출이 동시에 진행되지 않음: {elapsed:.2f}초"
+    print(f"✓ aclassify 5건 동시 실행: {elapsed:.2f}초 (순차 실행 시 {5 * classifier.llm.delay:.1f}초 이상)")
+
+
+
+def test_ranked_classify():
+    """복합 장애의 카테고리 순위 분류 검증 (LLM API 호출 없음)"""
+    print("\n=== Test 9: 카테고리 순위 (복합 장애) ===")
+
+    # 공격 시도 중 DB 연결이 끊긴 로그: 인프라(critical) + 보안(high)
+    mixed = LogParserAgent()
+    mixed.logs.extend([
+        {'timestamp': '2026-01-05 03:15:22', 'level': 'ERROR', 'line_number': 1,
+         'message': 'Database connection error: Error: connect ECONNREFUSED 127.0.0.1:3306',
+         'raw': '[2026-01-05 03:15:22] ERROR Database connection error: Error: connect ECONNREFUSED 127.0.0.1:3306'},
+        {'timestamp': '2026-01-05 03:15:23', 'level': 'WARN', 'line_number': 2,
+         'message': "Dangerous HTML content detected: <script>alert('XSS')</script>",
+         'raw': "[2026-01-05 03:15:23] WARN Dangerous HTML content detected: <script>alert('XSS')</script>"},
+    ])
+
+    rules = RuleClassifier()
+    classification, categories = rules.classify_ranked(mixed.logs)
+    assert categories == ['infrastructure', 'security'], categories
+    assert classification['category'] == 'infrastructure' and classification['severity'] == 'critical'
+    assert len(classification['key_indicators']) == 2
+    print(f"✓ 규칙 순위: {categories} ({classification['reason']})")
+
+    classifier = ClassificationAgent(rules=rules, llm=FakeListChatModel(responses=["not json"]))
+    outcome = classifier.classify_detailed(mixed.format_for_llm(), logs=mixed.logs, ranked=True)
+    assert outcome['method'] == "rules" and outcome['categories'] == categories
+    # 순위 모드가 아니면 섞인 신호는 LLM으로 넘기고, LLM 호출 전에 가장 심각한 카테고리를 추측으로 알려줌
+    guesses = []
+    outcome = classifier.classify_detailed(mixed.format_for_llm(), logs=mixed.logs, on_guess=guesses.append)
+    assert outcome['method'] == "llm"
+    assert [guess['category'] for guess in guesses] == ['infrastructure']
+
+    # LLM의 related_categories는 알려진 카테고리만 중복 없이 주 카테고리 뒤에 붙음
+    response = ('{"category": "performance", "confidence": "medium", "reason": "반복 쿼리", "severity": "medium", '
+                '"key_indicators": ["N+1"], "related_categories": ["security", "database", "performance"]}')
+    classifier = ClassificationAgent(llm=FakeListChatModel(responses=[response]))
+    assert classifier.classify_detailed("log", ranked=True)['categories'] == ['performance', 'security']
+    assert classifier.classify_detailed("log")['categories'] == ['performance']
+    print("✓ LLM 순위: ['performance', 'security'] (순위 모드가 아니면 주 카테고리만)")
+
+
 if __name__ == "__main__":
     try:
         print("Classification Agent 테스트 시작\n")
         print("⚠️  이 테스트는 LLM API를 호출합니다.")
         print("⚠️  .env 파일에 API 키가 설정되어 있어야 합니다.\n")
 
+        test_response_cache()
+        test_incident_memory()
+        test_rule_preclassifier()
+        test_async_classify()
+        test_ranked_classify()
         test_classification_result_structure()
         test_db_connection_failure()
         test_xss_attack()
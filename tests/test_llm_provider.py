@@ -0,0 +1,95 @@
+"""LLM Provider 테스트 (LLM API 호출 없음)"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# UTF-8 출력 설정
+import io
+sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils import llm_provider
+
+
+def _ensure_api_key() -> None:
+    """클라이언트 생성만 확인하므로 키가 없으면 가짜 키를 넣음 (요청은 보내지 않음)"""
+    if llm_provider.LLM_PROVIDER == "claude":
+        os.environ.setdefault("ANTHROPIC_API_KEY", "test-key")
+    else:
+        os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+
+
+def test_shared_clients():
+    """같은 설정의 LLM 클라이언트 공유"""
+    print("=== Test 1: LLM 클라이언트 공유 ===")
+
+    _ensure_api_key()
+    llm_provider.clear_llm_clients()
+
+    first = llm_provider.get_llm(temperature=0.0)
+    assert llm_provider.get_llm(temperature=0) is first, "같은 설정이면 같은 클라이언트여야 합니다"
+    assert llm_provider.get_llm(temperature=0.7) is not first, "temperature가 다르면 다른 클라이언트여야 합니다"
+    print(f"✓ 같은 (provider, model, temperature)는 하나의 클라이언트 공유: {type(first).__name__}")
+
+    # 여러 스레드가 동시에 처음 요청해도 클라이언트는 하나만 생성
+    llm_provider.clear_llm_clients()
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        clients = list(executor.map(lambda _: llm_provider.get_llm(temperature=0.0), range(64)))
+    assert len({id(client) for client in clients}) == 1
+    print("✓ 동시 요청 64건에도 클라이언트 1개")
+
+
+# 모듈별 임포트 시간 측정 스크립트 (새 인터프리터에서 실행해야 이미 로드된 모듈의 영향을 받지 않음)
+_IMPORT_BENCHMARK = """
+import json, sys, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+elapsed = time.perf_counter() - start
+heavy = [name for name in ('langchain_anthropic', 'langchain_google_genai', 'langgraph') if name in sys.modules]
+print(json.dumps({'seconds': elapsed, 'heavy': heavy}))
+"""
+
+
+def test_import_time():
+    """제공자 SDK 지연 임포트 및 임포트 시간 벤치마크"""
+    print("\n=== Test 2: 임포트 시간 ===")
+
+    import json
+
+    for module in ("src.agents.log_parser", "src.utils.llm_provider", "src.agents.classifier", "src.graph.workflow"):
+        output = subprocess.run(
+            [sys.executable, "-c", _IMPORT_BENCHMARK, module],
+            cwd=project_root, capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"  {module:<28} {result['seconds'] * 1000:7.1f}ms")
+
+        # 제공자 SDK와 langgraph는 실제로 LLM 클라이언트/워크플로우를 만들 때만 로드
+        assert not result['heavy'], f"{module} 임포트 시 무거운 모듈이 로드됨: {result['heavy']}"
+
+    print("✓ 모듈 임포트만으로는 제공자 SDK와 langgraph를 로드하지 않음")
+
+
+if __name__ == "__main__":
+    try:
+        test_shared_clients()
+        test_import_time()
+
+        print("\n" + "=" * 50)
+        print("모든 테스트 통과! ✓")
+        print("=" * 50)
+
+    except AssertionError as e:
+        print(f"\n[ERROR] 테스트 실패: {e}")
+    except Exception as e:
+        print(f"\n[ERROR] 예상치 못한 에러: {e}")
+        import traceback
+        traceback.print_exc()
@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+import bz2
+import gzip
+import lzma
+import pickle
 import sys
+import tempfile
 from pathlib import Path
 
 # UTF-8 출력 설정
@@ -14,6 +19,13 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.agents.log_parser import LogParserAgent
+from src.utils.error_patterns import ErrorPatternEngine
+from src.utils.log_compactor import estimate_tokens
+from src.utils.log_index import KeywordIndex
+from src.utils.log_sources import zstandard
+from src.utils.log_store import LogStore
+from src.utils.parse_cache import ParseCache
+from src.utils.request_fields import RequestFieldExtractor, normalize_endpoint
 
 
 def test_basic_parsing():
@@ -144,6 +156,677 @@ def test_multiple_scenarios():
         print(f"  라인: {len(logs)}, ERROR: {stats['error_count']}, WARN: {stats['warn_count']}")
 
 
+def test_streaming_parse():
+    """스트리밍 파싱 테스트"""
+    print("\n=== Test 6: 스트리밍 파싱 테스트 ===")
+
+    test_file = project_root / "datasets/scenario-01-db-connection-failure/dataset-01.log"
+
+    if not test_file.exists():
+        print(f"[SKIP] 테스트 파일이 없습니다: {test_file}")
+        return
+
+    list_parser = LogParserAgent()
+    logs = list_parser.parse_file(test_file)
+
+    stream_parser = LogParserAgent()
+    streamed = 0
+    for entry, expected in zip(stream_parser.iter_entries(test_file), logs):
+        assert entry == expected, "스트리밍 결과가 리스트 결과와 다릅니다"
+        streamed += 1
+
+    assert streamed == len(logs), "스트리밍 엔트리 수가 다릅니다"
+    assert stream_parser.get_statistics() == list_parser.get_statistics(), \
+        "점진적 통계가 전체 통계와 다릅니다"
+    assert stream_parser.logs == [], "스트리밍 모드에서는 엔트리를 보관하지 않아야 합니다"
+    print(f"✓ {streamed}개 엔트리 스트리밍 완료 (통계 일치)")
+
+
+def test_parallel_parse():
+    """병렬 청크 파싱 테스트"""
+    print("\n=== Test 7: 병렬 청크 파싱 테스트 ===")
+
+    test_file = project_root / "datasets/scenario-01-db-connection-failure/dataset-03.log"
+
+    if not test_file.exists():
+        print(f"[SKIP] 테스트 파일이 없습니다: {test_file}")
+        return
+
+    serial_parser = LogParserAgent()
+    serial_logs = serial_parser.parse_file(test_file)
+
+    # 작은 청크로 나눠 여러 워커에 분배되도록 강제
+    parallel_parser = LogParserAgent()
+    parallel_logs = parallel_parser.parse_file_parallel(test_file, workers=2, chunk_size=4096)
+
+    assert parallel_logs == serial_logs, "병렬 파싱 결과가 순차 파싱 결과와 다릅니다"
+    assert parallel_parser.get_statistics() == serial_parser.get_statistics(), \
+        "병합된 통계가 순차 파싱 통계와 다릅니다"
+    print(f"✓ {len(parallel_logs)}개 엔트리 병렬 파싱 완료 (라인 번호/통계 일치)")
+
+
+def test_columnar_store():
+    """컬럼형 LogStore 테스트"""
+    print("\n=== Test 8: 컬럼형 LogStore 테스트 ===")
+
+    lines = [
+        "[2026-01-05 03:14:55] INFO Server is running on port 3333",
+        "[2026-01-05 03:14:56]   ERROR   Database connection error: ECONNREFUSED",
+        "[ 2026-01-05 03:14:57 ] WARN 한글 메시지 - 재시도",
+        "[2026-13-45 99:00:00] DEBUG invalid timestamp kept as text",
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_file = Path(tmp_dir) / "store.log"
+        test_file.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+        parser = LogParserAgent()
+        logs = parser.parse_file(test_file)
+
+    assert isinstance(logs, LogStore), "parse_file은 LogStore를 반환해야 합니다"
+    assert len(logs) == 4
+    assert [log['raw'] for log in logs] == lines, "raw가 원본과 다르게 복원되었습니다"
+    assert logs[1]['level'] == 'ERROR' and logs[1]['line_number'] == 2
+    assert logs[2]['timestamp'] == '2026-01-05 03:14:57'
+    assert logs[3]['timestamp'] == '2026-13-45 99:00:00'
+    assert logs.timestamps[1] - logs.timestamps[0] == 1, "epoch 변환이 잘못되었습니다"
+
+    assert [log['line_number'] for log in parser.get_error_logs()] == [2]
+    assert len(parser.get_logs_with_keyword("econnrefused")) == 1
+    assert len(parser.get_logs_with_keyword("ECONN", case_sensitive=True)) == 1
+    assert parser.get_logs_with_keyword("3333ERROR", case_sensitive=True) == [], \
+        "메시지 경계를 넘는 매치는 무시되어야 합니다"
+    print(f"✓ {len(logs)}개 엔트리 컬럼 저장 및 복원 완료")
+
+
+def test_follow_mode():
+    """follow(tail) 모드 테스트"""
+    print("\n=== Test 9: follow 모드 테스트 ===")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_file = Path(tmp_dir) / "app-out.log"
+        test_file.write_text(
+            "[2026-01-05 03:14:55] INFO Server is running on port 3333\n"
+            "[2026-01-05 03:14:56] ERROR Database connection error\n"
+            "[2026-01-05 03:14",
+            encoding='utf-8'
+        )
+
+        parser = LogParserAgent()
+        first = parser.follow(test_file)
+        assert [log['line_number'] for log in first] == [1, 2]
+        print(f"✓ 첫 호출: {len(first)}건 (미완성 라인은 보류)")
+
+        # 미완성 라인이 완성되고 새 라인이 추가됨
+        with open(test_file, 'a', encoding='utf-8') as f:
+            f.write(":57] WARN Slow query detected\n[2026-01-05 03:15:00] INFO GET /api/health 200 - 5ms\n")
+
+        second = parser.follow(test_file)
+        assert [log['line_number'] for log in second] == [3, 4]
+        assert parser.follow(test_file) == [], "새 데이터가 없으면 빈 리스트여야 합니다"
+        stats = parser.get_statistics()
+        assert stats['total_lines'] == 4 and stats['error_count'] == 1
+        assert stats['time_range']['end'] == '2026-01-05 03:15:00'
+        print(f"✓ 추가분만 파싱: {len(second)}건, 누적 {stats['total_lines']}건")
+
+        # PM2 로그 회전: 기존 파일은 이동되고 같은 경로에 새 파일 생성
+        test_file.rename(test_file.with_name("app-out.log.1"))
+        test_file.write_text("[2026-01-05 04:00:00] INFO Server restarted\n", encoding='utf-8')
+
+        rotated = parser.follow(test_file)
+        assert [(log['line_number'], log['message']) for log in rotated] == [(1, 'Server restarted')]
+        print("✓ 로그 회전 감지 후 새 파일 처음부터 파싱")
+
+        # truncate 후 다시 기록
+        test_file.write_text("[2026-01-05 05:00:00] ERROR Connection timeout to upstream\n", encoding='utf-8')
+
+        truncated = parser.follow(test_file)
+        assert [log['line_number'] for log in truncated] == [1]
+        assert len(parser.logs) == 6
+        assert parser.get_statistics()['error_count'] == 2
+        print(f"✓ truncate 감지 후 재파싱, 누적 {len(parser.logs)}건")
+
+
+def test_custom_error_patterns():
+    """사용자 정의 에러 패턴 테스트"""
+    print("\n=== Test 10: 사용자 정의 에러 패턴 테스트 ===")
+
+    engine = ErrorPatternEngine()
+    assert engine.classify("Database connection error") == 'Database Error'
+    assert engine.classify("GET /api/posts 500 - connect failed") == 'Connection Error'
+    assert engine.classify("POST /login 401 - 125ms") == 'HTTP 401 Unauthorized'
+    assert engine.classify("Unexpected token") == 'Other Error'
+    print("✓ 기본 규칙 우선순위 유지")
+
+    engine.register('ECONNREFUSED', 'ECONNREFUSED')
+    engine.register('ETIMEDOUT', 'ETIMEDOUT')
+    engine.register('JWT Expired', r'jwt\s+expired', regex=True, case_sensitive=False)
+    assert engine.classify("Database connection error: ECONNREFUSED") == 'ECONNREFUSED'
+    assert engine.classify("GET /api/posts 401 - JWT expired") == 'JWT Expired'
+    print("✓ 사용자 규칙이 기본 규칙보다 먼저 적용")
+
+    test_file = project_root / "datasets/scenario-01-db-connection-failure/dataset-01.log"
+
+    if not test_file.exists():
+        print(f"[SKIP] 테스트 파일이 없습니다: {test_file}")
+        return
+
+    parser = LogParserAgent(error_patterns=engine)
+    parser.parse_file(test_file)
+    stats = parser.get_statistics()
+
+    expected = len([log for log in parser.get_error_logs() if 'ECONNREFUSED' in log['message']])
+    assert expected > 0
+    assert stats['error_patterns'].get('ECONNREFUSED', 0) == expected
+    print(f"✓ 통계 반영: ECONNREFUSED {expected}건")
+
+
+def test_keyword_index():
+    """키워드 역색인 검색 테스트"""
+    print("\n=== Test 11: 키워드 역색인 검색 테스트 ===")
+
+    test_file = project_root / "datasets/scenario-01-db-connection-failure/dataset-03.log"
+
+    if not test_file.exists():
+        print(f"[SKIP] 테스트 파일이 없습니다: {test_file}")
+        return
+
+    scan_parser = LogParserAgent()
+    scan_parser.parse_file(test_file)
+
+    index_parser = LogParserAgent(keyword_index='lazy')
+    index_parser.parse_file(test_file)
+
+    for keyword in ["database", "ECONNREFUSED", "GET /api/posts", "500", "db", "없는키워드"]:
+        assert index_parser.get_logs_with_keyword(keyword) == scan_parser.get_logs_with_keyword(keyword), \
+            f"색인 검색 결과가 전체 스캔과 다릅니다: {keyword}"
+    print(f"✓ 색인 검색 결과 일치 (trigram {len(index_parser.get_keyword_index().postings)}개)")
+
+    # AND + 레벨 조합
+    and_logs = index_parser.search_logs(["database", "error"], level="ERROR")
+    expected = [log for log in scan_parser.get_error_logs()
+                if 'database' in log['message'].lower() and 'error' in log['message'].lower()]
+    assert and_logs == expected
+    print(f"✓ AND + 레벨 검색: {len(and_logs)}건")
+
+    # OR
+    or_logs = index_parser.search_logs(["ECONNREFUSED", "401"], match_all=False)
+    expected = [log for log in scan_parser.logs
+                if 'econnrefused' in log['message'].lower() or '401' in log['message']]
+    assert or_logs == expected
+    print(f"✓ OR 검색: {len(or_logs)}건")
+
+
+def test_time_range_queries():
+    """시간 구간 조회 테스트"""
+    print("\n=== Test 12: 시간 구간 조회 테스트 ===")
+
+    # 3번째 라인은 시각이 살짝 뒤섞여 있음
+    lines = [
+        "[2026-01-05 03:10:00] INFO Server is running on port 3333",
+        "[2026-01-05 03:14:00] INFO GET /api/posts 200 - 45ms",
+        "[2026-01-05 03:13:59] WARN Slow query detected",
+        "[2026-01-05 03:15:00] ERROR Database connection error: ECONNREFUSED",
+        "[2026-01-05 03:16:30] ERROR GET /api/posts 500 - 3ms",
+        "[2026-01-05 03:30:00] INFO Database connected successfully",
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_file = Path(tmp_dir) / "time.log"
+        test_file.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+        parser = LogParserAgent()
+        parser.parse_file(test_file)
+
+    between = parser.get_logs_between("2026-01-05 03:13:59", "2026-01-05 03:15:00")
+    assert [log['line_number'] for log in between] == [3, 2, 4], "시간순 정렬/구간 포함이 잘못되었습니다"
+    print(f"✓ 구간 조회: {len(between)}건 (순서가 어긋난 라인 포함)")
+
+    first_error = parser.get_error_logs()[0]
+    around = parser.get_logs_around(first_error['timestamp'], seconds=150)
+    assert [log['line_number'] for log in around] == [3, 2, 4, 5]
+    print(f"✓ 첫 ERROR 전후 5분: {len(around)}건")
+
+    assert parser.get_logs_between("2026-01-06 00:00:00", "2026-01-07 00:00:00") == []
+
+    try:
+        parser.get_logs_between("yesterday", "today")
+        assert False, "잘못된 타임스탬프는 ValueError가 발생해야 합니다"
+    except ValueError:
+        print("✓ 잘못된 타임스탬프 입력 시 ValueError")
+
+
+def test_llm_compaction():
+    """토큰 예산 기반 LLM 포맷 압축 테스트"""
+    print("\n=== Test 13: LLM 포맷 압축 테스트 ===")
+
+    test_file = project_root / "datasets/scenario-03-n-plus-one-query/dataset-01.log"
+
+    if not test_file.exists():
+        print(f"[SKIP] 테스트 파일이 없습니다: {test_file}")
+        return
+
+    parser = LogParserAgent()
+    parser.parse_file(test_file)
+
+    # 예산 안에 들어가는 작은 파일은 전체 로그 그대로
+    full_output = parser.format_for_llm(token_budget=None)
+    assert parser.format_for_llm() == full_output
+    assert "=== 전체 로그 ===" in full_output
+
+    budget = 1500
+    compacted = parser.format_for_llm(token_budget=budget)
+    assert estimate_tokens(compacted) <= budget, "토큰 예산을 초과했습니다"
+    assert "=== 전체 로그 ===" not in compacted
+    assert "[110회] DEBUG Executed query: SELECT * FROM comment WHERE postId = <NUM>" in compacted, \
+        "반복 쿼리가 템플릿으로 묶이지 않았습니다"
+
+    for log in parser.get_error_logs():
+        assert log['raw'] in compacted, f"ERROR 라인이 누락되었습니다: {log['raw']}"
+
+    print(f"✓ 압축 완료: {estimate_tokens(full_output)} → {estimate_tokens(compacted)} 토큰 (예산 {budget})")
+
+
+def test_template_mining():
+    """Drain 템플릿 마이닝 테스트"""
+    print("\n=== Test 14: 템플릿 마이닝 테스트 ===")
+
+    test_file = project_root / "datasets/scenario-03-n-plus-one-query/dataset-01.log"
+
+    if not test_file.exists():
+        print(f"[SKIP] 테스트 파일이 없습니다: {test_file}")
+        return
+
+    parser = LogParserAgent(mine_templates=True)
+
+    # 스트리밍 엔트리에는 template_id와 파라미터가 붙음
+    streamed = list(parser.iter_entries(test_file))
+    query_entries = [e for e in streamed if e['message'].startswith('Executed query: SELECT * FROM comment')]
+    assert query_entries, "쿼리 로그가 없습니다"
+    assert len({e['template_id'] for e in query_entries}) == 1, "같은 쿼리가 다른 템플릿으로 분류되었습니다"
+    first = query_entries[0]
+    assert first['parameters'] == [first['message'].split()[-1]], "파라미터 추출이 잘못되었습니다"
+
+    parser.parse_file(test_file)
+    templates = parser.get_templates()
+    top = templates[0]
+    assert top['template'] == 'Executed query: SELECT * FROM comment WHERE postId = <*>', top
+    assert top['count'] == 110, f"템플릿 건수가 다릅니다: {top['count']}"
+    assert sum(t['count'] for t in templates) == len(parser.logs)
+    assert parser.logs[streamed.index(first)]['template_id'] == top['template_id']
+    # parse_file()의 엔트리에도 스트리밍과 같은 파라미터가 남음
+    assert parser.logs[streamed.index(first)]['parameters'] == first['parameters'], "파라미터가 저장되지 않았습니다"
+    assert [e['parameters'] for e in parser.logs] == [e['parameters'] for e in streamed]
+
+    # 병렬 파싱에서도 같은 템플릿 ID
+    parallel = LogParserAgent(mine_templates=True)
+    parallel.parse_file_parallel(test_file, workers=2, chunk_size=4096)
+    assert list(parallel.logs.template_ids) == list(parser.logs.template_ids), "병렬 파싱의 템플릿 ID가 다릅니다"
+    assert list(parallel.logs) == list(parser.logs), "병렬 파싱의 템플릿 파라미터가 다릅니다"
+
+    # 버퍼로 내보냈다 되살려도 파라미터 유지 (캐시처럼 메시지 외 컬럼은 memoryview로)
+    meta, buffers = parser.logs.to_buffers()
+    restored = LogStore.from_buffers(meta, {
+        name: bytes(buffer) if name == 'message_buffer' else memoryview(bytes(buffer))
+        for name, buffer in buffers.items()
+    })
+    assert restored[streamed.index(first)]['parameters'] == first['parameters']
+
+    # 마이닝을 끄면 template_id가 없음
+    plain = LogParserAgent()
+    plain.parse_file(test_file)
+    assert 'template_id' not in plain.logs[0]
+    assert plain.get_templates() == []
+
+    print(f"✓ {len(parser.logs)}개 로그 → 템플릿 {len(templates)}종")
+    print(f"✓ 최다 템플릿: [{top['count']}회] {top['template']}")
+
+
+def test_request_fields():
+    """HTTP 요청 필드 추출 및 엔드포인트 메트릭 테스트"""
+    print("\n=== Test 15: 요청 필드 추출 테스트 ===")
+
+    test_file = project_root / "datasets/scenario-03-n-plus-one-query/dataset-01.log"
+
+    if not test_file.exists():
+        print(f"[SKIP] 테스트 파일이 없습니다: {test_file}")
+        return
+
+    extractor = RequestFieldExtractor()
+    fields = extractor.extract("GET /api/posts?page=1&limit=20 200 - 1234ms - User: user12")
+    assert fields == {
+        'method': 'GET', 'path': '/api/posts?page=1&limit=20', 'status': 200, 'latency_ms': 1234.0,
+        'user': 'user12', 'ip': None, 'query': None
+    }, fields
+    fields = extractor.extract("POST /login - IP: 192.168.1.100 - admin@example.com")
+    assert (fields['ip'], fields['user'], fields['status']) == ('192.168.1.100', 'admin@example.com', None)
+    assert extractor.extract("Executed query: SELECT * FROM post")['query'] == 'SELECT * FROM post'
+    # 부가 경고는 요청으로 취급하지 않음
+    assert extractor.extract("Slow query detected: GET /api/posts - 1234ms (threshold: 200ms)") is None
+    assert normalize_endpoint('DELETE', '/api/chat/messages/room-3?x=1') == 'DELETE /api/chat/messages/:id'
+
+    parser = LogParserAgent(extract_fields=True)
+    parser.parse_file(test_file)
+    assert parser.logs[0]['fields'] is None
+
+    metrics = {m['endpoint']: m for m in parser.get_request_metrics()}
+    posts = metrics['GET /api/posts']
+    latencies = sorted(
+        log['fields']['latency_ms'] for log in parser.logs
+        if log['fields'] and (log['fields']['path'] or '').startswith('/api/posts') and log['fields']['latency_ms']
+    )
+    assert posts['requests'] == len(latencies) == 4, posts
+    assert posts['p50_ms'] == latencies[1] and posts['p99_ms'] == posts['max_ms'] == latencies[-1]
+    assert posts['status_counts'] == {200: 4}
+
+    # 병렬 파싱도 같은 필드와 메트릭
+    parallel = LogParserAgent(extract_fields=True)
+    parallel.parse_file_parallel(test_file, workers=2, chunk_size=4096)
+    assert list(parallel.logs) == list(parser.logs)
+    assert parallel.get_request_metrics() == parser.get_request_metrics()
+
+    # 추출을 끄면 필드 없음
+    assert LogParserAgent().get_request_metrics() == []
+
+    print(f"✓ 엔드포인트 {len(metrics)}개 집계")
+    print(f"✓ GET /api/posts: p50={posts['p50_ms']}ms p95={posts['p95_ms']}ms p99={posts['p99_ms']}ms")
+
+
+def test_multiline_entries():
+    """스택 트레이스 등 여러 줄 로그 테스트"""
+    print("\n=== Test 16: 여러 줄 로그 테스트 ===")
+
+    content = (
+        "orphan line before any entry\n"
+        "[2026-01-05 03:14:55] INFO Server is running on port 3333\n"
+        "[2026-01-05 03:14:56] ERROR Unhandled rejection\n"
+        "Error: connect ECONNREFUSED 127.0.0.1:5432\n"
+        "    at TCPConnectWrap.afterConnect [as oncomplete] (node:net:1555:16)\n"
+        "    at Protocol._enqueue (/app/node_modules/mysql/lib/protocol/Protocol.js:144:48)\n"
+        "[2026-01-05 03:14:57] AUDIT Immediate server restart required\n"
+        "    at restart (/app/server.js:10:3)\n"
+        "[2026-01-05 03:14:58] INFO GET /api/health 200 - 5ms\n"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_file = Path(tmp_dir) / "app-error.log"
+        test_file.write_text(content, encoding='utf-8')
+
+        parser = LogParserAgent()
+        logs = parser.parse_file(test_file)
+        assert [log['line_number'] for log in logs] == [2, 3, 9]
+
+        error = logs[1]
+        assert error['message'].startswith("Unhandled rejection\nError: connect ECONNREFUSED")
+        assert error['raw'].endswith("\n    at Protocol._enqueue (/app/node_modules/mysql/lib/protocol/Protocol.js:144:48)")
+        assert parser.get_error_logs() == [error]
+        assert parser.get_logs_with_keyword('TCPConnectWrap') == [error], "연속 라인도 검색되어야 합니다"
+
+        stats = parser.get_statistics()
+        assert stats['unparsed_lines'] == 6 and stats['dropped_lines'] == 3, stats
+        assert stats['error_patterns'] == {'Connection Error': 1}, "스택 트레이스까지 보고 분류해야 합니다"
+        assert "포맷 외 라인: 6" in parser.format_for_llm()
+        print(f"✓ 스택 트레이스 {error['message'].count(chr(10))}줄이 ERROR 엔트리에 연결됨")
+
+        # 청크 경계에서 잘린 스택 트레이스도 같은 결과
+        for chunk_size in (1, 64, 150):
+            parallel = LogParserAgent()
+            parallel.parse_file_parallel(test_file, workers=2, chunk_size=chunk_size)
+            assert list(parallel.logs) == list(logs), f"청크 크기 {chunk_size}에서 결과가 다릅니다"
+            assert parallel.get_statistics() == stats
+
+        # follow 모드: 다음 호출에 도착한 연속 라인은 직전 엔트리에 붙음
+        lines = content.splitlines(keepends=True)
+        test_file.write_text(''.join(lines[:4]), encoding='utf-8')
+        follower = LogParserAgent(keyword_index='eager')
+        follower.follow(test_file)
+        with open(test_file, 'a', encoding='utf-8') as f:
+            f.write(''.join(lines[4:]))
+        follower.follow(test_file)
+        assert list(follower.logs) == list(logs)
+        assert follower.get_statistics() == stats
+        assert follower.get_logs_with_keyword('protocol.js') == [error]
+
+        # 연속 라인이 여러 번에 나눠 도착해도 다시 색인한 엔트리가 posting에 중복으로 남지 않음
+        test_file.write_text(''.join(lines[:4]), encoding='utf-8')
+        tail = LogParserAgent(keyword_index='eager')
+        tail.follow(test_file)
+        for line in lines[4:] * 3:
+            with open(test_file, 'a', encoding='utf-8') as f:
+                f.write(line if line.startswith('[') else "    at frame (/app/worker.js:1:1)\n")
+            tail.follow(test_file)
+            tail.get_logs_with_keyword('worker.js')  # 조회할 때 다시 색인
+        fresh = KeywordIndex(tail.logs)
+        fresh.update()
+        postings = tail.get_keyword_index().postings
+        assert {gram: list(posting) for gram, posting in postings.items()} == \
+               {gram: list(posting) for gram, posting in fresh.postings.items()}, "posting에 중복 항목이 남았습니다"
+        assert sum(map(len, postings.values())) == sum(map(len, fresh.postings.values()))
+        print("✓ 병렬 파싱/follow 모드에서도 연속 라인 연결 (재색인 시 posting 중복 없음)")
+
+    # 엔트리당 연속 라인 수 제한
+    limit = LogParserAgent.MAX_CONTINUATION_LINES
+    trace = ["[2026-01-05 03:14:56] ERROR boom\n"] + ["    at frame\n"] * (limit + 5)
+    capped = LogParserAgent()
+    entries = list(capped._iter_lines(trace, capped._empty_statistics()))
+    assert entries[0]['message'].count('\n') == limit
+    print(f"✓ 연속 라인은 엔트리당 최대 {limit}줄")
+
+
+def test_log_formats():
+    """로그 포맷 레지스트리와 자동 감지 테스트"""
+    print("\n=== Test 17: 로그 포맷 자동 감지 테스트 ===")
+
+    samples = {
+        'pm2': (
+            "[2026-01-05 03:14:55] INFO Server is running on port 3333\n"
+            "[2026-01-05 03:14:56] CRITICAL Database connection error\n"
+        ),
+        'pm2-time': (
+            "2026-01-05T03:14:55: Server is running on port 3333\n"
+            "2026-01-05T03:14:56: ERROR Database connection error\n"
+        ),
+        'json': (
+            '{"level":30,"time":1767582895000,"msg":"Server is running on port 3333"}\n'
+            '{"level":"error","timestamp":"2026-01-05T03:14:56.123Z","message":"Database connection error",'
+            '"error":{"stack":"Error: connect ECONNREFUSED\\n    at TCPConnectWrap"}}\n'
+        ),
+        'nginx': (
+            '127.0.0.1 - - [05/Jan/2026:12:14:55 +0900] "GET /api/health HTTP/1.1" 200 2 "-" "curl/8.0" 0.005\n'
+            '10.0.0.7 - admin [05/Jan/2026:03:14:56 +0000] "POST /api/posts HTTP/1.1" 503 0 "-" "Mozilla/5.0"\n'
+        ),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, content in samples.items():
+            test_file = Path(tmp_dir) / f"{name}.log"
+            test_file.write_text(content, encoding='utf-8')
+
+            parser = LogParserAgent(extract_fields=True)
+            logs = parser.parse_file(test_file)
+            assert parser.current_format.name == name, f"{name} 포맷 감지 실패: {parser.current_format}"
+            assert [log['level'] for log in logs] == ['INFO', 'ERROR'], (name, list(logs))
+            assert logs[0]['timestamp'] == '2026-01-05 03:14:55', (name, logs[0])
+            assert logs[1]['timestamp'].startswith('2026-01-05 03:14:56'), (name, logs[1])
+            assert logs[1]['raw'] == content.splitlines()[1], "raw는 원본 라인이어야 합니다"
+            assert parser.get_statistics()['error_count'] == 1
+
+            # 병렬 파싱도 같은 포맷으로 파싱
+            parallel = LogParserAgent(extract_fields=True)
+            parallel.parse_file_parallel(test_file, workers=2, chunk_size=1)
+            assert list(parallel.logs) == list(logs), f"{name} 병렬 파싱 결과가 다릅니다"
+            print(f"✓ {name}: 자동 감지 및 파싱")
+
+        json_parser = LogParserAgent(log_format='json')
+        json_parser.parse_file(Path(tmp_dir) / "json.log")
+        assert json_parser.logs[1]['message'] == "Database connection error\nError: connect ECONNREFUSED\n    at TCPConnectWrap"
+
+        nginx_parser = LogParserAgent(extract_fields=True)
+        nginx_parser.parse_file(Path(tmp_dir) / "nginx.log")
+        fields = nginx_parser.logs[0]['fields']
+        assert (fields['method'], fields['status'], fields['latency_ms'], fields['ip']) == ('GET', 200, 5.0, '127.0.0.1')
+        assert nginx_parser.logs[1]['fields']['user'] == 'admin'
+
+        # 포맷을 지정하면 감지하지 않음
+        fixed = LogParserAgent(log_format='pm2')
+        assert len(fixed.parse_file(Path(tmp_dir) / "json.log")) == 0
+        assert fixed.get_statistics()['unparsed_lines'] == 2
+
+    try:
+        LogParserAgent(log_format='syslog')
+        assert False, "알 수 없는 포맷은 ValueError가 발생해야 합니다"
+    except ValueError:
+        pass
+
+    print("✓ 포맷 지정 및 알 수 없는 포맷 에러")
+
+
+def test_compressed_and_rotated_input():
+    """압축/회전된 로그 입력 테스트"""
+    print("\n=== Test 18: 압축 및 회전 로그 테스트 ===")
+
+    test_file = project_root / "datasets/scenario-01-db-connection-failure/dataset-01.log"
+
+    if not test_file.exists():
+        print(f"[SKIP] 테스트 파일이 없습니다: {test_file}")
+        return
+
+    plain = LogParserAgent()
+    expected = list(plain.parse_file(test_file))
+    data = test_file.read_bytes()
+
+    compressors = {'gz': gzip.compress, 'bz2': bz2.compress, 'xz': lzma.compress}
+    if zstandard is not None:
+        compressors['zst'] = zstandard.ZstdCompressor().compress
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for suffix, compress in compressors.items():
+            compressed = Path(tmp_dir) / f"app-out.log.{suffix}"
+            compressed.write_bytes(compress(data))
+
+            parser = LogParserAgent()
+            assert list(parser.parse_file(compressed)) == expected, f"{suffix} 파싱 결과가 다릅니다"
+            assert parser.get_statistics() == plain.get_statistics()
+            assert list(LogParserAgent().parse_file_parallel(compressed)) == expected
+            print(f"✓ {suffix}: 스트리밍 압축 해제 후 파싱")
+
+        # 회전된 파일 세트: 시간 구간이 섞인 두 파일을 타임스탬프 순서로 병합
+        lines = data.decode('utf-8').splitlines(keepends=True)
+        rotated_dir = Path(tmp_dir) / "rotated"
+        rotated_dir.mkdir()
+        (rotated_dir / "app-out.log.1.gz").write_bytes(gzip.compress(''.join(lines[0::2]).encode('utf-8')))
+        (rotated_dir / "app-out.log").write_text(''.join(lines[1::2]), encoding='utf-8')
+
+        merged = LogParserAgent()
+        logs = merged.parse_file(rotated_dir / "app-out.log*")
+        assert len(logs) == len(expected)
+        timestamps = [log['timestamp'] for log in logs]
+        assert timestamps == sorted(timestamps), "타임스탬프 순서로 병합되지 않았습니다"
+        assert sorted(log['raw'] for log in logs) == sorted(log['raw'] for log in expected)
+
+        stats = merged.get_statistics()
+        expected_stats = plain.get_statistics()
+        assert stats['total_lines'] == expected_stats['total_lines']
+        assert stats['error_patterns'] == expected_stats['error_patterns']
+        assert stats['time_range'] == expected_stats['time_range']
+        print(f"✓ 회전 파일 {len(list(rotated_dir.iterdir()))}개 병합: {len(logs)}건")
+
+        # 경로 목록도 가능 (같은 시각은 목록 순서대로)
+        explicit = LogParserAgent()
+        explicit.parse_file([rotated_dir / "app-out.log.1.gz", rotated_dir / "app-out.log"])
+        assert list(explicit.logs) == list(logs)
+
+        try:
+            LogParserAgent().parse_file(rotated_dir / "missing-*.log")
+            assert False, "일치하는 파일이 없으면 FileNotFoundError가 발생해야 합니다"
+        except FileNotFoundError:
+            pass
+
+
+def test_parse_cache():
+    """파싱 결과 디스크 캐시 테스트"""
+    print("\n=== Test 19: 파싱 캐시 테스트 ===")
+
+    test_file = project_root / "datasets/scenario-01-db-connection-failure/dataset-01.log"
+
+    if not test_file.exists():
+        print(f"[SKIP] 테스트 파일이 없습니다: {test_file}")
+        return
+
+    plain = LogParserAgent(extract_fields=True)
+    expected = list(plain.parse_file(test_file))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = Path(tmp_dir) / "app-out.log"
+        log_file.write_bytes(test_file.read_bytes())
+        cache = ParseCache(Path(tmp_dir) / "cache")
+
+        # 첫 파싱은 저장, 두 번째는 mmap으로 로드
+        LogParserAgent(extract_fields=True, cache=cache).parse_file(log_file)
+        assert len(list(cache.cache_dir.glob('*.cols'))) == 1
+
+        cached = LogParserAgent(extract_fields=True, cache=cache)
+        logs = cached.parse_file(log_file)
+        assert logs._frozen, "캐시에서 로드되지 않았습니다"
+        assert list(logs) == expected
+        assert cached.get_statistics() == plain.get_statistics()
+        assert cached.get_request_metrics() == plain.get_request_metrics()
+        assert cached.format_for_llm() == plain.format_for_llm()
+        assert cached.get_logs_with_keyword('ECONNREFUSED', case_sensitive=True) == \
+            plain.get_logs_with_keyword('ECONNREFUSED', case_sensitive=True)
+        print(f"✓ 캐시 로드 결과가 새 파싱과 동일: {len(logs)}건")
+
+        # mmap 기반 저장소도 pickle로 다른 프로세스에 전달 가능 (analyze_many의 파싱 워커)
+        restored = pickle.loads(pickle.dumps(logs))
+        assert list(restored) == expected
+        assert restored.request_fields.fields_of(0) == logs.request_fields.fields_of(0)
+        print("✓ 캐시에서 연 저장소 pickle 왕복")
+
+        # 읽기 전용 저장소도 엔트리를 추가하면 메모리로 복사되어 그대로 동작
+        logs.append(expected[0])
+        assert len(logs) == len(expected) + 1 and logs[-1] == expected[0]
+        print("✓ 캐시에서 연 저장소에 엔트리 추가")
+
+        # 설정이 다르면 다른 캐시 항목
+        LogParserAgent(cache=cache).parse_file(log_file)
+        assert len(list(cache.cache_dir.glob('*.cols'))) == 2
+
+        # 파일이 바뀌면 캐시 무효화
+        with open(log_file, 'a', encoding='utf-8') as f:
+            f.write("[2026-01-05 23:59:59] ERROR Cache invalidation check\n")
+        changed = LogParserAgent(extract_fields=True, cache=cache)
+        changed.parse_file(log_file)
+        assert len(changed.logs) == len(expected) + 1
+        assert changed.logs[-1]['message'] == "Cache invalidation check"
+        print("✓ 파일 변경 시 다시 파싱")
+
+        # 내용 해시 키는 경로가 달라도 같은 항목을 씀
+        content_cache = ParseCache(Path(tmp_dir) / "content", content_hash=True)
+        copy = Path(tmp_dir) / "upload-1234.log"
+        copy.write_bytes(test_file.read_bytes())
+        LogParserAgent(cache=content_cache).parse_file(test_file)
+        assert LogParserAgent(cache=content_cache).parse_file(copy)._frozen
+
+        # 크기 제한을 넘으면 가장 오래 쓰이지 않은 항목부터 삭제
+        entry_size = sum(path.stat().st_size for path in cache.cache_dir.iterdir())
+        small_cache = ParseCache(cache.cache_dir, max_bytes=entry_size // 2)
+        small_cache.evict()
+        remaining = list(small_cache.cache_dir.glob('*.cols'))
+        assert len(remaining) < 3
+        assert sum(path.stat().st_size for path in small_cache.cache_dir.iterdir()) <= entry_size // 2
+        print(f"✓ 크기 제한 초과 시 LRU 삭제: 3개 → {len(remaining)}개")
+
+        # 손상된 캐시는 무시하고 다시 파싱
+        cache.clear()
+        LogParserAgent(cache=cache).parse_file(log_file)
+        for path in cache.cache_dir.glob('*.cols'):
+            path.write_bytes(path.read_bytes()[:40])
+        parser = LogParserAgent(cache=cache)
+        assert not parser.parse_file(log_file)._frozen
+        assert len(parser.logs) == len(expected) + 1
+        print("✓ 손상된 캐시 항목은 다시 파싱")
+
+
 if __name__ == "__main__":
     try:
         test_basic_parsing()
@@ -151,6 +834,20 @@ if __name__ == "__main__":
         test_filtering()
         test_llm_format()
         test_multiple_scenarios()
+        test_streaming_parse()
+        test_parallel_parse()
+        test_columnar_store()
+        test_follow_mode()
+        test_custom_error_patterns()
+        test_keyword_index()
+        test_time_range_queries()
+        test_llm_compaction()
+        test_template_mining()
+        test_request_fields()
+        test_multiline_entries()
+        test_log_formats()
+        test_compressed_and_rotated_input()
+        test_parse_cache()
 
         print("\n" + "=" * 50)
         print("모든 테스트 통과! ✓")
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
 import sys
+import tempfile
+import time
 from pathlib import Path
+from typing import Any
 
 # UTF-8 출력 설정
 import io
@@ -13,7 +18,17 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.graph.workflow import create_workflow, analyze_log_file, print_analysis_summary
+from langchain_core.language_models import FakeListChatModel
+
+from src.agents.classifier import ClassificationAgent
+from src.agents.infrastructure_analyst import InfrastructureAnalystAgent
+from src.agents.performance_analyst import PerformanceAnalystAgent
+from src.agents.registry import AgentRegistry
+from src.agents.security_analyst import SecurityAnalystAgent
+from src.graph.workflow import (create_workflow, get_workflow, analyze_log_file, analyze_many, print_analysis_summary,
+                                parse_logs_node, _initial_state)
+from src.utils.classification_rules import RuleClassifier
+from src.utils import llm_provider
 
 
 def test_workflow_creation():
@@ -181,6 +196,283 @@ def test_full_analysis_summary():
     print("✓ 분석 결과 요약 출력 완료")
 
 
+class _ScriptedChatModel(FakeListChatModel):
+    """프롬프트의 표식에 따라 느려지거나 실패하고, 동시에 진행 중인 호출 수를 세는 가짜 모델"""
+
+    delay: float = 0.2
+    tracker: Any = None  # 모델끼리 공유하는 {'current': 진행 중인 호출 수, 'peak': 최대값}
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = messages[-1].content
+        self.tracker['current'] += 1
+        self.tracker['peak'] = max(self.tracker['peak'], self.tracker['current'])
+        try:
+            await asyncio.sleep(self.delay * (5 if "SLOW_MARKER" in prompt else 1))
+            if "FAIL_MARKER" in prompt:
+                raise RuntimeError("가짜 LLM 호출 실패")
+        finally:
+            self.tracker['current'] -= 1
+        return super()._generate(messages, stop=stop, **kwargs)
+
+
+def test_analyze_many():
+    """여러 파일 동시 분석 스케줄러 테스트 (LLM API 호출 없음)"""
+    print("\n=== Test 7: 여러 파일 동시 분석 ===")
+
+    tracker = {'current': 0, 'peak': 0}
+    classification = ('{"category": "performance", "confidence": "medium", "reason": "느린 응답", '
+                      '"severity": "medium", "key_indicators": ["1000ms+"]}')
+    analysis = '{"performance_issue": "느린 쿼리", "quick_wins": [], "optimization_plan": []}'
+    # 규칙/메모리 없이 모든 파일이 분류 LLM과 분석 LLM을 차례로 호출
+    registry = AgentRegistry({
+        'classifier': lambda: ClassificationAgent(
+            llm=_ScriptedChatModel(responses=[classification], tracker=tracker)),
+        'performance': lambda: PerformanceAnalystAgent(
+            llm=_ScriptedChatModel(responses=[analysis], tracker=tracker)),
+    })
+
+    max_concurrency = 2
+    with tempfile.TemporaryDirectory() as directory:
+        def write_log(name: str, marker: str = "") -> str:
+            path = Path(directory) / name
+            path.write_text(
+                "[2026-01-05 03:15:00] INFO GET /api/posts 200 - 1200ms\n"
+                f"[2026-01-05 03:15:01] WARN Slow query detected {marker} ({name})\n",
+                encoding='utf-8')
+            return str(path)
+
+        # 가장 먼저 넣은 느린 파일이 가장 나중에 끝나야 함 (끝나는 순서대로 내보내는지 확인)
+        slow = write_log("slow.log", "SLOW_MARKER")
+        failing = write_log("failing.log", "FAIL_MARKER")
+        missing = str(Path(directory) / "missing.log")
+        normal = [write_log(f"normal-{i}.log") for i in range(3)]
+        paths = [slow, failing, missing, *normal]
+
+        async def collect():
+            return [state async for state in analyze_many(paths, max_concurrency=max_concurrency,
+                                                          registry=registry)]
+
+        results = asyncio.run(collect())
+
+    by_path = {state['log_file_path']: state for state in results}
+    assert len(results) == len(paths) and set(by_path) == set(paths)
+
+    # 동시에 진행 중인 LLM 호출은 max_concurrency를 넘지 않음 (파일당 호출은 순차적)
+    assert tracker['peak'] <= max_concurrency, f"동시 호출 {tracker['peak']}건 > {max_concurrency}"
+    assert tracker['peak'] == max_concurrency, "파일들이 동시에 분석되지 않았습니다"
+    print(f"✓ 동시 LLM 호출 최대 {tracker['peak']}건 (max_concurrency={max_concurrency})")
+
+    assert results[-1]['log_file_path'] == slow, "끝나는 순서대로 내보내야 합니다"
+    print(f"✓ 먼저 넣은 느린 파일이 마지막에 나옴: {[Path(state['log_file_path']).name for state in results]}")
+
+    # 실패는 해당 파일의 error로만 전달
+    assert "로그 파싱 실패" in by_path[missing]['error'], by_path[missing]['error']
+    assert "분류 실패" in by_path[failing]['error'], by_path[failing]['error']
+    for path in [slow, *normal]:
+        state = by_path[path]
+        assert state['error'] is None, f"{path}: {state['error']}"
+        assert state['analysis_result']['performance_issue'] == "느린 쿼리"
+    print("✓ 파싱/분류 실패는 해당 파일에만 기록되고 나머지 파일은 정상 분석")
+
+
+def test_workflow_reuse():
+    """컴파일된 워크플로우 재사용 마이크로벤치마크 (LLM API 호출 없음)"""
+    print("\n=== Test 8: 워크플로우 재사용 (cold vs warm) ===")
+
+    # 에이전트 생성에는 API 키만 있으면 됨 (요청은 보내지 않음)
+    if llm_provider.LLM_PROVIDER == "claude":
+        os.environ.setdefault("ANTHROPIC_API_KEY", "test-key")
+    else:
+        os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+
+    assert get_workflow() is get_workflow(), "공유 워크플로우는 한 번만 컴파일되어야 합니다"
+
+    # 에러 상태로 실행하면 모든 노드가 바로 통과하므로 그래프 실행 자체의 비용만 남음
+    state = {
+        'log_file_path': "benchmark.log", 'parsed_logs': None, 'log_store': None, 'log_data': None,
+        'request_metrics': None, 'incident_fingerprint': None, 'classification': None,
+        'analysis_result': None, 'error': "benchmark"
+    }
+    runs = 20
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        create_workflow().invoke(state)
+    cold = (time.perf_counter() - start) / runs
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        get_workflow().invoke(state)
+    warm = (time.perf_counter() - start) / runs
+
+    print(f"  cold (매번 컴파일 + 실행): {cold * 1000:.2f}ms")
+    print(f"  warm (공유 그래프 실행):   {warm * 1000:.2f}ms")
+    assert warm < cold, "공유 워크플로우 실행이 매번 컴파일하는 것보다 빨라야 합니다"
+    print(f"✓ 요청당 {(cold - warm) * 1000:.2f}ms 절약 ({cold / warm:.1f}배)")
+
+
+
+class _SlowChatModel(FakeListChatModel):
+    """응답마다 지연이 있는 가짜 모델 (분석 에이전트 병렬 실행 확인용)"""
+
+    delay: float = 0.5
+    finished: int = 0  # 끝까지 실행된 호출 수 (취소된 호출은 세지 않음)
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.delay)
+        self.finished += 1
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        # 기본 구현은 _generate를 스레드에서 실행하므로 취소할 수 있도록 이벤트 루프에서 기다림
+        await asyncio.sleep(self.delay)
+        self.finished += 1
+        return super()._generate(messages, stop=stop, **kwargs)
+
+
+def test_fan_out():
+    """복합 장애의 분석 에이전트 팬아웃 검증 (LLM API 호출 없음)"""
+    print("\n=== Test 9: 분석 에이전트 팬아웃 ===")
+
+    responses = {
+        'infrastructure': '{"issue_type": "DB 연결 실패", "root_cause": "DB 중단", "urgency": "immediate", '
+                          '"recommended_actions": ["DB 재시작", "알림 확인"]}',
+        'security': '{"attack_type": "XSS", "severity": "high", "immediate_response": ["IP 차단"], '
+                    '"recommended_actions": ["입력 검증", "알림 확인"]}',
+        'performance': '{"performance_issue": "N/A", "quick_wins": [], "optimization_plan": []}',
+    }
+    delays = {'infrastructure': 0.5, 'security': 0.8}
+    registry = AgentRegistry({
+        # 규칙만으로 분류 (인시던트 메모리 없음)
+        'classifier': lambda: ClassificationAgent(rules=RuleClassifier(), llm=FakeListChatModel(responses=["{}"])),
+        'infrastructure': lambda: InfrastructureAnalystAgent(
+            llm=_SlowChatModel(responses=[responses['infrastructure']], delay=delays['infrastructure'])),
+        'security': lambda: SecurityAnalystAgent(
+            llm=_SlowChatModel(responses=[responses['security']], delay=delays['security'])),
+        'performance': lambda: PerformanceAnalystAgent(llm=FakeListChatModel(responses=[responses['performance']])),
+    })
+
+    # 공격 시도 중 DB 연결이 끊긴 로그 (인프라 critical + 보안 high)
+    lines = [
+        "[2026-01-05 03:15:00] INFO GET /api/posts 200 - 45ms",
+        "[2026-01-05 03:15:22] ERROR Database connection error: Error: connect ECONNREFUSED 127.0.0.1:3306",
+        "[2026-01-05 03:15:23] WARN Dangerous HTML content detected: <script>alert('XSS')</script>",
+        "[2026-01-05 03:15:24] INFO GET /api/posts 500 - 12ms",
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        log_file = Path(directory) / "mixed.log"
+        log_file.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        state = parse_logs_node(_initial_state(str(log_file)))
+
+    app = create_workflow(registry, fan_out=True)
+    for label, run in (("invoke", lambda: app.invoke(state)), ("ainvoke", lambda: asyncio.run(app.ainvoke(state)))):
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+
+        assert not result.get('error'), result.get('error')
+        merged = result['merged_analysis']
+        assert result['categories'] == ['infrastructure', 'security']
+        assert merged['categories'] == ['infrastructure', 'security'] and not merged['failed']
+        assert merged['headlines'] == {'infrastructure': "DB 연결 실패", 'security': "XSS"}
+        assert merged['actions'] == ["DB 재시작", "알림 확인", "IP 차단", "입력 검증"]
+        assert result['analysis_result'] == merged['analyses']['infrastructure']
+
+        # 병렬이면 가장 느린 에이전트 시간, 순차면 합 (1.3초)
+        assert elapsed < sum(delays.values()), f"분석 에이전트가 병렬로 실행되지 않음: {elapsed:.2f}초"
+        print(f"✓ {label}: 분석 2건 {elapsed:.2f}초 (가장 느린 에이전트 {max(delays.values())}초, "
+              f"순차 {sum(delays.values())}초)")
+
+    print_analysis_summary(result)
+
+    # 단일 카테고리면 분석 에이전트 하나만 실행
+    single = {**state, 'log_store': None, 'classification': None}
+    registry.get('classifier').llm = FakeListChatModel(responses=[
+        '{"category": "security", "confidence": "high", "reason": "XSS", "severity": "high", '
+        '"key_indicators": ["<script>"], "related_categories": []}'
+    ])
+    result = app.invoke(single)
+    assert list(result['merged_analysis']['analyses']) == ['security']
+    print("✓ 관련 카테고리가 하나면 해당 분석 에이전트만 실행")
+
+
+
+def test_speculative():
+    """분류와 분석을 겹쳐 실행하는 투기 실행 검증 (LLM API 호출 없음)"""
+    print("\n=== Test 10: 투기 실행 (분류 + 분석 병행) ===")
+
+    classify_delay = analyze_delay = 0.5
+    classification = ('{{"category": "{}", "confidence": "high", "reason": "테스트", "severity": "critical", '
+                      '"key_indicators": ["ECONNREFUSED"]}}')
+    analyses = {
+        'infrastructure': '{"issue_type": "DB 연결 실패", "urgency": "immediate", "recommended_actions": []}',
+        'security': '{"attack_type": "XSS", "severity": "high", "immediate_response": [], '
+                    '"recommended_actions": []}',
+    }
+    registry = AgentRegistry({
+        # 규칙 신호가 섞인 로그이므로 규칙은 결정하지 못하고 infrastructure(critical)를 추측
+        'classifier': lambda: ClassificationAgent(rules=RuleClassifier(), llm=FakeListChatModel(responses=["{}"])),
+        'infrastructure': lambda: InfrastructureAnalystAgent(
+            llm=_SlowChatModel(responses=[analyses['infrastructure']], delay=analyze_delay)),
+        'security': lambda: SecurityAnalystAgent(
+            llm=_SlowChatModel(responses=[analyses['security']], delay=analyze_delay)),
+        'performance': lambda: PerformanceAnalystAgent(llm=FakeListChatModel(responses=["{}"])),
+    })
+
+    lines = [
+        "[2026-01-05 03:15:22] ERROR Database connection error: Error: connect ECONNREFUSED 127.0.0.1:3306",
+        "[2026-01-05 03:15:23] WARN Dangerous HTML content detected: <script>alert('XSS')</script>",
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        log_file = Path(directory) / "mixed.log"
+        log_file.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        state = parse_logs_node(_initial_state(str(log_file)))
+
+    app = create_workflow(registry, speculative=True)
+    runs = (("invoke", lambda: app.invoke(state)), ("ainvoke", lambda: asyncio.run(app.ainvoke(state))))
+
+    # 추측 적중: 분석이 분류와 겹치므로 분류 + 분석 시간의 합보다 빠름
+    for label, run in runs:
+        registry.get('classifier').llm = _SlowChatModel(responses=[classification.format("infrastructure")],
+                                                        delay=classify_delay)
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+
+        assert not result.get('error'), result.get('error')
+        assert result['speculation'] == "hit"
+        assert result['analysis_result']['issue_type'] == "DB 연결 실패"
+        assert elapsed < classify_delay + analyze_delay, f"분류와 분석이 겹치지 않음: {elapsed:.2f}초"
+        print(f"✓ {label} 추측 적중: {elapsed:.2f}초 (순차 실행 시 {classify_delay + analyze_delay:.1f}초 이상)")
+
+    # 추측 불일치: 미리 시작한 분석을 버리고 분류 결과대로 다시 라우팅
+    # (분류보다 오래 걸리는 분석으로 확인 - ainvoke는 취소, invoke는 끝나기를 기다린 뒤 버림)
+    for label, run in runs:
+        registry.get('classifier').llm = _SlowChatModel(responses=[classification.format("security")],
+                                                        delay=classify_delay)
+        speculative_llm = registry.infrastructure.llm = _SlowChatModel(
+            responses=[analyses['infrastructure']], delay=2 * classify_delay)
+        result = run()
+
+        assert not result.get('error'), result.get('error')
+        assert result['speculation'] == "miss"
+        assert result['analysis_result']['attack_type'] == "XSS"
+        if label == "invoke":
+            assert speculative_llm.finished == 1, "동기 실행은 미리 시작한 분석을 남겨 두지 않고 기다려야 합니다"
+        else:
+            assert speculative_llm.finished == 0, "비동기 실행은 미리 시작한 분석을 취소해야 합니다"
+        print(f"✓ {label} 추측 불일치: security 분석으로 재라우팅 "
+              f"(미리 시작한 분석 {'완료 후 폐기' if speculative_llm.finished else '취소'})")
+
+    # 규칙이 결정하면 추측 없이 기존 경로 (LLM 분류 없음)
+    xss_file = project_root / "datasets/scenario-02-xss-attack/dataset-01.log"
+    if xss_file.exists():
+        xss = parse_logs_node(_initial_state(str(xss_file)))
+        result = app.invoke(xss)
+        assert result['speculation'] is None and result['analysis_result']['attack_type'] == "XSS"
+        print("✓ 규칙으로 결정된 로그는 투기 실행 없이 분석")
+
+
 if __name__ == "__main__":
     try:
         print("LangGraph Workflow 테스트 시작\n")
@@ -189,11 +481,15 @@ if __name__ == "__main__":
         print("⚠️  전체 테스트는 약 6-9회의 API 호출이 필요합니다.\n")
 
         test_workflow_creation()
+        test_workflow_reuse()
+        test_fan_out()
+        test_speculative()
         test_infrastructure_pipeline()
         test_security_pipeline()
         test_performance_pipeline()
         test_state_flow()
         test_full_analysis_summary()
+        test_analyze_many()
 
         print("\n" + "=" * 60)
         print("모든 테스트 통과! ✓")